@@ -7,9 +7,8 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
 
-from .const import ATTR_UUID, DOMAIN, PLATFORMS
-from .coordinator import MyGasCoordinator
-from .helpers import make_account_device_id, make_device_id, make_service_device_id
+from .const import DOMAIN, PLATFORMS
+from .coordinator import MyGasCoordinator, get_snapshot_store
 from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
@@ -21,9 +20,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: MyGasConfigEntry) -> boo
     """Set up MyGas from a config entry."""
     coordinator = MyGasCoordinator(hass, config_entry=entry)
 
-    await coordinator.async_config_entry_first_refresh()
+    # Start from the last good data if available and refresh in the background
+    restored = await coordinator.async_restore_snapshot()
+    if not restored:
+        await coordinator.async_config_entry_first_refresh()
 
     entry.runtime_data = coordinator
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     _async_remove_stale_devices(hass, entry, coordinator)
 
@@ -31,9 +34,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: MyGasConfigEntry) -> boo
 
     await async_setup_services(hass)
 
+    if restored:
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_refresh(),
+            name=f"{DOMAIN} - {entry.title} - initial refresh",
+        )
+
     return True
 
 
+async def _async_update_listener(
+    hass: HomeAssistant, entry: MyGasConfigEntry
+) -> None:
+    """Apply changed options without a reload when possible."""
+    coordinator = entry.runtime_data
+    if coordinator.options_require_reload():
+        _LOGGER.debug("Options of %s changed, reloading", entry.title)
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+    await coordinator.async_apply_options()
+
+
 def _async_remove_stale_devices(
     hass: HomeAssistant,
     entry: MyGasConfigEntry,
@@ -41,30 +63,7 @@ def _async_remove_stale_devices(
 ) -> None:
     """Remove device entries for counters that no longer exist."""
     device_registry = dr.async_get(hass)
-
-    current_identifiers: set[str] = set()
-    for account_id in coordinator.get_accounts():
-        lspu_accounts = coordinator.get_lspu_accounts(account_id)
-        for lspu_account_id in range(len(lspu_accounts)):
-            account_number = coordinator.get_account_number(
-                account_id, lspu_account_id
-            )
-            # Account-level device (always present)
-            current_identifiers.add(make_account_device_id(account_number))
-            # Counter-level devices
-            for counter in coordinator.get_counters(account_id, lspu_account_id):
-                counter_uuid = counter.get(ATTR_UUID)
-                if counter_uuid:
-                    current_identifiers.add(
-                        make_device_id(account_number, counter_uuid)
-                    )
-            # Service-level devices
-            for service in coordinator.get_services(account_id, lspu_account_id):
-                service_id = service.get("id")
-                if service_id:
-                    current_identifiers.add(
-                        make_service_device_id(account_number, service_id)
-                    )
+    current_identifiers = coordinator.device_identifiers
 
     for device_entry in dr.async_entries_for_config_entry(
         device_registry, entry.entry_id
@@ -84,3 +83,8 @@ def _async_remove_stale_devices(
 async def async_unload_entry(hass: HomeAssistant, entry: MyGasConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: MyGasConfigEntry) -> None:
+    """Remove the data snapshot of a deleted config entry."""
+    await get_snapshot_store(hass, entry.entry_id).async_remove()
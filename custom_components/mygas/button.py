@@ -18,7 +18,7 @@ from . import MyGasConfigEntry
 from .const import DOMAIN, SERVICE_GET_BILL, SERVICE_REFRESH
 from .coordinator import MyGasCoordinator
 from .entity import MyGasAccountCoordinatorEntity, MyGasBaseCoordinatorEntity
-from .helpers import make_account_device_id, make_device_id, make_entity_unique_id
+from .helpers import make_entity_unique_id
 
 
 @dataclass(kw_only=True, frozen=True)
@@ -64,10 +64,8 @@ class MyGasButtonEntity(MyGasBaseCoordinatorEntity, ButtonEntity):
         """Initialize the Entity."""
         super().__init__(coordinator, account_id, lspu_group_id, counter_id)
         self.entity_description = entity_description
-        account_number = coordinator.get_account_number(account_id, lspu_group_id)
-        counter_uuid = coordinator.get_counters(account_id, lspu_group_id)[counter_id].get("uuid", "")
         self._attr_unique_id = make_entity_unique_id(
-            make_device_id(account_number, counter_uuid), entity_description.key
+            self.counter.device_identifier, entity_description.key
         )
 
     async def async_press(self) -> None:
@@ -93,9 +91,8 @@ class MyGasAccountButtonEntity(MyGasAccountCoordinatorEntity, ButtonEntity):
         """Initialize the Entity."""
         super().__init__(coordinator, account_id, lspu_account_id)
         self.entity_description = entity_description
-        account_number = coordinator.get_account_number(account_id, lspu_account_id)
         self._attr_unique_id = make_entity_unique_id(
-            make_account_device_id(account_number), entity_description.key
+            self.account.device_identifier, entity_description.key
         )
 
     async def async_press(self) -> None:
@@ -115,31 +112,28 @@ async def async_setup_entry(
     coordinator = entry.runtime_data
     entities: list[MyGasAccountButtonEntity | MyGasButtonEntity] = []
 
-    for account_id in coordinator.get_accounts():
-        for lspu_account_id in range(len(coordinator.get_lspu_accounts(account_id))):
-            # Account-level buttons (always created)
+    for account in coordinator.iter_accounts():
+        # Account-level buttons (always created)
+        entities.extend(
+            MyGasAccountButtonEntity(
+                coordinator,
+                entity_description,
+                account.account_id,
+                account.lspu_account_id,
+            )
+            for entity_description in BUTTON_DESCRIPTIONS
+        )
+        # Counter-level buttons
+        for counter_id in range(len(account.counters)):
             entities.extend(
-                MyGasAccountButtonEntity(
+                MyGasButtonEntity(
                     coordinator,
                     entity_description,
-                    account_id,
-                    lspu_account_id,
+                    account.account_id,
+                    account.lspu_account_id,
+                    counter_id,
                 )
                 for entity_description in BUTTON_DESCRIPTIONS
             )
-            # Counter-level buttons
-            for counter_id in range(
-                len(coordinator.get_counters(account_id, lspu_account_id))
-            ):
-                entities.extend(
-                    MyGasButtonEntity(
-                        coordinator,
-                        entity_description,
-                        account_id,
-                        lspu_account_id,
-                        counter_id,
-                    )
-                    for entity_description in BUTTON_DESCRIPTIONS
-                )
 
-    async_add_entities(entities, True)
+    async_add_entities(entities)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from collections.abc import Mapping
 from typing import Any
 
@@ -13,34 +14,107 @@ import voluptuous as vol
 
 from homeassistant.config_entries import (
     ConfigEntry,
+    ConfigEntryState,
     ConfigFlow,
     ConfigFlowResult,
-    OptionsFlowWithReload,
+    OptionsFlow,
 )
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.selector import (
+    SelectOptionDict,
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+    TimeSelector,
+)
 
-from .const import CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL, DOMAIN
-from .decorators import async_retry
+from .const import (
+    CONF_ACCOUNTS,
+    CONF_ACCOUNTS_INTERVAL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MONITORED_ACCOUNTS,
+    CONF_DENSE_INTERVAL,
+    CONF_POLLING_MODE,
+    CONF_QUIET_END,
+    CONF_QUIET_START,
+    CONF_READINGS_END_DAY,
+    CONF_READINGS_START_DAY,
+    CONF_REFRESH_TIME,
+    CONF_FULL_DIAGNOSTICS,
+    CONF_LOOP_WATCHDOG,
+    CONF_RECORD_TRAFFIC,
+    CONF_SCAN_INTERVAL,
+    DEFAULT_ACCOUNTS_INTERVAL,
+    DEFAULT_DENSE_INTERVAL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_QUIET_END,
+    DEFAULT_QUIET_START,
+    DEFAULT_READINGS_END_DAY,
+    DEFAULT_READINGS_START_DAY,
+    DEFAULT_REFRESH_TIME,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    POLLING_MODE_CALENDAR,
+    POLLING_MODE_INTERVAL,
+)
+from .coordinator import MyGasValidatedLogin, async_store_validated_login
+from .decorators import (
+    async_get_api_session,
+    async_validation_retry,
+    is_connection_error,
+)
+from .models import get_account_choices
+from .polling import MyGasPollingCalendar
 
 _LOGGER = logging.getLogger(__name__)
 
 
-@async_retry
+@async_validation_retry
 async def _async_validate_credentials(
     hass: HomeAssistant, username: str, password: str
-) -> dict[str, Any]:
-    """Validate credentials by attempting login."""
-    session = async_get_clientsession(hass)
+) -> MyGasValidatedLogin:
+    """Validate credentials by attempting login.
+
+    The authenticated session and the accounts are kept for the first
+    refresh of the entry.
+    """
+    session = async_get_api_session(hass)
     auth = SimpleMyGasAuth(
         identifier=username,
         password=password,
         session=session,
     )
     api = MyGasApi(auth)
-    await api.async_get_accounts()
-    return {"title": username.lower()}
+    accounts = await api.async_get_accounts()
+    return MyGasValidatedLogin(username, password, auth, accounts)
+
+
+def _accounts_selector(choices: dict[str, str]) -> SelectSelector:
+    """Make the selector of the accounts to monitor."""
+    return SelectSelector(
+        SelectSelectorConfig(
+            options=[
+                SelectOptionDict(value=account_id, label=label)
+                for account_id, label in choices.items()
+            ],
+            multiple=True,
+            mode=SelectSelectorMode.LIST,
+        )
+    )
+
+
+def _monitored_accounts_option(
+    selected: list[str], choices: dict[str, str]
+) -> dict[str, Any]:
+    """Get the option of the selected accounts.
+
+    Nothing is stored when every account is selected, so accounts added to
+    the login later are monitored too.
+    """
+    if set(choices) <= set(selected):
+        return {}
+    return {CONF_MONITORED_ACCOUNTS: selected}
 
 
 class MyGasConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -48,25 +122,48 @@ class MyGasConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    _login: MyGasValidatedLogin
+    _account_choices: dict[str, str]
+
     async def _async_try_validate(
         self,
         username: str,
         password: str,
         errors: dict[str, str],
+        placeholders: dict[str, str],
         context: str = "",
-    ) -> dict[str, Any] | None:
-        """Try to validate credentials and return result on success."""
+    ) -> MyGasValidatedLogin | None:
+        """Try to validate credentials and return result on success.
+
+        The time the validation took is put to the ``elapsed`` placeholder
+        of the error message.
+        """
+        started = time.monotonic()
         try:
             result = await _async_validate_credentials(
                 self.hass, username, password
             )
-            _LOGGER.debug("Credentials validated for %s", username)
+            _LOGGER.debug(
+                "Credentials validated for %s in %.1f seconds",
+                username,
+                time.monotonic() - started,
+            )
             return result
+        except TimeoutError:
+            _LOGGER.warning("Timeout validating credentials for %s", username)
+            errors["base"] = "timeout_connect"
         except MyGasAuthError as err:
-            _LOGGER.warning(
-                "Invalid credentials for %s: %s", username, err, exc_info=True
-            )
-            errors["base"] = "invalid_auth"
+            if is_connection_error(err):
+                # The token request did not reach the API
+                _LOGGER.warning(
+                    "Connection error for %s: %s", username, err, exc_info=True
+                )
+                errors["base"] = "cannot_connect"
+            else:
+                _LOGGER.warning(
+                    "Invalid credentials for %s: %s", username, err, exc_info=True
+                )
+                errors["base"] = "invalid_auth"
         except (MyGasApiError, aiohttp.ClientError) as err:
             _LOGGER.warning(
                 "Connection error for %s: %s", username, err, exc_info=True
@@ -77,6 +174,7 @@ class MyGasConfigFlow(ConfigFlow, domain=DOMAIN):
                 "Unexpected exception%s", f" during {context}" if context else ""
             )
             errors["base"] = "unknown"
+        placeholders["elapsed"] = f"{time.monotonic() - started:.0f}"
         return None
 
     async def async_step_user(
@@ -84,17 +182,21 @@ class MyGasConfigFlow(ConfigFlow, domain=DOMAIN):
     ) -> ConfigFlowResult:
         """Handle the initial step."""
         errors: dict[str, str] = {}
+        placeholders: dict[str, str] = {}
         if user_input is not None:
             username = user_input[CONF_USERNAME].strip().lower()
             password = user_input[CONF_PASSWORD]
 
-            if await self._async_try_validate(username, password, errors):
+            if login := await self._async_try_validate(
+                username, password, errors, placeholders
+            ):
                 await self.async_set_unique_id(username)
                 self._abort_if_unique_id_configured()
-                return self.async_create_entry(
-                    title=username,
-                    data={CONF_USERNAME: username, CONF_PASSWORD: password},
-                )
+                self._login = login
+                self._account_choices = get_account_choices(login.accounts)
+                if len(self._account_choices) > 1:
+                    return await self.async_step_accounts()
+                return self._async_create_login_entry({})
 
         return self.async_show_form(
             step_id="user",
@@ -105,6 +207,43 @@ class MyGasConfigFlow(ConfigFlow, domain=DOMAIN):
                 }
             ),
             errors=errors,
+            description_placeholders=placeholders,
+        )
+
+    async def async_step_accounts(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Select the accounts of the login to monitor."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if selected := user_input.get(CONF_MONITORED_ACCOUNTS):
+                return self._async_create_login_entry(
+                    _monitored_accounts_option(selected, self._account_choices)
+                )
+            errors["base"] = "no_accounts_selected"
+
+        return self.async_show_form(
+            step_id="accounts",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_MONITORED_ACCOUNTS,
+                        default=list(self._account_choices),
+                    ): _accounts_selector(self._account_choices),
+                }
+            ),
+            errors=errors,
+        )
+
+    @callback
+    def _async_create_login_entry(self, options: dict[str, Any]) -> ConfigFlowResult:
+        """Create the entry of the validated login."""
+        login = self._login
+        async_store_validated_login(self.hass, login)
+        return self.async_create_entry(
+            title=login.username,
+            data={CONF_USERNAME: login.username, CONF_PASSWORD: login.password},
+            options=options,
         )
 
     async def async_step_reconfigure(
@@ -112,6 +251,7 @@ class MyGasConfigFlow(ConfigFlow, domain=DOMAIN):
     ) -> ConfigFlowResult:
         """Handle reconfiguration of an existing MyGas config entry."""
         errors: dict[str, str] = {}
+        placeholders: dict[str, str] = {}
         reconfigure_entry = self._get_reconfigure_entry()
 
         if user_input is not None:
@@ -121,9 +261,10 @@ class MyGasConfigFlow(ConfigFlow, domain=DOMAIN):
             await self.async_set_unique_id(username)
             self._abort_if_unique_id_mismatch()
 
-            if await self._async_try_validate(
-                username, password, errors, context="reconfigure"
+            if login := await self._async_try_validate(
+                username, password, errors, placeholders, context="reconfigure"
             ):
+                async_store_validated_login(self.hass, login)
                 return self.async_update_reload_and_abort(
                     reconfigure_entry,
                     data_updates={
@@ -147,6 +288,7 @@ class MyGasConfigFlow(ConfigFlow, domain=DOMAIN):
                 }
             ),
             errors=errors,
+            description_placeholders=placeholders,
         )
 
     async def async_step_reauth(
@@ -161,23 +303,25 @@ class MyGasConfigFlow(ConfigFlow, domain=DOMAIN):
         """Confirm re-authentication with MyGas."""
         reauth_entry = self._get_reauth_entry()
         errors: dict[str, str] = {}
+        placeholders: dict[str, str] = {
+            CONF_USERNAME: reauth_entry.data[CONF_USERNAME],
+        }
 
         if user_input is not None:
             username = reauth_entry.data[CONF_USERNAME]
             password = user_input[CONF_PASSWORD]
 
-            if await self._async_try_validate(
-                username, password, errors, context="reauth"
+            if login := await self._async_try_validate(
+                username, password, errors, placeholders, context="reauth"
             ):
+                async_store_validated_login(self.hass, login)
                 return self.async_update_reload_and_abort(
                     reauth_entry,
                     data_updates={CONF_PASSWORD: password},
                 )
 
         return self.async_show_form(
-            description_placeholders={
-                CONF_USERNAME: reauth_entry.data[CONF_USERNAME],
-            },
+            description_placeholders=placeholders,
             step_id="reauth_confirm",
             data_schema=vol.Schema({vol.Required(CONF_PASSWORD): str}),
             errors=errors,
@@ -197,28 +341,153 @@ OPTIONS_SCHEMA = vol.Schema(
         vol.Required(CONF_SCAN_INTERVAL): vol.All(
             vol.Coerce(int), vol.Range(min=1, max=168)
         ),
+        vol.Optional(CONF_ACCOUNTS_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=30)
+        ),
+        vol.Optional(CONF_POLLING_MODE): SelectSelector(
+            SelectSelectorConfig(
+                options=[POLLING_MODE_INTERVAL, POLLING_MODE_CALENDAR],
+                translation_key=CONF_POLLING_MODE,
+            )
+        ),
+        vol.Optional(CONF_MAX_CONCURRENT_REQUESTS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=10)
+        ),
+        vol.Optional(CONF_RECORD_TRAFFIC): bool,
+        vol.Optional(CONF_FULL_DIAGNOSTICS): bool,
+        vol.Optional(CONF_LOOP_WATCHDOG): bool,
+    }
+)
+
+_DAY_OF_MONTH = vol.All(vol.Coerce(int), vol.Range(min=1, max=31))
+
+CALENDAR_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_REFRESH_TIME): TimeSelector(),
+        vol.Required(CONF_DENSE_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=12)
+        ),
+        vol.Required(CONF_READINGS_START_DAY): _DAY_OF_MONTH,
+        vol.Required(CONF_READINGS_END_DAY): _DAY_OF_MONTH,
+        vol.Required(CONF_QUIET_START): TimeSelector(),
+        vol.Required(CONF_QUIET_END): TimeSelector(),
     }
 )
 
+CALENDAR_DEFAULTS: dict[str, Any] = {
+    CONF_REFRESH_TIME: DEFAULT_REFRESH_TIME,
+    CONF_DENSE_INTERVAL: DEFAULT_DENSE_INTERVAL,
+    CONF_READINGS_START_DAY: DEFAULT_READINGS_START_DAY,
+    CONF_READINGS_END_DAY: DEFAULT_READINGS_END_DAY,
+    CONF_QUIET_START: DEFAULT_QUIET_START,
+    CONF_QUIET_END: DEFAULT_QUIET_END,
+}
+
+
+class MyGasOptionsFlowHandler(OptionsFlow):
+    """Handle MyGas options flow.
 
-class MyGasOptionsFlowHandler(OptionsFlowWithReload):
-    """Handle MyGas options flow."""
+    Options are applied by the update listener of the entry, which reloads
+    it only when the change affects the devices and entities.
+    """
+
+    _pending_options: dict[str, Any]
+
+    @property
+    def _account_choices(self) -> dict[str, str]:
+        """Get the accounts of the login known to the running entry."""
+        if self.config_entry.state is not ConfigEntryState.LOADED:
+            return {}
+        coordinator = self.config_entry.runtime_data
+        return get_account_choices((coordinator.data or {}).get(CONF_ACCOUNTS))
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Manage the options."""
+        errors: dict[str, str] = {}
+        schema = OPTIONS_SCHEMA
+        choices = self._account_choices
+        if len(choices) > 1:
+            schema = schema.extend(
+                {vol.Optional(CONF_MONITORED_ACCOUNTS): _accounts_selector(choices)}
+            )
+
         if user_input is not None:
-            return self.async_create_entry(data=user_input)
+            if len(choices) < 2:
+                # Nothing to select, keep the current selection
+                if CONF_MONITORED_ACCOUNTS in self.config_entry.options:
+                    user_input[CONF_MONITORED_ACCOUNTS] = self.config_entry.options[
+                        CONF_MONITORED_ACCOUNTS
+                    ]
+                return await self._async_finish(user_input)
+            if selected := user_input.pop(CONF_MONITORED_ACCOUNTS, None):
+                return await self._async_finish(
+                    user_input | _monitored_accounts_option(selected, choices)
+                )
+            errors["base"] = "no_accounts_selected"
 
         return self.async_show_form(
             step_id="init",
+            errors=errors,
             data_schema=self.add_suggested_values_to_schema(
-                OPTIONS_SCHEMA,
+                schema,
                 {
                     CONF_SCAN_INTERVAL: self.config_entry.options.get(
                         CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                     ),
+                    CONF_ACCOUNTS_INTERVAL: self.config_entry.options.get(
+                        CONF_ACCOUNTS_INTERVAL, DEFAULT_ACCOUNTS_INTERVAL
+                    ),
+                    CONF_POLLING_MODE: self.config_entry.options.get(
+                        CONF_POLLING_MODE, POLLING_MODE_INTERVAL
+                    ),
+                    CONF_MAX_CONCURRENT_REQUESTS: self.config_entry.options.get(
+                        CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+                    ),
+                    CONF_RECORD_TRAFFIC: self.config_entry.options.get(
+                        CONF_RECORD_TRAFFIC, False
+                    ),
+                    CONF_FULL_DIAGNOSTICS: self.config_entry.options.get(
+                        CONF_FULL_DIAGNOSTICS, False
+                    ),
+                    CONF_LOOP_WATCHDOG: self.config_entry.options.get(
+                        CONF_LOOP_WATCHDOG, False
+                    ),
+                    CONF_MONITORED_ACCOUNTS: self.config_entry.options.get(
+                        CONF_MONITORED_ACCOUNTS, list(choices)
+                    ),
+                },
+            ),
+        )
+
+    async def _async_finish(self, options: dict[str, Any]) -> ConfigFlowResult:
+        """Save the options, after the calendar step in the calendar mode."""
+        if options.get(CONF_POLLING_MODE) == POLLING_MODE_CALENDAR:
+            self._pending_options = options
+            return await self.async_step_calendar()
+        return self.async_create_entry(data=options)
+
+    async def async_step_calendar(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the refresh calendar."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            polling_calendar = MyGasPollingCalendar.from_options(user_input)
+            if polling_calendar.is_quiet(polling_calendar.refresh_time):
+                errors["base"] = "refresh_time_quiet"
+            else:
+                return self.async_create_entry(data=self._pending_options | user_input)
+
+        return self.async_show_form(
+            step_id="calendar",
+            errors=errors,
+            data_schema=self.add_suggested_values_to_schema(
+                CALENDAR_SCHEMA,
+                {
+                    key: self.config_entry.options.get(key, default)
+                    for key, default in CALENDAR_DEFAULTS.items()
                 },
             ),
         )
@@ -17,15 +17,106 @@ API_TIMEOUT: Final = 30
 API_MAX_TRIES: Final = 3
 API_RETRY_DELAY: Final = 10
 
+# Credential validation in the config flow, where the user waits for it
+VALIDATION_DEADLINE: Final = 20
+VALIDATION_TIMEOUT: Final = 8
+VALIDATION_MAX_TRIES: Final = 2
+VALIDATION_RETRY_DELAY: Final = 1
+
+CIRCUIT_BREAKER_FAILURE_THRESHOLD: Final = 3
+CIRCUIT_BREAKER_RESET_TIMEOUT: Final = 300
+
 PLATFORMS: list[Platform] = [Platform.BUTTON, Platform.SENSOR]
 
 REQUEST_REFRESH_DEFAULT_COOLDOWN = 5
 
+STORAGE_VERSION: Final = 1
+CASSETTE_VERSION: Final = 1
+CASSETTE_SAVE_DELAY: Final = 30
+CASSETTE_MAX_CALLS: Final = 1000
+SNAPSHOT_SAVE_DELAY: Final = 10
+
+METRICS_WINDOW: Final = 24 * 60 * 60
+METRICS_MAX_SAMPLES: Final = 1000
+REFRESH_HISTORY_SIZE: Final = 20
+TRACE_SIZE: Final = 100
+
+LOOP_WATCHDOG_THRESHOLD: Final = 0.1
+LOOP_WATCHDOG_HISTORY: Final = 50
+
+# Models of logins with more payload entries are built in the executor,
+# measured like DIAGNOSTICS_SUMMARY_THRESHOLD
+EXECUTOR_MODEL_THRESHOLD: Final = 400
+
+# Diagnostics of logins with more payload entries (accounts, balances,
+# payments, services, counters and readings) are summarized unless the full
+# dump is enabled in the options
+DIAGNOSTICS_SUMMARY_THRESHOLD: Final = 250
+DIAGNOSTICS_HISTORY_LENGTH: Final = 3
+
+SCHEDULER_JITTER: Final = 60
+SCHEDULER_MAX_CONCURRENT_REFRESHES: Final = 2
+# Window the calendar refreshes of different logins are spread over
+SCHEDULER_CALENDAR_SPREAD: Final = 600
+
+ACCOUNT_RETRY_DELAY: Final = 300
+ACCOUNT_RETRY_MAX_DELAY: Final = 3600
+
+# Seconds a login validated by the config flow waits for the entry setup
+VALIDATED_LOGIN_TTL: Final = 300
+
 CONF_ACCOUNT: Final = "account"
 CONF_ACCOUNTS: Final = "accounts"
 CONF_INFO: Final = "info"
 CONF_SCAN_INTERVAL: Final = "scan_interval"
+CONF_ACCOUNTS_INTERVAL: Final = "accounts_interval"
+CONF_RECORD_TRAFFIC: Final = "record_traffic"
+CONF_FULL_DIAGNOSTICS: Final = "full_diagnostics"
+CONF_LOOP_WATCHDOG: Final = "loop_watchdog"
+CONF_MONITORED_ACCOUNTS: Final = "monitored_accounts"
 DEFAULT_SCAN_INTERVAL: Final = 24
+DEFAULT_ACCOUNTS_INTERVAL: Final = 7
+
+CONF_POLLING_MODE: Final = "polling_mode"
+POLLING_MODE_INTERVAL: Final = "interval"
+POLLING_MODE_CALENDAR: Final = "calendar"
+CONF_REFRESH_TIME: Final = "refresh_time"
+CONF_DENSE_INTERVAL: Final = "dense_interval"
+CONF_READINGS_START_DAY: Final = "readings_start_day"
+CONF_READINGS_END_DAY: Final = "readings_end_day"
+CONF_QUIET_START: Final = "quiet_start"
+CONF_QUIET_END: Final = "quiet_end"
+DEFAULT_REFRESH_TIME: Final = "09:00:00"
+DEFAULT_DENSE_INTERVAL: Final = 3
+DEFAULT_READINGS_START_DAY: Final = 20
+DEFAULT_READINGS_END_DAY: Final = 25
+DEFAULT_QUIET_START: Final = "23:00:00"
+DEFAULT_QUIET_END: Final = "07:00:00"
+# Days around the month close polled densely: the last days of a month
+# and the first days of the next one
+MONTH_CLOSE_DAYS_BEFORE: Final = 2
+MONTH_CLOSE_DAYS_AFTER: Final = 3
+CONF_MAX_CONCURRENT_REQUESTS: Final = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS: Final = 4
+
+# Options applied to the running coordinator, others reload the entry
+LIVE_OPTIONS: Final = frozenset(
+    {
+        CONF_SCAN_INTERVAL,
+        CONF_ACCOUNTS_INTERVAL,
+        CONF_MAX_CONCURRENT_REQUESTS,
+        CONF_RECORD_TRAFFIC,
+        CONF_FULL_DIAGNOSTICS,
+        CONF_LOOP_WATCHDOG,
+        CONF_POLLING_MODE,
+        CONF_REFRESH_TIME,
+        CONF_DENSE_INTERVAL,
+        CONF_READINGS_START_DAY,
+        CONF_READINGS_END_DAY,
+        CONF_QUIET_START,
+        CONF_QUIET_END,
+    }
+)
 
 CONFIGURATION_URL: Final = "https://мойгаз.смородина.онлайн/"
 
@@ -38,6 +129,12 @@ ATTR_READINGS: Final = "readings"
 SERVICE_REFRESH: Final = "refresh"
 SERVICE_SEND_READINGS: Final = "send_readings"
 SERVICE_GET_BILL: Final = "get_bill"
+SERVICE_PROFILE: Final = "profile"
+ATTR_TARGET: Final = "target"
+ATTR_TOP: Final = "top"
+PROFILE_TARGET_REFRESH: Final = "refresh"
+PROFILE_TARGET_ENTITIES: Final = "entities"
+PROFILE_TOP_DEFAULT: Final = 20
 ATTR_ELS: Final = "els"
 ATTR_IS_ELS: Final = "is_els"
 ATTR_LSPU_INFO_GROUP: Final = "lspuInfoGroup"
@@ -45,6 +142,7 @@ ATTR_COUNTERS: Final = "counters"
 ATTR_SERVICES: Final = "services"
 ATTR_ALIAS: Final = "alias"
 ATTR_LAST_UPDATE_TIME: Final = "last_update_time"
+ATTR_ACCOUNTS_UPDATE_TIME: Final = "accounts_update_time"
 ATTR_JNT_ACCOUNT_NUM: Final = "jntAccountNum"
 ATTR_UUID: Final = "uuid"
 ATTR_SERIAL_NUM: Final = "serialNumber"
@@ -2,46 +2,184 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import date, timedelta
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass, replace
+from functools import partial
+from datetime import date, datetime, timedelta
 from typing import Any
 
 from aiomygas import MyGasApi, SimpleMyGasAuth
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
 
 from .const import (
-    ATTR_ACCOUNT_ID,
-    ATTR_ALIAS,
-    ATTR_COUNTERS,
-    ATTR_ELS,
+    ACCOUNT_RETRY_DELAY,
+    ACCOUNT_RETRY_MAX_DELAY,
+    ATTR_ACCOUNTS_UPDATE_TIME,
     ATTR_IS_ELS,
-    ATTR_JNT_ACCOUNT_NUM,
     ATTR_LAST_UPDATE_TIME,
-    ATTR_LSPU_INFO_GROUP,
-    ATTR_SERVICES,
-    ATTR_UUID,
-    CONF_ACCOUNT,
     CONF_ACCOUNTS,
+    CONF_ACCOUNTS_INTERVAL,
     CONF_INFO,
+    CONF_LOOP_WATCHDOG,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MONITORED_ACCOUNTS,
+    CONF_POLLING_MODE,
+    CONF_RECORD_TRAFFIC,
     CONF_SCAN_INTERVAL,
+    DEFAULT_ACCOUNTS_INTERVAL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    EXECUTOR_MODEL_THRESHOLD,
+    LIVE_OPTIONS,
+    POLLING_MODE_CALENDAR,
     REQUEST_REFRESH_DEFAULT_COOLDOWN,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
+    VALIDATED_LOGIN_TTL,
 )
-from .decorators import async_api_request_handler
-from .helpers import make_account_device_id, make_device_id
+from .decorators import (
+    async_api_request_handler,
+    async_get_api_session,
+    async_get_circuit_breaker,
+)
+from .metrics import MyGasApiMetrics, RefreshReason
+from .models import (
+    MyGasAccount,
+    build_account_group,
+    build_accounts,
+    count_payload_entries,
+)
+from .polling import MyGasPollingCalendar
+from .recorder import MyGasTrafficRecorder
+from .scheduler import async_get_scheduler
+from .trace import MyGasApiTrace
+from .watchdog import MyGasLoopWatchdog
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+class MyGasDeviceRef:
+    """Location of a MyGas device in the coordinator data."""
+
+    account_id: int
+    lspu_account_id: int
+    counter_id: int | None = None
+    service_id: int | None = None
+
+
+@dataclass(slots=True)
+class MyGasStaleAccount:
+    """Account served from its last good data after failed fetches."""
+
+    since: datetime
+    error_count: int
+    last_update_time: datetime | None
+
+
+type MyGasModel = tuple[
+    dict[int, tuple[MyGasAccount, ...]], dict[str, MyGasDeviceRef]
+]
+
+
+def build_device_index(
+    accounts: dict[int, tuple[MyGasAccount, ...]],
+) -> dict[str, MyGasDeviceRef]:
+    """Map device identifiers to their location in the account model."""
+    index: dict[str, MyGasDeviceRef] = {}
+    for lspu_accounts in accounts.values():
+        for account in lspu_accounts:
+            index[account.device_identifier] = MyGasDeviceRef(
+                account.account_id, account.lspu_account_id
+            )
+            for counter_id, counter in enumerate(account.counters):
+                if counter.uuid:
+                    index[counter.device_identifier] = MyGasDeviceRef(
+                        account.account_id,
+                        account.lspu_account_id,
+                        counter_id=counter_id,
+                    )
+            for service_id, service in enumerate(account.services):
+                if service.id:
+                    index[service.device_identifier] = MyGasDeviceRef(
+                        account.account_id,
+                        account.lspu_account_id,
+                        service_id=service_id,
+                    )
+    return index
+
+
+def build_model(data: dict[str, Any] | None) -> MyGasModel:
+    """Build the account model and the device index of the data.
+
+    Pure function, safe to run in the executor.
+    """
+    accounts = build_accounts(data)
+    return accounts, build_device_index(accounts)
+
+
+@dataclass(frozen=True, slots=True)
+class MyGasValidatedLogin:
+    """Login validated by the config flow, handed to the first refresh."""
+
+    username: str
+    password: str
+    auth: SimpleMyGasAuth
+    accounts: dict[str, Any]
+    expires: float = 0.0
+
+
+DATA_VALIDATED_LOGINS: HassKey[dict[str, MyGasValidatedLogin]] = HassKey(
+    f"{DOMAIN}_validated_logins"
+)
+
+
+@callback
+def async_store_validated_login(
+    hass: HomeAssistant, login: MyGasValidatedLogin
+) -> None:
+    """Keep a validated login for the setup of its config entry."""
+    logins = hass.data.setdefault(DATA_VALIDATED_LOGINS, {})
+    now = time.monotonic()
+    for username in [name for name, item in logins.items() if item.expires < now]:
+        del logins[username]
+    logins[login.username] = replace(login, expires=now + VALIDATED_LOGIN_TTL)
+
+
+@callback
+def async_pop_validated_login(
+    hass: HomeAssistant, username: str, password: str
+) -> MyGasValidatedLogin | None:
+    """Take the validated login of the credentials if it has not expired."""
+    login = hass.data.get(DATA_VALIDATED_LOGINS, {}).pop(username, None)
+    if (
+        login is None
+        or login.password != password
+        or login.expires < time.monotonic()
+    ):
+        return None
+    return login
+
+
+def get_snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Get the store holding the last good coordinator data of an entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
 class MyGasCoordinator(DataUpdateCoordinator):
     """Coordinator is responsible for querying the device at a specified route."""
 
@@ -68,23 +206,259 @@ class MyGasCoordinator(DataUpdateCoordinator):
             ),
         )
         self.force_next_update = False
+        self.refresh_reason = RefreshReason.SCHEDULED
         self.data = {}
-        session = async_get_clientsession(hass)
+        session = async_get_api_session(hass)
         self.username = config_entry.data[CONF_USERNAME]
         self.password = config_entry.data[CONF_PASSWORD]
-        scan_interval_hours: int = config_entry.options.get(
-            CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
-        )
-        self.update_interval = timedelta(hours=scan_interval_hours)
-        auth = SimpleMyGasAuth(self.username, self.password, session)
+        self._scheduler = async_get_scheduler(hass)
+        self._scheduler.async_register(config_entry.entry_id)
+        self.circuit_breaker = async_get_circuit_breaker(hass)
+        self.update_interval = self._next_update_interval()
+        if login := async_pop_validated_login(hass, self.username, self.password):
+            # Start from the session and accounts of the config flow
+            _LOGGER.debug("Using the login validated by the flow for %s", self.username)
+            auth = login.auth
+            self.data = {
+                CONF_ACCOUNTS: login.accounts,
+                ATTR_ACCOUNTS_UPDATE_TIME: dt_util.now(),
+            }
+        else:
+            auth = SimpleMyGasAuth(self.username, self.password, session)
         self._api = MyGasApi(auth)
+        self._store = get_snapshot_store(hass, config_entry.entry_id)
+        self.accounts: dict[int, tuple[MyGasAccount, ...]] = {}
+        self.skipped_state_writes = 0
+        self._device_index: dict[str, MyGasDeviceRef] = {}
+        self._indexed_data: dict[str, Any] | None = None
+        self._prepared_model: tuple[dict[str, Any] | None, MyGasModel] | None = None
+        self._account_update_times: dict[int, datetime] = {}
+        self._accounts_refreshed_alone: dict[int, datetime] = {}
+        self.stale_accounts: dict[int, MyGasStaleAccount] = {}
+        self._account_retry_unsubs: dict[int, CALLBACK_TYPE] = {}
+        self.metrics = MyGasApiMetrics()
+        self.trace = MyGasApiTrace()
+        self.watchdog = MyGasLoopWatchdog(
+            enabled=config_entry.options.get(CONF_LOOP_WATCHDOG, False)
+        )
+        # None monitors every account, including ones added later
+        self.monitored_accounts: set[int] | None = None
+        monitored = config_entry.options.get(CONF_MONITORED_ACCOUNTS)
+        if monitored is not None:
+            self.monitored_accounts = {int(account_id) for account_id in monitored}
+        self.recorder: MyGasTrafficRecorder | None = None
+        if config_entry.options.get(CONF_RECORD_TRAFFIC, False):
+            self.recorder = MyGasTrafficRecorder(hass, config_entry.entry_id)
+            _LOGGER.info("Recording API traffic to %s", self.recorder.path)
+        self._options = dict(config_entry.options)
+
+    async def async_restore_snapshot(self) -> bool:
+        """Restore the last good data saved by a previous run.
+
+        The accounts validated by a config flow are kept when they are newer
+        than the accounts of the snapshot.
+        """
+        handoff = self.data
+        try:
+            snapshot = await self._store.async_load()
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.warning(
+                "Unable to load data snapshot for %s", self.username, exc_info=True
+            )
+            return False
+
+        if not snapshot or not snapshot.get(CONF_INFO):
+            return False
+
+        last_update_time = dt_util.parse_datetime(
+            snapshot.get(ATTR_LAST_UPDATE_TIME) or ""
+        )
+        accounts = snapshot.get(CONF_ACCOUNTS)
+        accounts_update_time = dt_util.parse_datetime(
+            snapshot.get(ATTR_ACCOUNTS_UPDATE_TIME) or ""
+        )
+        if (handoff_time := handoff.get(ATTR_ACCOUNTS_UPDATE_TIME)) is not None and (
+            accounts_update_time is None or handoff_time > accounts_update_time
+        ):
+            accounts = handoff[CONF_ACCOUNTS]
+            accounts_update_time = handoff_time
+        self.data = {
+            ATTR_LAST_UPDATE_TIME: last_update_time,
+            CONF_ACCOUNTS: accounts,
+            ATTR_ACCOUNTS_UPDATE_TIME: accounts_update_time,
+            ATTR_IS_ELS: snapshot.get(ATTR_IS_ELS, False),
+            CONF_INFO: {
+                int(account_id): info
+                for account_id, info in snapshot[CONF_INFO].items()
+                if self.is_monitored(int(account_id))
+            },
+        }
+        await self._async_prepare_model(self.data)
+        self._async_build_accounts()
+        _LOGGER.debug(
+            "Data snapshot for %s restored (last update %s)",
+            self.username,
+            last_update_time,
+        )
+        return True
+
+    @callback
+    def _async_save_snapshot(self, data: dict[str, Any]) -> None:
+        """Schedule saving the last good data."""
+
+        @callback
+        def _snapshot() -> dict[str, Any]:
+            last_update_time = data.get(ATTR_LAST_UPDATE_TIME)
+            accounts_update_time = data.get(ATTR_ACCOUNTS_UPDATE_TIME)
+            with self.watchdog.watch("MyGasCoordinator._async_save_snapshot"):
+                return {
+                    ATTR_LAST_UPDATE_TIME: (
+                        last_update_time.isoformat() if last_update_time else None
+                    ),
+                    CONF_ACCOUNTS: data.get(CONF_ACCOUNTS),
+                    ATTR_ACCOUNTS_UPDATE_TIME: (
+                        accounts_update_time.isoformat()
+                        if accounts_update_time
+                        else None
+                    ),
+                    ATTR_IS_ELS: data.get(ATTR_IS_ELS, False),
+                    CONF_INFO: {
+                        str(account_id): info
+                        for account_id, info in data.get(CONF_INFO, {}).items()
+                    },
+                }
+
+        self._store.async_delay_save(_snapshot, SNAPSHOT_SAVE_DELAY)
+
+    async def async_shutdown(self) -> None:
+        """Cancel scheduled account retries and shut down the coordinator."""
+        for unsub in self._account_retry_unsubs.values():
+            unsub()
+        self._account_retry_unsubs.clear()
+        self._scheduler.async_unregister(self.config_entry.entry_id)
+        if self.recorder is not None:
+            await self.recorder.async_save()
+        await super().async_shutdown()
 
-    async def async_force_refresh(self) -> None:
+    def options_require_reload(self) -> bool:
+        """Check the changed options can only be applied by a reload."""
+        options = self.config_entry.options
+        return any(
+            self._options.get(key) != options.get(key)
+            for key in self._options.keys() | options.keys()
+            if key not in LIVE_OPTIONS
+        )
+
+    async def async_apply_options(self) -> None:
+        """Apply changed options to the running coordinator.
+
+        Only options that do not change the devices and entities are applied
+        here; the data is kept and the next refresh is rescheduled.
+        """
+        options = self.config_entry.options
+        if options == self._options:
+            return
+        self._options = dict(options)
+        self.watchdog.enabled = options.get(CONF_LOOP_WATCHDOG, False)
+
+        if options.get(CONF_RECORD_TRAFFIC, False):
+            if self.recorder is None:
+                self.recorder = MyGasTrafficRecorder(
+                    self.hass, self.config_entry.entry_id
+                )
+                _LOGGER.info("Recording API traffic to %s", self.recorder.path)
+        elif (recorder := self.recorder) is not None:
+            self.recorder = None
+            await recorder.async_save()
+
+        self.update_interval = self._next_update_interval()
+        if self._listeners:
+            self._schedule_refresh()
+        _LOGGER.debug(
+            "Options of %s applied, next update in %s",
+            self.username,
+            self.update_interval,
+        )
+
+    async def async_force_refresh(
+        self, reason: RefreshReason = RefreshReason.FORCED
+    ) -> None:
         """Force refresh data."""
         self.force_next_update = True
+        self.refresh_reason = reason
         await self.async_refresh()
 
+    @property
+    def scan_interval(self) -> timedelta:
+        """Cadence of the ELS/LSPU account details."""
+        return timedelta(
+            hours=self.config_entry.options.get(
+                CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+            )
+        )
+
+    @property
+    def accounts_interval(self) -> timedelta:
+        """Cadence of the account list of the login."""
+        return timedelta(
+            days=self.config_entry.options.get(
+                CONF_ACCOUNTS_INTERVAL, DEFAULT_ACCOUNTS_INTERVAL
+            )
+        )
+
+    @property
+    def polling_calendar(self) -> MyGasPollingCalendar | None:
+        """Calendar of the refreshes in the calendar polling mode."""
+        options = self.config_entry.options
+        if options.get(CONF_POLLING_MODE) != POLLING_MODE_CALENDAR:
+            return None
+        return MyGasPollingCalendar.from_options(options)
+
+    def _next_update_interval(self) -> timedelta:
+        """Get the delay until the next refresh slot of this login."""
+        if (polling_calendar := self.polling_calendar) is not None:
+            return self._scheduler.delay_until(
+                self.config_entry.entry_id,
+                polling_calendar.next_refresh(dt_util.now()),
+            )
+        return self._scheduler.next_interval(
+            self.config_entry.entry_id, self.scan_interval
+        )
+
+    def _accounts_due(self, data: dict[str, Any]) -> bool:
+        """Check the account list has to be fetched."""
+        if data.get(CONF_ACCOUNTS) is None or self.force_next_update:
+            return True
+        updated = data.get(ATTR_ACCOUNTS_UPDATE_TIME)
+        return updated is None or dt_util.now() - updated >= self.accounts_interval
+
+    def _account_due(self, account_id: int) -> bool:
+        """Check the details of an account have to be fetched.
+
+        Accounts refreshed on their own since the last scheduled refresh,
+        by the refresh service or a retry, wait for the next one.
+        """
+        if self.force_next_update or account_id not in self.get_accounts():
+            return True
+        refreshed = self._accounts_refreshed_alone.get(account_id)
+        return refreshed is None or dt_util.now() - refreshed >= self.scan_interval / 2
+
     async def _async_update_data(self) -> dict[str, Any] | None:
+        """Fetch data from MyGas once the scheduler grants a refresh slot."""
+        reason, self.refresh_reason = self.refresh_reason, RefreshReason.SCHEDULED
+        async with self._scheduler.async_refresh_slot(self.config_entry.entry_id):
+            with self.metrics.track_refresh(reason):
+                started = time.monotonic()
+                try:
+                    data = await self._async_fetch_data()
+                    await self._async_prepare_model(data)
+                    return data
+                finally:
+                    self.metrics.last_refresh_duration = round(
+                        time.monotonic() - started, 3
+                    )
+
+    async def _async_fetch_data(self) -> dict[str, Any] | None:
         """Fetch data from MyGas."""
         _data: dict[str, Any] = self.data if self.data is not None else {}
         new_data: dict[str, Any] = {
@@ -93,10 +467,12 @@ class MyGasCoordinator(DataUpdateCoordinator):
         _LOGGER.debug("Start updating data...")
         try:
             accounts_info = _data.get(CONF_ACCOUNTS)
-            if accounts_info is None or self.force_next_update:
+            accounts_update_time = _data.get(ATTR_ACCOUNTS_UPDATE_TIME)
+            if self._accounts_due(_data):
                 # get account general information
                 _LOGGER.debug("Get accounts info for %s", self.username)
                 accounts_info = await self._async_get_accounts()
+                accounts_update_time = new_data[ATTR_LAST_UPDATE_TIME]
                 if accounts_info:
                     _LOGGER.debug(
                         "Accounts info for %s retrieved successfully", self.username
@@ -112,6 +488,7 @@ class MyGasCoordinator(DataUpdateCoordinator):
                 )
 
             new_data[CONF_ACCOUNTS] = accounts_info
+            new_data[ATTR_ACCOUNTS_UPDATE_TIME] = accounts_update_time
 
             if accounts_info.get("elsGroup"):
                 _LOGGER.debug(
@@ -144,39 +521,122 @@ class MyGasCoordinator(DataUpdateCoordinator):
         except Exception as exc:  # pylint: disable=broad-except
             raise UpdateFailed(f"Error communicating with API: {exc}") from exc
         else:
-            _LOGGER.debug("Data updated successfully for %s", self.username)
-            _LOGGER.debug("%s", new_data)
+            _LOGGER.debug(
+                "Data updated successfully for %s (%d accounts)",
+                self.username,
+                len(new_data.get(CONF_INFO) or {}),
+            )
+            if new_data.get(CONF_INFO):
+                self._async_save_snapshot(new_data)
 
             return new_data
         finally:
             self.force_next_update = False
-            scan_interval_hours: int = self.config_entry.options.get(
-                CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
-            )
-            self.update_interval = timedelta(hours=scan_interval_hours)
+            self.update_interval = self._next_update_interval()
+            _LOGGER.debug("Next update in %s", self.update_interval)
+
+    @property
+    def max_concurrent_requests(self) -> int:
+        """Maximum number of account details requested at once."""
+        return self.config_entry.options.get(
+            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        )
+
+    async def _async_fetch_concurrently(
+        self,
+        ids: list[int],
+        fetch: Callable[[int], Awaitable[Any]],
+    ) -> list[Any]:
+        """Fetch details for each id with a bounded number of parallel requests.
+
+        Results are returned in the order of ``ids``. A failed fetch yields
+        ``None`` without affecting the others. Authentication errors are
+        re-raised, as is the first error when every fetch failed.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        async def _async_fetch_one(item_id: int) -> Any:
+            async with semaphore:
+                started = time.monotonic()
+                try:
+                    return await fetch(item_id)
+                finally:
+                    self.metrics.record_account_duration(
+                        item_id, time.monotonic() - started
+                    )
+
+        results = await asyncio.gather(
+            *(_async_fetch_one(item_id) for item_id in ids),
+            return_exceptions=True,
+        )
+
+        errors: list[BaseException] = []
+        for item_id, result in zip(ids, results, strict=True):
+            if not isinstance(result, BaseException):
+                continue
+            if isinstance(result, ConfigEntryAuthFailed) or not isinstance(
+                result, Exception
+            ):
+                raise result
+            _LOGGER.warning("Failed to fetch info for id=%d: %s", item_id, result)
+            errors.append(result)
+
+        if errors and len(errors) == len(results):
+            raise errors[0]
+
+        return [
+            None if isinstance(result, BaseException) else result
+            for result in results
+        ]
+
+    async def _async_fetch_due(
+        self,
+        ids: list[int],
+        fetch: Callable[[int], Awaitable[Any]],
+    ) -> dict[int, Any]:
+        """Fetch the details of the accounts that are due.
+
+        Accounts that are not due are missing from the result.
+        """
+        due_ids = [item_id for item_id in ids if self._account_due(item_id)]
+        if len(due_ids) < len(ids):
             _LOGGER.debug(
-                "Update interval: %s hours", scan_interval_hours
+                "Skip %d accounts refreshed recently", len(ids) - len(due_ids)
             )
+        _LOGGER.debug("Get info for %s", due_ids)
+        results = await self._async_fetch_concurrently(due_ids, fetch)
+        return dict(zip(due_ids, results, strict=True))
 
     async def retrieve_els_accounts_info(
         self, accounts_info: dict[str, Any]
     ) -> dict[int, Any]:
         """Retrieve ELS accounts info."""
         els_list = accounts_info.get("elsGroup")
-        els_info = {}
+        els_ids: list[int] = []
         for els in els_list:
             els_id = els.get("els", {}).get("id")
             if not els_id:
                 _LOGGER.warning("id not found in els info")
                 continue
-            els_id = int(els_id)
-            _LOGGER.debug("Get els info for %d", els_id)
-            els_item_info = await self._async_get_els_info(els_id)
-            if els_item_info:
+            els_ids.append(int(els_id))
+        els_ids = self._async_select_monitored(els_ids)
+
+        fetched = await self._async_fetch_due(els_ids, self._async_get_els_info)
+
+        els_info = {}
+        for els_id in els_ids:
+            if els_id not in fetched:
+                els_info[els_id] = self.get_accounts()[els_id]
+            elif els_item_info := fetched[els_id]:
                 els_info[els_id] = els_item_info
                 _LOGGER.debug("Els info for id=%d retrieved successfully", els_id)
+                self._account_update_times[els_id] = dt_util.now()
+                self._accounts_refreshed_alone.pop(els_id, None)
+                self._async_account_fetched(els_id)
             else:
                 _LOGGER.warning("Els info for id=%d not retrieved", els_id)
+                self._async_keep_previous_info(els_info, els_id)
+        self._async_forget_stale_accounts(els_ids)
         return els_info
 
     async def retrieve_lspu_accounts_info(
@@ -184,104 +644,300 @@ class MyGasCoordinator(DataUpdateCoordinator):
     ) -> dict[int, Any]:
         """Retrieve LSPU accounts info."""
         lspu_list = accounts_info.get("lspu")
-        lspu_info = {}
+        lspu_ids: list[int] = []
         for lspu in lspu_list:
             lspu_id = lspu.get("id")
             if not lspu_id:
                 _LOGGER.warning("id not found in lspu info")
                 continue
+            lspu_ids.append(int(lspu_id))
+        lspu_ids = self._async_select_monitored(lspu_ids)
+
+        fetched = await self._async_fetch_due(lspu_ids, self._async_get_lspu_info)
 
-            lspu_id = int(lspu_id)
-            _LOGGER.debug("Get lspu info for %s", lspu_id)
-            lspu_item_info = await self._async_get_lspu_info(lspu_id)
-            if lspu_item_info:
+        lspu_info = {}
+        for lspu_id in lspu_ids:
+            if lspu_id not in fetched:
+                lspu_info[lspu_id] = self.get_accounts()[lspu_id]
+            elif lspu_item_info := fetched[lspu_id]:
                 if isinstance(lspu_item_info, list):
                     lspu_info[lspu_id] = lspu_item_info
                 else:
                     lspu_info[lspu_id] = [lspu_item_info]
                 _LOGGER.debug("Lspu info for %s retrieved successfully", lspu_id)
+                self._account_update_times[lspu_id] = dt_util.now()
+                self._accounts_refreshed_alone.pop(lspu_id, None)
+                self._async_account_fetched(lspu_id)
             else:
                 _LOGGER.warning("Lspu info for %s not retrieved", lspu_id)
+                self._async_keep_previous_info(lspu_info, lspu_id)
+        self._async_forget_stale_accounts(lspu_ids)
         return lspu_info
 
-    def get_accounts(self) -> dict[int, dict[str | int, Any]]:
-        """Get accounts info."""
-        return self.data.get(CONF_INFO, {})
+    def is_monitored(self, account_id: int) -> bool:
+        """Check the ELS/LSPU account is selected for monitoring."""
+        return self.monitored_accounts is None or account_id in self.monitored_accounts
 
-    def get_account_number(self, account_id: int, lspu_account_id: int) -> str:
-        """Get account number."""
-        account = self.get_accounts()[account_id]
-        if self.is_els():
-            _account_number = account.get(ATTR_ELS, {}).get(ATTR_JNT_ACCOUNT_NUM)
-        else:
-            _account_number = account[lspu_account_id].get(CONF_ACCOUNT)
-        return _account_number
+    @callback
+    def _async_select_monitored(self, account_ids: list[int]) -> list[int]:
+        """Drop the accounts not selected for monitoring."""
+        selected = [
+            account_id for account_id in account_ids if self.is_monitored(account_id)
+        ]
+        if len(selected) < len(account_ids):
+            _LOGGER.debug(
+                "Skip %d of %d accounts not selected for %s",
+                len(account_ids) - len(selected),
+                len(account_ids),
+                self.username,
+            )
+        if account_ids and not selected:
+            _LOGGER.warning(
+                "None of the selected accounts of %s exist any more, "
+                "select accounts in the integration options",
+                self.username,
+            )
+        return selected
 
-    def get_account_alias(self, account_id: int, lspu_account_id: int) -> str | None:
-        """Get account alias."""
-        account = self.get_accounts()[account_id]
-        if self.is_els():
-            _account_alias = account.get(ATTR_ELS, {}).get(ATTR_ALIAS)
+    @callback
+    def _async_keep_previous_info(self, info: dict[int, Any], account_id: int) -> None:
+        """Keep the last good data of an account whose fetch failed."""
+        previous = self.get_accounts().get(account_id) if self.data else None
+        if previous is None:
+            return
+        info[account_id] = previous
+        self._async_account_failed(account_id)
+
+    @callback
+    def _async_account_failed(self, account_id: int) -> None:
+        """Mark an account as stale and schedule a retry of just that account."""
+        if stale := self.stale_accounts.get(account_id):
+            stale.error_count += 1
         else:
-            _account_alias = account[lspu_account_id].get(ATTR_ALIAS)
-        return _account_alias
+            stale = self.stale_accounts[account_id] = MyGasStaleAccount(
+                since=dt_util.now(),
+                error_count=1,
+                last_update_time=self.get_last_update_time(account_id),
+            )
+
+        delay = min(
+            ACCOUNT_RETRY_DELAY * 2 ** (stale.error_count - 1),
+            ACCOUNT_RETRY_MAX_DELAY,
+        )
+        _LOGGER.debug(
+            "Account %d is stale since %s (%d errors), retry in %d seconds",
+            account_id,
+            stale.since,
+            stale.error_count,
+            delay,
+        )
+        self._async_cancel_account_retry(account_id)
+        self._account_retry_unsubs[account_id] = async_call_later(
+            self.hass,
+            delay,
+            HassJob(
+                partial(self._async_schedule_account_retry, account_id),
+                f"{DOMAIN} retry account {account_id}",
+                cancel_on_shutdown=True,
+            ),
+        )
+
+    @callback
+    def _async_account_fetched(self, account_id: int) -> None:
+        """Clear the stale mark of an account fetched successfully."""
+        self._async_cancel_account_retry(account_id)
+        if self.stale_accounts.pop(account_id, None) is not None:
+            _LOGGER.debug("Account %d is up to date again", account_id)
+
+    @callback
+    def _async_forget_stale_accounts(self, account_ids: list[int]) -> None:
+        """Drop the stale marks of accounts no longer returned by the API."""
+        for account_id in set(self.stale_accounts) - set(account_ids):
+            self._async_account_fetched(account_id)
+
+    @callback
+    def _async_cancel_account_retry(self, account_id: int) -> None:
+        """Cancel a scheduled retry of an account."""
+        if unsub := self._account_retry_unsubs.pop(account_id, None):
+            unsub()
+
+    @callback
+    def _async_schedule_account_retry(self, account_id: int, _now: datetime) -> None:
+        """Start the retry of a stale account."""
+        self._account_retry_unsubs.pop(account_id, None)
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_retry_account(account_id),
+            f"{DOMAIN} retry account {account_id}",
+        )
+
+    async def _async_retry_account(self, account_id: int) -> None:
+        """Retry fetching a stale account."""
+        if account_id not in self.stale_accounts:
+            return
+        try:
+            await self.async_refresh_account(account_id, RefreshReason.RETRY)
+        except ConfigEntryAuthFailed:
+            pass
+        except HomeAssistantError as exc:
+            _LOGGER.debug("Retry of account %d failed: %s", account_id, exc)
+
+    def get_accounts(self) -> dict[int, dict[str | int, Any]]:
+        """Get accounts info."""
+        return self.data.get(CONF_INFO, {})
 
     def is_els(self) -> bool:
         """Account is ELS."""
         return self.data.get(ATTR_IS_ELS, False)
 
-    def get_lspu_accounts(self, account_id: int) -> list[dict[str | int, Any]]:
-        """Get LSPU accounts."""
-        _data = self.get_accounts()[account_id]
-        if self.is_els():
-            _lspu_accounts = _data[ATTR_LSPU_INFO_GROUP]
+    def get_account(self, account_id: int, lspu_account_id: int) -> MyGasAccount:
+        """Get LSPU account model."""
+        return self.accounts[account_id][lspu_account_id]
+
+    def iter_accounts(self) -> Iterator[MyGasAccount]:
+        """Iterate over all LSPU account models."""
+        for lspu_accounts in self.accounts.values():
+            yield from lspu_accounts
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """Rebuild the account model after a refresh that changed the data."""
+        if self.data is not self._indexed_data:
+            self._async_build_accounts()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners."""
+        with self.watchdog.watch("MyGasCoordinator.async_update_listeners"):
+            super().async_update_listeners()
+
+    async def _async_prepare_model(self, data: dict[str, Any] | None) -> None:
+        """Build the model of new data, in the executor for large logins.
+
+        The finished model is applied once the data becomes current.
+        """
+        if count_payload_entries(data) <= EXECUTOR_MODEL_THRESHOLD:
+            return
+        model = await self.hass.async_add_executor_job(build_model, data)
+        self._prepared_model = (data, model)
+
+    @callback
+    def _async_build_accounts(self) -> None:
+        """Build the account model and the device index from the data."""
+        prepared, self._prepared_model = self._prepared_model, None
+        if prepared is not None and prepared[0] is self.data:
+            self.accounts, self._device_index = prepared[1]
         else:
-            _lspu_accounts = _data if isinstance(_data, list) else [_data]
-        return _lspu_accounts
+            with self.watchdog.watch("MyGasCoordinator._async_build_accounts"):
+                self.accounts, self._device_index = build_model(self.data)
+        self._indexed_data = self.data
 
-    def get_counters(
-        self, account_id: int, lspu_account_id: int
-    ) -> list[dict[str, Any]]:
-        """Get counter data."""
-        _accounts = self.get_lspu_accounts(account_id)[lspu_account_id]
-        return _accounts.get(ATTR_COUNTERS, [])
+    @callback
+    def _async_build_device_index(self) -> None:
+        """Rebuild the device index from the account model."""
+        self._device_index = build_device_index(self.accounts)
+        self._indexed_data = self.data
 
-    def get_services(
-        self, account_id: int, lspu_account_id: int
-    ) -> list[dict[str, Any]]:
-        """Get services."""
-        account = self.get_lspu_accounts(account_id)[lspu_account_id]
-        return account.get(ATTR_SERVICES, [])
+    def get_last_update_time(self, account_id: int) -> datetime | None:
+        """Get the time the data of an account was last updated."""
+        if stale := self.stale_accounts.get(account_id):
+            return stale.last_update_time
+        return self._account_update_times.get(
+            account_id, self.data.get(ATTR_LAST_UPDATE_TIME)
+        )
 
-    async def find_account_by_device_id(
-        self, device_id: str
-    ) -> tuple[int | None, int | None, int | None]:
-        """Find device by id."""
+    async def async_refresh_device(self, device_id: str) -> None:
+        """Refresh only the account the device belongs to."""
+        ref = self.get_device_ref(device_id)
+        if ref is None:
+            _LOGGER.debug(
+                "Device %s not found in data, refresh all accounts", device_id
+            )
+            await self.async_force_refresh(RefreshReason.SERVICE)
+            return
+        await self.async_refresh_account(ref.account_id)
+
+    async def async_refresh_account(
+        self, account_id: int, reason: RefreshReason = RefreshReason.SERVICE
+    ) -> None:
+        """Re-fetch a single ELS/LSPU account and notify only its entities."""
+        with self.metrics.track_refresh(reason):
+            await self._async_refresh_account(account_id)
+
+    async def _async_refresh_account(self, account_id: int) -> None:
+        """Re-fetch a single account."""
+        is_els = self.is_els()
+        _LOGGER.debug("Refresh %s info for %d", "els" if is_els else "lspu", account_id)
+        started = time.monotonic()
+        try:
+            if is_els:
+                info = await self._async_get_els_info(account_id)
+            else:
+                info = await self._async_get_lspu_info(account_id)
+        except ConfigEntryAuthFailed:
+            self.config_entry.async_start_reauth(self.hass)
+            raise
+        except Exception:
+            if account_id in self.get_accounts():
+                self._async_account_failed(account_id)
+            raise
+        finally:
+            self.metrics.record_account_duration(account_id, time.monotonic() - started)
+        if not info:
+            if account_id in self.get_accounts():
+                self._async_account_failed(account_id)
+            raise HomeAssistantError(f"Info for account {account_id} not retrieved")
+        if not is_els and not isinstance(info, list):
+            info = [info]
+
+        self.data = {
+            **self.data,
+            CONF_INFO: {**self.get_accounts(), account_id: info},
+        }
+        now = dt_util.now()
+        self._account_update_times[account_id] = now
+        self._accounts_refreshed_alone[account_id] = now
+        self._async_account_fetched(account_id)
+        with self.watchdog.watch("MyGasCoordinator._async_refresh_account"):
+            self.accounts = {
+                **self.accounts,
+                account_id: build_account_group(account_id, info, is_els),
+            }
+            self._async_build_device_index()
+        self._async_save_snapshot(self.data)
+        self.async_update_account_listeners(account_id)
+
+    @callback
+    def async_update_account_listeners(self, account_id: int) -> None:
+        """Update the listeners registered for a single account."""
+        with self.watchdog.watch("MyGasCoordinator.async_update_account_listeners"):
+            for update_callback, context in list(self._listeners.values()):
+                if context == account_id:
+                    update_callback()
+
+    @property
+    def device_identifiers(self) -> set[str]:
+        """Identifiers of all devices present in the current data."""
+        return set(self._device_index)
+
+    def get_device_ref(self, device_id: str) -> MyGasDeviceRef | None:
+        """Get the location of a device registry entry in the data."""
         device_registry = dr.async_get(self.hass)
         device = device_registry.async_get(device_id)
         if not device:
             raise HomeAssistantError(f"Device {device_id} not found")
 
-        for account_id in self.get_accounts():
-            for lspu_account_id in range(len(self.get_lspu_accounts(account_id))):
-                _account_number = self.get_account_number(
-                    account_id, lspu_account_id
-                )
-                # Check account-level device
-                if device.identifiers == {
-                    (DOMAIN, make_account_device_id(_account_number))
-                }:
-                    return account_id, lspu_account_id, None
-                # Check counter-level device
-                counters = self.get_counters(account_id, lspu_account_id)
-                for counter_id, counter in enumerate(counters):
-                    _counter_uuid = counter.get(ATTR_UUID)
-                    if not _counter_uuid:
-                        continue
-                    if device.identifiers == {
-                        (DOMAIN, make_device_id(_account_number, _counter_uuid))
-                    }:
-                        return account_id, lspu_account_id, counter_id
+        for domain, identifier in device.identifiers:
+            if domain == DOMAIN and (ref := self._device_index.get(identifier)):
+                return ref
+        return None
+
+    async def find_account_by_device_id(
+        self, device_id: str
+    ) -> tuple[int | None, int | None, int | None]:
+        """Find device by id."""
+        if ref := self.get_device_ref(device_id):
+            return ref.account_id, ref.lspu_account_id, ref.counter_id
         return None, None, None
 
     @async_api_request_handler
@@ -370,28 +1026,22 @@ class MyGasCoordinator(DataUpdateCoordinator):
             raise HomeAssistantError(
                 f"Account not found for device {device_id}"
             )
-        lspu_accounts = self.get_lspu_accounts(account_id)
-        if not lspu_accounts:
-            raise HomeAssistantError(
-                f"No LSPU accounts found for account {account_id}"
-            )
-        lspu_account = lspu_accounts[lspu_account_id]
-        if not lspu_account:
+        account = self.get_account(account_id, lspu_account_id)
+        lspu_id = account.lspu_id
+        if lspu_id is None:
             raise HomeAssistantError(
                 f"LSPU account {lspu_account_id} not found"
             )
-        lspu_id = lspu_account[ATTR_ACCOUNT_ID]
 
         if self.is_els():
             els_id = account_id
         else:
             els_id = None
-        counters = self.get_counters(account_id, lspu_account_id)
-        if not counters:
+        if not account.counters:
             raise HomeAssistantError(
                 f"No counters found for account {account_id}"
             )
-        equipment_uuid = counters[counter_id][ATTR_UUID]
+        equipment_uuid = account.counters[counter_id].uuid
         if not equipment_uuid:
             raise HomeAssistantError(
                 f"Counter UUID not found for counter {counter_id}"
@@ -4,17 +4,44 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from collections.abc import Awaitable, Callable, Coroutine
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
 from functools import wraps
 from random import randrange
 from typing import TYPE_CHECKING, Any, Concatenate, ParamSpec, TypeVar
 
+from aiohttp import (
+    ClientError,
+    ClientSession,
+    TraceConfig,
+    TraceResponseChunkReceivedParams,
+)
+from aiomygas.const import DEFAULT_HOST
 from aiomygas.exceptions import MyGasApiError, MyGasAuthError
 
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
 
-from .const import API_MAX_TRIES, API_RETRY_DELAY, API_TIMEOUT
+from .const import (
+    API_MAX_TRIES,
+    API_RETRY_DELAY,
+    API_TIMEOUT,
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_RESET_TIMEOUT,
+    DOMAIN,
+    VALIDATION_DEADLINE,
+    VALIDATION_MAX_TRIES,
+    VALIDATION_RETRY_DELAY,
+    VALIDATION_TIMEOUT,
+)
 
 if TYPE_CHECKING:
     from .coordinator import MyGasCoordinator
@@ -26,30 +53,202 @@ _P = ParamSpec("_P")
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class RequestAttempts:
+    """Retries, timeouts and received bodies of the request in progress."""
+
+    retries: int = 0
+    timeouts: int = 0
+    payload_size: int | None = None
+    payload: bytes | None = None
+
+
+_REQUEST_ATTEMPTS: ContextVar[RequestAttempts | None] = ContextVar(
+    "mygas_request_attempts", default=None
+)
+
+
+class MyGasCircuitOpenError(MyGasApiError):
+    """Request rejected because the MyGas API circuit is open."""
+
+
+class CircuitState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class MyGasCircuitBreaker:
+    """Circuit breaker shared by all requests to one API host.
+
+    After ``CIRCUIT_BREAKER_FAILURE_THRESHOLD`` consecutive requests that
+    timed out or failed on the HTTP level, the token request included,
+    the circuit opens and requests fail fast. Once
+    ``CIRCUIT_BREAKER_RESET_TIMEOUT`` seconds have passed a single probe
+    request is let through: success closes the circuit, failure opens it
+    again.
+    """
+
+    def __init__(self, host: str) -> None:
+        """Initialize the circuit breaker."""
+        self.host = host
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.rejected_requests = 0
+        self.opened_at: datetime | None = None
+        self._opened_monotonic = 0.0
+        self._probe_in_flight = False
+
+    def before_request(self) -> None:
+        """Check a request may be sent, raise MyGasCircuitOpenError otherwise."""
+        if self.state is CircuitState.OPEN:
+            if time.monotonic() - self._opened_monotonic < CIRCUIT_BREAKER_RESET_TIMEOUT:
+                self._reject()
+            _LOGGER.debug("Circuit for %s is half-open, probing", self.host)
+            self.state = CircuitState.HALF_OPEN
+        elif self.state is CircuitState.HALF_OPEN and self._probe_in_flight:
+            self._reject()
+
+        if self.state is CircuitState.HALF_OPEN:
+            self._probe_in_flight = True
+
+    def _reject(self) -> None:
+        """Reject a request while the circuit is open."""
+        self.rejected_requests += 1
+        raise MyGasCircuitOpenError(
+            f"MyGas API at {self.host} is unavailable, circuit is open"
+        )
+
+    def record_success(self) -> None:
+        """Record a request that reached the API."""
+        if self.state is not CircuitState.CLOSED:
+            _LOGGER.info("Circuit for %s is closed, API is available", self.host)
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed request and open the circuit when needed."""
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if (
+            self.state is CircuitState.HALF_OPEN
+            or self.consecutive_failures >= CIRCUIT_BREAKER_FAILURE_THRESHOLD
+        ):
+            if self.state is not CircuitState.OPEN:
+                _LOGGER.warning(
+                    "Circuit for %s is open after %d failed requests, "
+                    "retry in %d seconds",
+                    self.host,
+                    self.consecutive_failures,
+                    CIRCUIT_BREAKER_RESET_TIMEOUT,
+                )
+            self.state = CircuitState.OPEN
+            self.opened_at = dt_util.utcnow()
+            self._opened_monotonic = time.monotonic()
+
+    def release(self) -> None:
+        """Release the probe of a request that ended without a result."""
+        self._probe_in_flight = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state for diagnostics."""
+        return {
+            "host": self.host,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected_requests": self.rejected_requests,
+            "opened_at": self.opened_at.isoformat() if self.opened_at else None,
+        }
+
+
+DATA_CIRCUIT_BREAKERS: HassKey[dict[str, MyGasCircuitBreaker]] = HassKey(
+    f"{DOMAIN}_circuit_breakers"
+)
+
+
+@callback
+def async_get_circuit_breaker(
+    hass: HomeAssistant, host: str = DEFAULT_HOST
+) -> MyGasCircuitBreaker:
+    """Get the circuit breaker of an API host shared by all config entries."""
+    breakers = hass.data.setdefault(DATA_CIRCUIT_BREAKERS, {})
+    if (breaker := breakers.get(host)) is None:
+        breaker = breakers[host] = MyGasCircuitBreaker(host)
+    return breaker
+
+
+DATA_SESSION: HassKey[ClientSession] = HassKey(f"{DOMAIN}_session")
+
+
+async def _async_response_received(
+    _session: ClientSession,
+    _context: Any,
+    params: TraceResponseChunkReceivedParams,
+) -> None:
+    """Add a response body read by aiomygas to the request in progress."""
+    if (attempts := _REQUEST_ATTEMPTS.get()) is not None:
+        attempts.payload_size = (attempts.payload_size or 0) + len(params.chunk)
+        attempts.payload = params.chunk
+
+
+@callback
+def async_get_api_session(hass: HomeAssistant) -> ClientSession:
+    """Get the HTTP session of the MyGas API shared by all config entries.
+
+    The session measures the response bodies as aiohttp reads them, so the
+    metrics get the payload size without serializing the parsed response.
+    """
+    if (session := hass.data.get(DATA_SESSION)) is None:
+        trace_config = TraceConfig()
+        trace_config.on_response_chunk_received.append(_async_response_received)
+        session = hass.data[DATA_SESSION] = async_create_clientsession(
+            hass, trace_configs=[trace_config]
+        )
+    return session
+
+
 def async_retry(
-    func: Callable[_P, Awaitable[_R]],
-) -> Callable[_P, Coroutine[Any, Any, _R]]:
-    """Retry async function on transient errors (timeout, API).
+    func: Callable[Concatenate[_MyGasCoordinatorT, _P], Awaitable[_R]],
+) -> Callable[Concatenate[_MyGasCoordinatorT, _P], Coroutine[Any, Any, _R]]:
+    """Retry coordinator method on transient errors (timeout, API).
 
     MyGasAuthError is never retried — it propagates immediately.
+    Requests go through the circuit breaker of the coordinator, which fails
+    fast with MyGasCircuitOpenError while the API is unavailable.
     """
 
     @wraps(func)
-    async def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+    async def wrapper(
+        self: _MyGasCoordinatorT, *args: _P.args, **kwargs: _P.kwargs
+    ) -> _R:
+        breaker = self.circuit_breaker
+        attempts = _REQUEST_ATTEMPTS.get() or RequestAttempts()
         tries = 0
         api_timeout = API_TIMEOUT
         api_retry_delay = API_RETRY_DELAY
         last_error: Exception | None = None
         while True:
             tries += 1
+            breaker.before_request()
             try:
                 async with asyncio.timeout(api_timeout):
-                    return await func(*args, **kwargs)
+                    result = await func(self, *args, **kwargs)
 
-            except MyGasAuthError:
+            except MyGasAuthError as exc:
+                if is_connection_error(exc):
+                    # The token request did not reach the API
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
                 raise
 
             except TimeoutError as exc:
+                breaker.record_failure()
+                attempts.timeouts += 1
                 last_error = exc
                 api_timeout = tries * API_TIMEOUT
                 _LOGGER.debug(
@@ -58,6 +257,11 @@ def async_retry(
                 )
 
             except MyGasApiError as exc:
+                if isinstance(exc.__cause__, ClientError):
+                    breaker.record_failure()
+                else:
+                    # The API answered, the error is not an outage
+                    breaker.record_success()
                 last_error = exc
                 _LOGGER.debug(
                     "Function %s: API error (%s)",
@@ -65,23 +269,79 @@ def async_retry(
                     exc,
                 )
 
+            except BaseException:
+                breaker.release()
+                raise
+
+            else:
+                breaker.record_success()
+                return result
+
             if tries >= API_MAX_TRIES:
                 raise MyGasApiError(
                     f"Failed after {API_MAX_TRIES} attempts: {func.__name__}"
                 ) from last_error
 
+            if breaker.state is not CircuitState.CLOSED:
+                raise MyGasCircuitOpenError(
+                    f"MyGas API at {breaker.host} is unavailable, circuit is open"
+                ) from last_error
+
             _LOGGER.warning(
                 "Attempt %d/%d. Wait %d seconds and try again",
                 tries,
                 API_MAX_TRIES,
                 api_retry_delay,
             )
+            attempts.retries += 1
             await asyncio.sleep(api_retry_delay)
             api_retry_delay += API_RETRY_DELAY + randrange(API_RETRY_DELAY)
 
     return wrapper
 
 
+def is_connection_error(exc: BaseException) -> bool:
+    """Check the error means the MyGas API was not reached."""
+    return isinstance(exc, (TimeoutError, ClientError)) or isinstance(
+        exc.__cause__, ClientError
+    )
+
+
+def async_validation_retry(
+    func: Callable[_P, Awaitable[_R]],
+) -> Callable[_P, Coroutine[Any, Any, _R]]:
+    """Fail fast when validating credentials in the config flow.
+
+    A connection error or timeout is retried once after
+    ``VALIDATION_RETRY_DELAY`` seconds, everything else propagates
+    immediately, including MyGasAuthError. The whole validation is cut off
+    with TimeoutError after ``VALIDATION_DEADLINE`` seconds. Requests do not
+    go through the circuit breaker, so the user's typos do not affect the
+    configured entries.
+    """
+
+    @wraps(func)
+    async def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+        async with asyncio.timeout(VALIDATION_DEADLINE):
+            tries = 0
+            while True:
+                tries += 1
+                try:
+                    async with asyncio.timeout(VALIDATION_TIMEOUT):
+                        return await func(*args, **kwargs)
+                except (TimeoutError, MyGasApiError, ClientError) as exc:
+                    if tries >= VALIDATION_MAX_TRIES or not is_connection_error(exc):
+                        raise
+                    _LOGGER.debug(
+                        "Function %s: MyGas API not reached (%r), retrying",
+                        func.__name__,
+                        exc,
+                    )
+                await asyncio.sleep(VALIDATION_RETRY_DELAY)
+
+    return wrapper
+
+
 def async_api_request_handler(
     method: Callable[Concatenate[_MyGasCoordinatorT, _P], Awaitable[_R]],
 ) -> Callable[Concatenate[_MyGasCoordinatorT, _P], Coroutine[Any, Any, _R]]:
@@ -90,11 +350,14 @@ def async_api_request_handler(
     Wraps async_retry with coordinator-specific exception mapping:
     - MyGasAuthError → ConfigEntryAuthFailed
     - MyGasApiError → UpdateFailed
+
+    Latency, retries, timeouts and payload size of every call are added to
+    the coordinator metrics. Calls are also recorded when the coordinator
+    has a traffic recorder, and traced while debug logging is enabled.
     """
     retried = async_retry(method)
 
-    @wraps(method)
-    async def wrapper(
+    async def _async_call(
         self: _MyGasCoordinatorT, *args: _P.args, **kwargs: _P.kwargs
     ) -> _R:
         try:
@@ -108,4 +371,45 @@ def async_api_request_handler(
                 f"MyGas API error: {exc}"
             ) from exc
 
+    endpoint = method.__name__.removeprefix("_async_")
+
+    @wraps(method)
+    async def wrapper(
+        self: _MyGasCoordinatorT, *args: _P.args, **kwargs: _P.kwargs
+    ) -> _R:
+        recorder = self.recorder
+        trace = self.trace if self.trace.enabled else None
+        attempts = RequestAttempts()
+        token = _REQUEST_ATTEMPTS.set(attempts)
+        started = time.monotonic()
+        try:
+            result = await _async_call(self, *args, **kwargs)
+        except Exception as exc:
+            duration = time.monotonic() - started
+            self.metrics.record(
+                endpoint, duration, attempts.retries, attempts.timeouts, failed=True
+            )
+            if trace is not None:
+                trace.record(endpoint, args, duration, error=exc)
+            if recorder is not None:
+                recorder.record(method.__name__, args, kwargs, started, error=exc)
+            raise
+        finally:
+            _REQUEST_ATTEMPTS.reset(token)
+
+        duration = time.monotonic() - started
+        self.metrics.record(
+            endpoint,
+            duration,
+            attempts.retries,
+            attempts.timeouts,
+            attempts.payload_size,
+        )
+        if trace is not None:
+            with self.watchdog.watch(f"{method.__qualname__} trace"):
+                trace.record(endpoint, args, duration, attempts.payload)
+        if recorder is not None:
+            recorder.record(method.__name__, args, kwargs, started, result=result)
+        return result
+
     return wrapper
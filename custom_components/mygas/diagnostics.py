@@ -4,26 +4,179 @@ from __future__ import annotations
 from typing import Any
 
 from homeassistant.components.diagnostics import async_redact_data
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
 
 from . import MyGasConfigEntry
+from .const import (
+    ATTR_ACCOUNTS_UPDATE_TIME,
+    ATTR_COUNTERS,
+    ATTR_IS_ELS,
+    ATTR_LAST_UPDATE_TIME,
+    ATTR_LSPU_INFO_GROUP,
+    ATTR_SERVICES,
+    CONF_ACCOUNTS,
+    CONF_FULL_DIAGNOSTICS,
+    DIAGNOSTICS_HISTORY_LENGTH,
+    DIAGNOSTICS_SUMMARY_THRESHOLD,
+    EXECUTOR_MODEL_THRESHOLD,
+)
+from .coordinator import MyGasCoordinator
+from .decorators import async_get_circuit_breaker
+from .models import MyGasAccount, MyGasCounter, count_payload_entries
+from .scheduler import async_get_scheduler
 
 TO_REDACT_CONFIG = {"username", "password"}
 TO_REDACT_DATA = {"phone", "email"}
 
 
+def _shape(value: Any) -> Any:
+    """Describe a raw payload by its keys and list lengths."""
+    if isinstance(value, dict):
+        return sorted(value)
+    if isinstance(value, list):
+        return len(value)
+    return type(value).__name__
+
+
+def _lspu_payloads(info: Any, is_els: bool) -> list[dict[str, Any]]:
+    """Get the raw LSPU account payloads of an ELS or LSPU account."""
+    if is_els:
+        return info.get(ATTR_LSPU_INFO_GROUP) or []
+    return info if isinstance(info, list) else [info]
+
+
+@callback
+def _async_summarize_counter(
+    counter: MyGasCounter, payload: dict[str, Any]
+) -> dict[str, Any]:
+    """Summarize a counter with its latest readings and a truncated history."""
+    values = payload.get("values") or []
+    return {
+        "keys": sorted(payload),
+        "readings": counter.readings,
+        "readings_date": (
+            counter.readings_date.isoformat() if counter.readings_date else None
+        ),
+        "values": len(values),
+        "history": async_redact_data(
+            values[:DIAGNOSTICS_HISTORY_LENGTH], TO_REDACT_DATA
+        ),
+    }
+
+
+@callback
+def _async_summarize_account(
+    account: MyGasAccount, payload: dict[str, Any]
+) -> dict[str, Any]:
+    """Summarize an LSPU account with its latest values."""
+    latest = account.latest_balance
+    return {
+        "keys": sorted(payload),
+        "balance": account.balance,
+        "latest_balance": {
+            "date": latest.date.isoformat() if latest.date else None,
+            "charged": latest.charged,
+            "paid": latest.paid,
+            "balance_end": latest.balance_end,
+        },
+        "balances": len(payload.get("balances") or []),
+        "parameters": len(account.parameters),
+        "services": len(payload.get(ATTR_SERVICES) or []),
+        "counters": [
+            _async_summarize_counter(counter, raw_counter)
+            for counter, raw_counter in zip(
+                account.counters, payload.get(ATTR_COUNTERS) or [], strict=False
+            )
+        ],
+    }
+
+
+@callback
+def _async_summarize_data(coordinator: MyGasCoordinator) -> dict[str, Any]:
+    """Summarize the coordinator data without copying the raw payloads."""
+    data = coordinator.data or {}
+    is_els = data.get(ATTR_IS_ELS, False)
+    last_update_time = data.get(ATTR_LAST_UPDATE_TIME)
+    accounts_update_time = data.get(ATTR_ACCOUNTS_UPDATE_TIME)
+    accounts = data.get(CONF_ACCOUNTS) or {}
+    return {
+        "summary": True,
+        ATTR_LAST_UPDATE_TIME: (
+            last_update_time.isoformat() if last_update_time else None
+        ),
+        ATTR_ACCOUNTS_UPDATE_TIME: (
+            accounts_update_time.isoformat() if accounts_update_time else None
+        ),
+        ATTR_IS_ELS: is_els,
+        CONF_ACCOUNTS: {key: _shape(value) for key, value in accounts.items()},
+        "info": {
+            account_id: [
+                _async_summarize_account(account, payload)
+                for account, payload in zip(
+                    coordinator.accounts.get(account_id, ()),
+                    _lspu_payloads(info, is_els),
+                    strict=False,
+                )
+            ]
+            for account_id, info in coordinator.get_accounts().items()
+        },
+    }
+
+
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: MyGasConfigEntry
 ) -> dict[str, Any]:
-    """Return diagnostics for a config entry."""
+    """Return diagnostics for a config entry.
+
+    Logins with large payloads get a summary of the data instead of the full
+    payload, unless the full dump is enabled in the options.
+    """
     coordinator = entry.runtime_data
+    entries = count_payload_entries(coordinator.data)
+    summary = (
+        not entry.options.get(CONF_FULL_DIAGNOSTICS, False)
+        and entries > DIAGNOSTICS_SUMMARY_THRESHOLD
+    )
+
+    if not summary and entries > EXECUTOR_MODEL_THRESHOLD:
+        # The data is never changed in place, so it can be copied in a thread
+        data = await hass.async_add_executor_job(
+            async_redact_data, coordinator.data, TO_REDACT_DATA
+        )
+    else:
+        with coordinator.watchdog.watch("async_get_config_entry_diagnostics"):
+            data = (
+                _async_summarize_data(coordinator)
+                if summary
+                else async_redact_data(coordinator.data or {}, TO_REDACT_DATA)
+            )
 
     return {
         "config_entry": async_redact_data(dict(entry.data), TO_REDACT_CONFIG),
+        "circuit_breaker": async_get_circuit_breaker(hass).as_dict(),
+        "scheduler": async_get_scheduler(hass).as_dict(),
         "coordinator": {
             "last_update_success": coordinator.last_update_success,
-            "data": async_redact_data(
-                coordinator.data or {}, TO_REDACT_DATA
+            "skipped_state_writes": coordinator.skipped_state_writes,
+            "metrics": coordinator.metrics.as_dict(),
+            "refresh_history": [
+                refresh.as_dict() for refresh in coordinator.metrics.refresh_history
+            ],
+            "api_trace": coordinator.trace.as_list(),
+            "stale_accounts": {
+                account_id: {
+                    "since": stale.since.isoformat(),
+                    "error_count": stale.error_count,
+                }
+                for account_id, stale in coordinator.stale_accounts.items()
+            },
+            "loop_watchdog": coordinator.watchdog.as_dict(),
+            "polling_calendar": (
+                polling_calendar.as_dict(dt_util.now())
+                if (polling_calendar := coordinator.polling_calendar)
+                else None
             ),
+            "data": data,
         },
     }
@@ -10,15 +10,13 @@ from typing import Any
 import aiomygas
 
 from homeassistant.components.sensor import SensorEntityDescription
-from homeassistant.const import ATTR_MODEL, ATTR_NAME
+from homeassistant.core import callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     ACCOUNT_MODEL,
-    ATTR_SERIAL_NUM,
-    ATTR_UUID,
     ATTRIBUTION,
     CONFIGURATION_URL,
     DOMAIN,
@@ -26,14 +24,7 @@ from .const import (
     SERVICE_MODEL,
 )
 from .coordinator import MyGasCoordinator
-from .helpers import (
-    to_date,
-    to_int,
-    to_str,
-    make_account_device_id,
-    make_device_id,
-    make_service_device_id,
-)
+from .models import MyGasAccount, MyGasCounter, MyGasService
 
 
 class MyGasCoordinatorEntity(CoordinatorEntity[MyGasCoordinator]):
@@ -50,13 +41,54 @@ class MyGasCoordinatorEntity(CoordinatorEntity[MyGasCoordinator]):
         lspu_account_id: int,
     ) -> None:
         """Initialize the Entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=account_id)
         self.account_id = account_id
         self.lspu_account_id = lspu_account_id
+        self._written_state: tuple[Any, ...] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Populate the initial state from the current coordinator data."""
+        await super().async_added_to_hass()
+        if self.coordinator.data:
+            self._async_update_attrs()
+        # The state is written by the platform right after the entity is added
+        self._written_state = self._state_fingerprint()
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update entity attributes from the coordinator data."""
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator.
+
+        State is written only when the value, attributes or availability
+        changed since the state was last written.
+        """
+        with self.coordinator.watchdog.watch(
+            f"{type(self).__name__}._async_update_attrs"
+        ):
+            self._async_update_attrs()
+        state = self._state_fingerprint()
+        if state == self._written_state:
+            self.coordinator.skipped_state_writes += 1
+            return
+        self.coordinator.metrics.record_state_change()
+        self._written_state = state
+        super()._handle_coordinator_update()
+
+    def _state_fingerprint(self) -> tuple[Any, ...]:
+        """Return the parts of the entity state set from coordinator data."""
+        return (
+            self.available,
+            getattr(self, "_attr_native_value", None),
+            getattr(self, "_attr_extra_state_attributes", None),
+        )
 
-    def get_lspu_account_data(self) -> dict[str | int, Any]:
-        """Get LSPU account data."""
-        return self.coordinator.get_lspu_accounts(self.account_id)[self.lspu_account_id]
+    @property
+    def account(self) -> MyGasAccount:
+        """LSPU account model."""
+        return self.coordinator.get_account(self.account_id, self.lspu_account_id)
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -82,20 +114,14 @@ class MyGasAccountCoordinatorEntity(MyGasCoordinatorEntity):
         """Initialize the Entity."""
         super().__init__(coordinator, account_id, lspu_account_id)
 
-        account_number = coordinator.get_account_number(
-            self.account_id, self.lspu_account_id
-        )
-        account_alias = coordinator.get_account_alias(
-            self.account_id, self.lspu_account_id
-        )
-
-        if account_alias:
-            device_name = f"ЛС {account_number} ({account_alias})"
+        account = self.account
+        if account.alias:
+            device_name = f"ЛС {account.number} ({account.alias})"
         else:
-            device_name = f"ЛС {account_number}"
+            device_name = f"ЛС {account.number}"
 
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, make_account_device_id(account_number))},
+            identifiers={(DOMAIN, account.device_identifier)},
             manufacturer=MANUFACTURER,
             model=ACCOUNT_MODEL,
             name=device_name,
@@ -118,78 +144,28 @@ class MyGasBaseCoordinatorEntity(MyGasCoordinatorEntity):
         super().__init__(coordinator, account_id, lspu_account_id)
         self.counter_id = counter_id
 
-        counter = coordinator.get_counters(self.account_id, self.lspu_account_id)[
-            counter_id
-        ]
-
-        account_number = coordinator.get_account_number(
-            self.account_id, self.lspu_account_id
-        )
-
-        device_id = make_device_id(account_number, counter[ATTR_UUID])
-
-        account_alias = coordinator.get_account_alias(
-            self.account_id, self.lspu_account_id
-        )
-        if account_alias:
-            device_name = f"{counter[ATTR_NAME]} ({account_alias})"
+        account = self.account
+        counter = self.counter
+        if account.alias:
+            device_name = f"{counter.name} ({account.alias})"
         else:
-            device_name = f"{counter[ATTR_NAME]}"
+            device_name = f"{counter.name}"
 
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, device_id)},
-            via_device=(DOMAIN, make_account_device_id(account_number)),
+            identifiers={(DOMAIN, counter.device_identifier)},
+            via_device=(DOMAIN, account.device_identifier),
             manufacturer=MANUFACTURER,
-            model=counter[ATTR_MODEL],
+            model=counter.model,
             name=device_name,
-            serial_number=counter[ATTR_SERIAL_NUM],
+            serial_number=counter.serial_number,
             sw_version=aiomygas.__version__,
             configuration_url=CONFIGURATION_URL,
         )
 
-    def get_counter_data(self) -> dict[str, Any]:
-        """Get counter data."""
-        return self.coordinator.get_counters(self.account_id, self.lspu_account_id)[
-            self.counter_id
-        ]
-
-    def get_latest_readings(self) -> dict[str, Any]:
-        """Latest readings for counter."""
-        counter = self.coordinator.get_counters(self.account_id, self.lspu_account_id)[
-            self.counter_id
-        ]
-        values = counter.get("values", [])
-        return values[0] if values else {}
-
-    def get_counter_attr(self) -> dict[str, Any]:
-        """Get counter attr."""
-        counter = self.coordinator.get_counters(self.account_id, self.lspu_account_id)[
-            self.counter_id
-        ]
-        return {
-            "Модель": to_str(counter.get("model")),
-            "Серийный номер": to_str(counter.get("serialNumber")),
-            "Состояние счетчика": to_str(counter.get("state")),
-            "Тип оборудования": to_str(counter.get("equipmentKind")),
-            "Расположение": to_str(counter.get("position")),
-            "Ресурс": to_str(counter.get("serviceName")),
-            "Тарифность": to_int(counter.get("numberOfRates")),
-            "Дата очередной поверки": to_date(
-                counter.get("checkDate"), "%Y-%m-%dT%H:%M:%S"
-            ),
-            "Плановая дата ТО": to_date(
-                counter.get("techSupportDate"), "%Y-%m-%dT%H:%M:%S"
-            ),
-            "Дата установки пломбы": to_date(
-                counter.get("sealDate"), "%Y-%m-%dT%H:%M:%S"
-            ),
-            "Дата заводской пломбы": to_date(
-                counter.get("factorySealDate"), "%Y-%m-%dT%H:%M:%S"
-            ),
-            "Дата изготовления прибора": to_date(
-                counter.get("commissionedOn"), "%Y-%m-%dT%H:%M:%S"
-            ),
-        }
+    @property
+    def counter(self) -> MyGasCounter:
+        """Counter model."""
+        return self.account.counters[self.counter_id]
 
 
 class MyGasServiceCoordinatorEntity(MyGasCoordinatorEntity):
@@ -206,33 +182,18 @@ class MyGasServiceCoordinatorEntity(MyGasCoordinatorEntity):
         super().__init__(coordinator, account_id, lspu_account_id)
         self.service_id = service_id
 
-        service = coordinator.get_services(self.account_id, self.lspu_account_id)[
-            service_id
-        ]
-
-        account_number = coordinator.get_account_number(
-            self.account_id, self.lspu_account_id
-        )
-
-        device_id = make_service_device_id(account_number, service["id"])
-
+        service = self.service
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, device_id)},
-            via_device=(DOMAIN, make_account_device_id(account_number)),
+            identifiers={(DOMAIN, service.device_identifier)},
+            via_device=(DOMAIN, self.account.device_identifier),
             manufacturer=MANUFACTURER,
             model=SERVICE_MODEL,
-            name=service["name"],
+            name=service.name,
             sw_version=aiomygas.__version__,
             configuration_url=CONFIGURATION_URL,
         )
 
-    def get_service_data(self) -> dict[str, Any]:
-        """Get service data."""
-        return self.coordinator.get_services(self.account_id, self.lspu_account_id)[
-            self.service_id
-        ]
-
-    def get_child_data(self, child_id: int) -> dict[str, Any]:
-        """Get child (tariff rate) data."""
-        service = self.get_service_data()
-        return service["children"][child_id]
+    @property
+    def service(self) -> MyGasService:
+        """Service model."""
+        return self.account.services[self.service_id]
@@ -0,0 +1,258 @@
+"""Request metrics of the MyGas API."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import StrEnum
+from math import ceil
+import time
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import METRICS_MAX_SAMPLES, METRICS_WINDOW, REFRESH_HISTORY_SIZE
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS: tuple[float, ...] = (0.25, 0.5, 1, 2, 5, 10, 30, 60)
+
+
+@dataclass(frozen=True, slots=True)
+class MyGasRequestSample:
+    """Outcome of a single API request including its retries."""
+
+    time: float
+    latency: float
+    retries: int
+    timeouts: int
+    payload_size: int | None
+    failed: bool
+
+
+class RefreshReason(StrEnum):
+    """Reason of a refresh."""
+
+    SCHEDULED = "scheduled"
+    FORCED = "forced"
+    SERVICE = "service"
+    RETRY = "retry"
+
+
+@dataclass(slots=True)
+class MyGasRefreshRecord:
+    """Timing breakdown of a single refresh."""
+
+    reason: RefreshReason
+    started: datetime
+    duration: float | None = None
+    success: bool = False
+    account_durations: dict[int, float] = field(default_factory=dict)
+    requests: int = 0
+    retries: int = 0
+    timeouts: int = 0
+    bytes_received: int | None = None
+    state_changes: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the record for diagnostics."""
+        return {
+            "reason": self.reason,
+            "started": self.started.isoformat(),
+            "duration": self.duration,
+            "success": self.success,
+            "account_durations": dict(self.account_durations),
+            "requests": self.requests,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "bytes_received": self.bytes_received,
+            "state_changes": self.state_changes,
+        }
+
+
+# Refresh the current task works for, inherited by the per-account fetch tasks
+_ACTIVE_REFRESH: ContextVar[MyGasRefreshRecord | None] = ContextVar(
+    "mygas_active_refresh", default=None
+)
+
+
+def _percentile(values: list[float], percent: float) -> float | None:
+    """Get a nearest-rank percentile."""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(ceil(percent / 100 * len(values)) - 1, 0)]
+
+
+class MyGasEndpointMetrics:
+    """Samples of one endpoint over the metrics window."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.samples: deque[MyGasRequestSample] = deque(maxlen=METRICS_MAX_SAMPLES)
+        self.total_requests = 0
+
+    def add(self, sample: MyGasRequestSample) -> None:
+        """Add a sample."""
+        self.samples.append(sample)
+        self.total_requests += 1
+
+    def recent(self) -> list[MyGasRequestSample]:
+        """Get the samples within the metrics window."""
+        since = time.monotonic() - METRICS_WINDOW
+        while self.samples and self.samples[0].time < since:
+            self.samples.popleft()
+        return list(self.samples)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        samples = self.recent()
+        latencies = [sample.latency for sample in samples]
+        histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        for latency in latencies:
+            histogram[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        return {
+            "requests": len(samples),
+            "total_requests": self.total_requests,
+            "failed": sum(sample.failed for sample in samples),
+            "retries": sum(sample.retries for sample in samples),
+            "timeouts": sum(sample.timeouts for sample in samples),
+            "latency_p50": _percentile(latencies, 50),
+            "latency_p95": _percentile(latencies, 95),
+            "latency_histogram": {
+                f"<={bound}s": count
+                for bound, count in zip(LATENCY_BUCKETS, histogram, strict=False)
+            }
+            | {f">{LATENCY_BUCKETS[-1]}s": histogram[-1]},
+            "payload_size_max": max(
+                (
+                    sample.payload_size
+                    for sample in samples
+                    if sample.payload_size is not None
+                ),
+                default=None,
+            ),
+        }
+
+
+class MyGasApiMetrics:
+    """Latency, retry, timeout and payload size metrics per endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.endpoints: dict[str, MyGasEndpointMetrics] = {}
+        self.last_refresh_duration: float | None = None
+        self.refresh_history: deque[MyGasRefreshRecord] = deque(
+            maxlen=REFRESH_HISTORY_SIZE
+        )
+
+    @contextmanager
+    def track_refresh(self, reason: RefreshReason) -> Iterator[MyGasRefreshRecord]:
+        """Collect the requests made within the block into a history record."""
+        refresh = MyGasRefreshRecord(reason=reason, started=dt_util.now())
+        token = _ACTIVE_REFRESH.set(refresh)
+        started = time.monotonic()
+        try:
+            yield refresh
+            refresh.success = True
+        finally:
+            refresh.duration = round(time.monotonic() - started, 3)
+            self.refresh_history.append(refresh)
+            _ACTIVE_REFRESH.reset(token)
+
+    def record_account_duration(self, account_id: int, duration: float) -> None:
+        """Record how long fetching an account took in the current refresh."""
+        if (refresh := _ACTIVE_REFRESH.get()) is not None:
+            refresh.account_durations[account_id] = round(duration, 3)
+
+    def record_state_change(self) -> None:
+        """Count an entity state written because of the latest refresh."""
+        refresh = _ACTIVE_REFRESH.get()
+        if refresh is None and self.refresh_history:
+            refresh = self.refresh_history[-1]
+        if refresh is not None:
+            refresh.state_changes += 1
+
+    def record(
+        self,
+        endpoint: str,
+        latency: float,
+        retries: int,
+        timeouts: int,
+        payload_size: int | None = None,
+        failed: bool = False,
+    ) -> None:
+        """Record a finished request."""
+        if (metrics := self.endpoints.get(endpoint)) is None:
+            metrics = self.endpoints[endpoint] = MyGasEndpointMetrics()
+        metrics.add(
+            MyGasRequestSample(
+                time=time.monotonic(),
+                latency=latency,
+                retries=retries,
+                timeouts=timeouts,
+                payload_size=payload_size,
+                failed=failed,
+            )
+        )
+        if (refresh := _ACTIVE_REFRESH.get()) is not None:
+            refresh.requests += 1
+            refresh.retries += retries
+            refresh.timeouts += timeouts
+            if payload_size is not None:
+                refresh.bytes_received = (refresh.bytes_received or 0) + payload_size
+
+    def _samples(self, endpoint: str | None = None) -> list[MyGasRequestSample]:
+        """Get the recent samples of one or all endpoints."""
+        if endpoint is not None:
+            metrics = self.endpoints.get(endpoint)
+            return metrics.recent() if metrics else []
+        return [
+            sample for metrics in self.endpoints.values() for sample in metrics.recent()
+        ]
+
+    def latency_percentile(
+        self, percent: float, endpoint: str | None = None
+    ) -> float | None:
+        """Get a latency percentile in milliseconds."""
+        value = _percentile(
+            [sample.latency for sample in self._samples(endpoint)], percent
+        )
+        return None if value is None else round(value * 1000, 1)
+
+    def retries(self, endpoint: str | None = None) -> int:
+        """Get the number of retries within the metrics window."""
+        return sum(sample.retries for sample in self._samples(endpoint))
+
+    def timeouts(self, endpoint: str | None = None) -> int:
+        """Get the number of timeouts within the metrics window."""
+        return sum(sample.timeouts for sample in self._samples(endpoint))
+
+    def latency_attributes(self, percent: float) -> dict[str, float | None]:
+        """Get a latency percentile per endpoint."""
+        return {
+            endpoint: self.latency_percentile(percent, endpoint)
+            for endpoint in sorted(self.endpoints)
+        }
+
+    def retry_attributes(self) -> dict[str, int]:
+        """Get retries and timeouts per endpoint."""
+        attributes: dict[str, int] = {}
+        for endpoint in sorted(self.endpoints):
+            attributes[f"{endpoint}_retries"] = self.retries(endpoint)
+            attributes[f"{endpoint}_timeouts"] = self.timeouts(endpoint)
+        return attributes
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            "last_refresh_duration": self.last_refresh_duration,
+            "endpoints": {
+                endpoint: metrics.as_dict()
+                for endpoint, metrics in sorted(self.endpoints.items())
+            },
+        }
@@ -0,0 +1,354 @@
+"""Typed MyGas account model built from the raw API payloads."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from homeassistant.const import ATTR_MODEL, ATTR_NAME
+
+from .const import (
+    ATTR_ACCOUNT_ID,
+    ATTR_ALIAS,
+    ATTR_COUNTERS,
+    ATTR_ELS,
+    ATTR_IS_ELS,
+    ATTR_JNT_ACCOUNT_NUM,
+    ATTR_LSPU_INFO_GROUP,
+    ATTR_SERIAL_NUM,
+    ATTR_SERVICES,
+    ATTR_UUID,
+    CONF_ACCOUNT,
+    CONF_INFO,
+)
+from .helpers import (
+    make_account_device_id,
+    make_device_id,
+    make_service_device_id,
+    to_date,
+    to_float,
+    to_int,
+    to_str,
+)
+
+DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+DATE_FORMAT = "%Y-%m-%d"
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class MyGasBalance:
+    """Latest billing period of an LSPU account."""
+
+    name: str | None
+    date: date | None
+    charged: float | None
+    paid: float | None
+    debt: float | None
+    balance_start: float | None
+    balance_end: float | None
+    charged_volume: float | None
+    circulation: float | None
+    forgiven_debt: float | None
+    planned: float | None
+    privilege: float | None
+    privilege_volume: float | None
+    restored_debt: float | None
+    payment_adjustments: float | None
+    end_balance_apgp: float | None
+    prepayment_charged: float | None
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class MyGasCounter:
+    """Metering device (counter) of an LSPU account."""
+
+    device_identifier: str
+    uuid: str | None
+    name: str | None
+    model: str | None
+    serial_number: str | None
+    number_of_rates: int
+    average_rate: float | None
+    price_day: float | None
+    price_middle: float | None
+    price_night: float | None
+    has_price: bool
+    readings_date: date | None
+    readings: float | None
+    consumption: float | None
+    attributes: dict[str, Any]
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class MyGasTariff:
+    """Tariff rate (child) of a service."""
+
+    name: str | None
+    tariff: float | None
+    norm: float | None
+    price: float | None
+    start_date: date | None
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class MyGasService:
+    """Service of an LSPU account."""
+
+    device_identifier: str
+    id: str
+    name: str | None
+    balance: float | None
+    tariffs: tuple[MyGasTariff, ...]
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class MyGasAccount:
+    """LSPU account (personal account) with everything the entities need."""
+
+    account_id: int
+    lspu_account_id: int
+    lspu_id: int | None
+    number: str | None
+    alias: str | None
+    device_identifier: str
+    account: str | None
+    balance: float | None
+    parameters: dict[str, Any]
+    has_balances: bool
+    latest_balance: MyGasBalance
+    counters: tuple[MyGasCounter, ...]
+    services: tuple[MyGasService, ...]
+
+
+def _build_balance(balance: dict[str, Any]) -> MyGasBalance:
+    """Build the latest billing period."""
+    return MyGasBalance(
+        name=to_str(balance.get("name")),
+        date=to_date(balance.get("date"), DATE_FORMAT),
+        charged=to_float(balance.get("chargedSum")),
+        paid=to_float(balance.get("paidSum")),
+        debt=to_float(balance.get("debtSum")),
+        balance_start=to_float(balance.get("balanceStartSum")),
+        balance_end=to_float(balance.get("balanceEndSum")),
+        charged_volume=to_float(balance.get("chargedVolume")),
+        circulation=to_float(balance.get("circulationSum")),
+        forgiven_debt=to_float(balance.get("forgivenDebt")),
+        planned=to_float(balance.get("plannedSum")),
+        privilege=to_float(balance.get("privilegeSum")),
+        privilege_volume=to_float(balance.get("privilegeVolume")),
+        restored_debt=to_float(balance.get("restoredDebt")),
+        payment_adjustments=to_float(balance.get("paymentAdjustments")),
+        end_balance_apgp=to_float(balance.get("endBalanceApgp")),
+        prepayment_charged=to_float(balance.get("prepaymentChargedAccumSum")),
+    )
+
+
+def _build_counter(account_number: str | None, counter: dict[str, Any]) -> MyGasCounter:
+    """Build a counter."""
+    values = counter.get("values") or []
+    readings = values[0] if values else {}
+    price = counter.get("price") or {}
+    return MyGasCounter(
+        device_identifier=make_device_id(
+            account_number or "", counter.get(ATTR_UUID) or ""
+        ),
+        uuid=counter.get(ATTR_UUID),
+        name=counter.get(ATTR_NAME),
+        model=counter.get(ATTR_MODEL),
+        serial_number=counter.get(ATTR_SERIAL_NUM),
+        number_of_rates=to_int(counter.get("numberOfRates")) or 1,
+        average_rate=to_float(counter.get("averageRate")),
+        price_day=to_float(price.get("day")),
+        price_middle=to_float(price.get("middle")),
+        price_night=to_float(price.get("night")),
+        has_price="price" in counter,
+        readings_date=to_date(readings.get("date"), DATETIME_FORMAT),
+        readings=to_float(readings.get("valueDay")),
+        consumption=to_float(readings.get("rate")),
+        attributes={
+            "Модель": to_str(counter.get("model")),
+            "Серийный номер": to_str(counter.get("serialNumber")),
+            "Состояние счетчика": to_str(counter.get("state")),
+            "Тип оборудования": to_str(counter.get("equipmentKind")),
+            "Расположение": to_str(counter.get("position")),
+            "Ресурс": to_str(counter.get("serviceName")),
+            "Тарифность": to_int(counter.get("numberOfRates")),
+            "Дата очередной поверки": to_date(
+                counter.get("checkDate"), DATETIME_FORMAT
+            ),
+            "Плановая дата ТО": to_date(
+                counter.get("techSupportDate"), DATETIME_FORMAT
+            ),
+            "Дата установки пломбы": to_date(
+                counter.get("sealDate"), DATETIME_FORMAT
+            ),
+            "Дата заводской пломбы": to_date(
+                counter.get("factorySealDate"), DATETIME_FORMAT
+            ),
+            "Дата изготовления прибора": to_date(
+                counter.get("commissionedOn"), DATETIME_FORMAT
+            ),
+        },
+    )
+
+
+def _build_service(account_number: str | None, service: dict[str, Any]) -> MyGasService:
+    """Build a service with its tariff rates."""
+    service_id = str(service.get("id") or "")
+    return MyGasService(
+        device_identifier=make_service_device_id(account_number or "", service_id),
+        id=service_id,
+        name=service.get("name"),
+        balance=to_float(service.get("balance")),
+        tariffs=tuple(
+            MyGasTariff(
+                name=child.get("name"),
+                tariff=to_float(child.get("tariff")),
+                norm=to_float(child.get("norm")),
+                price=to_float(child.get("price")),
+                start_date=to_date(child.get("startDate"), DATETIME_FORMAT),
+            )
+            for child in service.get("children") or []
+        ),
+    )
+
+
+def build_account(
+    account_id: int,
+    lspu_account_id: int,
+    lspu_account: dict[str, Any],
+    account_number: str | None,
+    alias: str | None,
+) -> MyGasAccount:
+    """Build an LSPU account."""
+    balances = lspu_account.get("balances") or []
+    return MyGasAccount(
+        account_id=account_id,
+        lspu_account_id=lspu_account_id,
+        lspu_id=to_int(lspu_account.get(ATTR_ACCOUNT_ID)),
+        number=account_number,
+        alias=alias,
+        device_identifier=make_account_device_id(account_number or ""),
+        account=to_str(lspu_account.get(CONF_ACCOUNT)),
+        balance=to_float(lspu_account.get("balance")),
+        parameters={
+            parameter["name"]: parameter["value"]
+            for parameter in lspu_account.get("parameters") or []
+        },
+        has_balances=bool(balances),
+        latest_balance=_build_balance(balances[0] if balances else {}),
+        counters=tuple(
+            _build_counter(account_number, counter)
+            for counter in lspu_account.get(ATTR_COUNTERS) or []
+        ),
+        services=tuple(
+            _build_service(account_number, service)
+            for service in lspu_account.get(ATTR_SERVICES) or []
+        ),
+    )
+
+
+def build_account_group(
+    account_id: int, info: Any, is_els: bool
+) -> tuple[MyGasAccount, ...]:
+    """Build the LSPU accounts of a single ELS or LSPU account."""
+    if is_els:
+        els = info.get(ATTR_ELS, {})
+        return tuple(
+            build_account(
+                account_id,
+                lspu_account_id,
+                lspu_account,
+                els.get(ATTR_JNT_ACCOUNT_NUM),
+                els.get(ATTR_ALIAS),
+            )
+            for lspu_account_id, lspu_account in enumerate(info[ATTR_LSPU_INFO_GROUP])
+        )
+
+    lspu_accounts = info if isinstance(info, list) else [info]
+    return tuple(
+        build_account(
+            account_id,
+            lspu_account_id,
+            lspu_account,
+            lspu_account.get(CONF_ACCOUNT),
+            lspu_account.get(ATTR_ALIAS),
+        )
+        for lspu_account_id, lspu_account in enumerate(lspu_accounts)
+    )
+
+
+def build_accounts(data: dict[str, Any] | None) -> dict[int, tuple[MyGasAccount, ...]]:
+    """Build the account model from the coordinator data in one pass."""
+    if not data:
+        return {}
+
+    is_els = data.get(ATTR_IS_ELS, False)
+    return {
+        account_id: build_account_group(account_id, info, is_els)
+        for account_id, info in data.get(CONF_INFO, {}).items()
+    }
+
+
+def _iter_lspu_payloads(data: dict[str, Any] | None) -> Iterator[dict[str, Any]]:
+    """Iterate over the raw LSPU account payloads of the coordinator data."""
+    if not data:
+        return
+
+    is_els = data.get(ATTR_IS_ELS, False)
+    for info in data.get(CONF_INFO, {}).values():
+        if is_els:
+            yield from info.get(ATTR_LSPU_INFO_GROUP) or []
+        elif isinstance(info, list):
+            yield from info
+        else:
+            yield info
+
+
+def count_payload_entries(data: dict[str, Any] | None) -> int:
+    """Measure the coordinator data by the entries of its LSPU payloads.
+
+    Every account, balance, payment, service, counter and counter reading
+    is one entry, so a long history weighs as much as many accounts.
+    """
+    entries = 0
+    for payload in _iter_lspu_payloads(data):
+        counters = payload.get(ATTR_COUNTERS) or []
+        entries += (
+            1
+            + len(payload.get("balances") or [])
+            + len(payload.get("payments") or [])
+            + len(payload.get(ATTR_SERVICES) or [])
+            + len(counters)
+            + sum(len(counter.get("values") or []) for counter in counters)
+        )
+    return entries
+
+
+def get_account_choices(accounts_info: dict[str, Any] | None) -> dict[str, str]:
+    """Get the ELS or LSPU accounts of a login with their labels.
+
+    The keys are the ids fetched by the coordinator: ELS ids when the login
+    has ELS accounts, LSPU ids otherwise.
+    """
+    if not accounts_info:
+        return {}
+
+    if els_group := accounts_info.get("elsGroup"):
+        accounts = [els.get(ATTR_ELS) or {} for els in els_group]
+        number_key = ATTR_JNT_ACCOUNT_NUM
+    else:
+        accounts = accounts_info.get("lspu") or []
+        number_key = CONF_ACCOUNT
+
+    choices: dict[str, str] = {}
+    for account in accounts:
+        if not (account_id := account.get("id")):
+            continue
+        label = str(account.get(number_key) or account_id)
+        if description := account.get(ATTR_ALIAS) or account.get("address"):
+            label = f"{label} ({description})"
+        choices[str(account_id)] = label
+    return choices
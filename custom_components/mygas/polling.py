@@ -0,0 +1,140 @@
+"""Calendar of refreshes anchored to the billing and readings windows."""
+
+from __future__ import annotations
+
+import calendar
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_DENSE_INTERVAL,
+    CONF_QUIET_END,
+    CONF_QUIET_START,
+    CONF_READINGS_END_DAY,
+    CONF_READINGS_START_DAY,
+    CONF_REFRESH_TIME,
+    DEFAULT_DENSE_INTERVAL,
+    DEFAULT_QUIET_END,
+    DEFAULT_QUIET_START,
+    DEFAULT_READINGS_END_DAY,
+    DEFAULT_READINGS_START_DAY,
+    DEFAULT_REFRESH_TIME,
+    MONTH_CLOSE_DAYS_AFTER,
+    MONTH_CLOSE_DAYS_BEFORE,
+)
+
+# Days searched for the next refresh before falling back to a day later
+_SEARCH_DAYS = 62
+
+
+def _parse_time(value: str) -> time:
+    """Parse a time of day from the options."""
+    if (parsed := dt_util.parse_time(value)) is None:
+        raise ValueError(f"Invalid time: {value}")
+    return parsed
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class MyGasPollingCalendar:
+    """Refresh times of a login in the calendar polling mode.
+
+    Mid-cycle the data is refreshed once a day at ``refresh_time``. Around
+    the month close and within the readings window it is refreshed every
+    ``dense_interval`` on a grid anchored at ``refresh_time``. Nothing is
+    refreshed in the quiet period.
+    """
+
+    refresh_time: time
+    dense_interval: timedelta
+    readings_days: tuple[int, int]
+    quiet: tuple[time, time]
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> MyGasPollingCalendar:
+        """Create the calendar from the entry options."""
+        return cls(
+            refresh_time=_parse_time(
+                options.get(CONF_REFRESH_TIME, DEFAULT_REFRESH_TIME)
+            ),
+            dense_interval=timedelta(
+                hours=options.get(CONF_DENSE_INTERVAL, DEFAULT_DENSE_INTERVAL)
+            ),
+            readings_days=(
+                options.get(CONF_READINGS_START_DAY, DEFAULT_READINGS_START_DAY),
+                options.get(CONF_READINGS_END_DAY, DEFAULT_READINGS_END_DAY),
+            ),
+            quiet=(
+                _parse_time(options.get(CONF_QUIET_START, DEFAULT_QUIET_START)),
+                _parse_time(options.get(CONF_QUIET_END, DEFAULT_QUIET_END)),
+            ),
+        )
+
+    def is_month_close(self, day: date) -> bool:
+        """Check the day is around the month close."""
+        days_in_month = calendar.monthrange(day.year, day.month)[1]
+        return (
+            day.day > days_in_month - MONTH_CLOSE_DAYS_BEFORE
+            or day.day <= MONTH_CLOSE_DAYS_AFTER
+        )
+
+    def is_readings_window(self, day: date) -> bool:
+        """Check readings are accepted on the day, the window may wrap."""
+        start, end = self.readings_days
+        if start <= end:
+            return start <= day.day <= end
+        return day.day >= start or day.day <= end
+
+    def is_dense(self, day: date) -> bool:
+        """Check the day is polled densely."""
+        return self.is_month_close(day) or self.is_readings_window(day)
+
+    def is_quiet(self, moment: time) -> bool:
+        """Check the time of day is in the quiet period, which may wrap."""
+        start, end = self.quiet
+        if start == end:
+            return False
+        if start < end:
+            return start <= moment < end
+        return moment >= start or moment < end
+
+    def _day_slots(self, day: date) -> Iterator[datetime]:
+        """Get the refresh slots of a day, quiet ones included."""
+        anchor = datetime.combine(
+            day, self.refresh_time, tzinfo=dt_util.get_default_time_zone()
+        )
+        if not self.is_dense(day):
+            yield anchor
+            return
+
+        step = self.dense_interval
+        slot = anchor - step * ((anchor - dt_util.start_of_local_day(day)) // step)
+        next_day = dt_util.start_of_local_day(day + timedelta(days=1))
+        while slot < next_day:
+            yield slot
+            slot += step
+
+    def next_refresh(self, now: datetime) -> datetime:
+        """Get the first refresh slot after now outside the quiet period."""
+        now = dt_util.as_local(now)
+        day = now.date()
+        for _ in range(_SEARCH_DAYS):
+            for slot in self._day_slots(day):
+                if slot > now and not self.is_quiet(slot.time()):
+                    return slot
+            day += timedelta(days=1)
+        return now + timedelta(days=1)
+
+    def as_dict(self, now: datetime) -> dict[str, Any]:
+        """Return the calendar for diagnostics."""
+        return {
+            "refresh_time": self.refresh_time.isoformat(),
+            "dense_interval": self.dense_interval.total_seconds(),
+            "readings_days": list(self.readings_days),
+            "quiet": [moment.isoformat() for moment in self.quiet],
+            "dense_today": self.is_dense(dt_util.as_local(now).date()),
+            "next_refresh": self.next_refresh(now).isoformat(),
+        }
@@ -0,0 +1,78 @@
+"""Profile coordinator refreshes and entity updates on demand."""
+
+from __future__ import annotations
+
+import cProfile
+from pathlib import Path
+import pstats
+import time
+from typing import Any
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, PROFILE_TARGET_ENTITIES
+from .coordinator import MyGasCoordinator
+from .metrics import RefreshReason
+
+
+def _summarize(profiler: cProfile.Profile, path: Path, top: int) -> list[dict[str, Any]]:
+    """Write the profile and get its hottest functions in the executor."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(path)
+    profile = pstats.Stats(profiler).get_stats_profile()
+    functions = sorted(
+        profile.func_profiles.items(),
+        key=lambda item: item[1].cumtime,
+        reverse=True,
+    )
+    return [
+        {
+            "function": f"{function.file_name}:{function.line_number}({name})",
+            "calls": function.ncalls,
+            "total_time": round(function.tottime, 6),
+            "cumulative_time": round(function.cumtime, 6),
+        }
+        for name, function in functions[:top]
+    ]
+
+
+async def async_profile(
+    coordinator: MyGasCoordinator, target: str, top: int
+) -> dict[str, Any]:
+    """Run a forced refresh or an entity update under cProfile.
+
+    The profile covers everything running on the event loop meanwhile. It
+    is saved to ``<config>/mygas/profiles`` for ``snakeviz`` or ``pstats``.
+    """
+    hass = coordinator.hass
+    path = Path(
+        hass.config.path(
+            DOMAIN,
+            "profiles",
+            f"{coordinator.config_entry.entry_id}-{target}-"
+            f"{dt_util.utcnow():%Y%m%d%H%M%S}.prof",
+        )
+    )
+    profiler = cProfile.Profile()
+    started = time.monotonic()
+    try:
+        profiler.enable()
+    except ValueError as exc:
+        raise HomeAssistantError(f"Profiler is already running: {exc}") from exc
+    try:
+        if target == PROFILE_TARGET_ENTITIES:
+            coordinator.async_update_listeners()
+        else:
+            await coordinator.async_force_refresh(RefreshReason.SERVICE)
+    finally:
+        profiler.disable()
+    duration = time.monotonic() - started
+
+    summary = await hass.async_add_executor_job(_summarize, profiler, path, top)
+    return {
+        "target": target,
+        "duration": round(duration, 3),
+        "path": str(path),
+        "top": summary,
+    }
@@ -0,0 +1,143 @@
+"""Record MyGas API traffic to cassette files."""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+from hashlib import sha256
+import logging
+from pathlib import Path
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.json import save_json
+from homeassistant.util import dt as dt_util
+
+from .const import CASSETTE_MAX_CALLS, CASSETTE_SAVE_DELAY, CASSETTE_VERSION, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# String values of these keys are replaced by a stable pseudonym, so a
+# cassette keeps the relations between accounts without personal data
+TO_REDACT = {
+    "account",
+    "address",
+    "alias",
+    "email",
+    "firstName",
+    "fio",
+    "jntAccountNum",
+    "lastName",
+    "middleName",
+    "phone",
+    "token",
+    "value",
+}
+
+
+def _pseudonym(value: str) -> str:
+    """Get a stable pseudonym of a personal value."""
+    return f"redacted-{sha256(value.encode()).hexdigest()[:10]}"
+
+
+def redact(data: Any) -> Any:
+    """Replace personal string values in an API payload."""
+    if isinstance(data, dict):
+        return {
+            key: (
+                _pseudonym(value)
+                if key in TO_REDACT and isinstance(value, str)
+                else redact(value)
+            )
+            for key, value in data.items()
+        }
+    if isinstance(data, (list, tuple)):
+        return [redact(item) for item in data]
+    if isinstance(data, str) and "@" in data:
+        return _pseudonym(data)
+    return data
+
+
+class MyGasTrafficRecorder:
+    """Record API calls of a coordinator with their timing.
+
+    Only the last ``CASSETTE_MAX_CALLS`` calls are kept, so a long recording
+    neither grows without limit in memory nor in the cassette file.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the recorder."""
+        self.hass = hass
+        self.started = dt_util.utcnow()
+        self.path = Path(
+            hass.config.path(
+                DOMAIN, "cassettes", f"{entry_id}-{self.started:%Y%m%d%H%M%S}.json"
+            )
+        )
+        self.calls: deque[dict[str, Any]] = deque(maxlen=CASSETTE_MAX_CALLS)
+        self._start_monotonic = time.monotonic()
+        self._unsub_save: CALLBACK_TYPE | None = None
+
+    @callback
+    def record(
+        self,
+        method: str,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        started: float,
+        result: Any = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Record a finished API call started at the given monotonic time."""
+        self.calls.append(
+            {
+                "method": method,
+                "args": redact(args),
+                "kwargs": redact(kwargs),
+                "offset": round(started - self._start_monotonic, 4),
+                "duration": round(time.monotonic() - started, 4),
+                "response": None if error else redact(result),
+                "error": (
+                    {"type": type(error).__name__, "message": str(error)}
+                    if error
+                    else None
+                ),
+            }
+        )
+        self.async_schedule_save()
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Save the cassette once calls stop coming in."""
+        if self._unsub_save is not None:
+            self._unsub_save()
+        self._unsub_save = async_call_later(
+            self.hass, CASSETTE_SAVE_DELAY, self._async_save_later
+        )
+
+    async def _async_save_later(self, _now: datetime) -> None:
+        """Save the cassette after the delay."""
+        self._unsub_save = None
+        await self.async_save()
+
+    async def async_save(self) -> None:
+        """Write the cassette file."""
+        if self._unsub_save is not None:
+            self._unsub_save()
+            self._unsub_save = None
+        if not self.calls:
+            return
+        cassette = {
+            "version": CASSETTE_VERSION,
+            "recorded_at": self.started.isoformat(),
+            "calls": list(self.calls),
+        }
+        await self.hass.async_add_executor_job(self._write, cassette)
+        _LOGGER.debug("Saved %d API calls to %s", len(self.calls), self.path)
+
+    def _write(self, cassette: dict[str, Any]) -> None:
+        """Write the cassette in the executor."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        save_json(str(self.path), cassette)
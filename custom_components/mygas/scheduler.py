@@ -0,0 +1,130 @@
+"""Refresh scheduler shared by all MyGas config entries."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+import logging
+from random import uniform
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .const import (
+    DOMAIN,
+    SCHEDULER_CALENDAR_SPREAD,
+    SCHEDULER_JITTER,
+    SCHEDULER_MAX_CONCURRENT_REFRESHES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SCHEDULER: HassKey[MyGasRefreshScheduler] = HassKey(f"{DOMAIN}_scheduler")
+
+
+class MyGasRefreshScheduler:
+    """Spread the refreshes of all logins across the scan interval.
+
+    Every registered entry gets its own phase within the interval, so the
+    refreshes of different logins do not coincide. The number of logins
+    refreshing at the same time is limited.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self._entry_ids: list[str] = []
+        self._semaphore = asyncio.Semaphore(SCHEDULER_MAX_CONCURRENT_REFRESHES)
+        self._running: set[str] = set()
+        self._waiting: set[str] = set()
+
+    @callback
+    def async_register(self, entry_id: str) -> None:
+        """Register a config entry."""
+        if entry_id not in self._entry_ids:
+            self._entry_ids.append(entry_id)
+            self._entry_ids.sort()
+
+    @callback
+    def async_unregister(self, entry_id: str) -> None:
+        """Unregister a config entry."""
+        if entry_id in self._entry_ids:
+            self._entry_ids.remove(entry_id)
+
+    def _phase(self, entry_id: str) -> float:
+        """Get the phase of an entry as a fraction of the interval."""
+        if entry_id not in self._entry_ids:
+            return 0.0
+        return self._entry_ids.index(entry_id) / len(self._entry_ids)
+
+    def next_interval(self, entry_id: str, interval: timedelta) -> timedelta:
+        """Get the delay until the next refresh slot of an entry.
+
+        The delay lands on the entry phase within the interval and is kept
+        between half and one and a half intervals, so an entry drifts to its
+        phase without refreshing twice in a row.
+        """
+        seconds = interval.total_seconds()
+        if seconds <= 0:
+            return interval
+
+        offset = self._phase(entry_id) * seconds
+        slot = seconds / max(len(self._entry_ids), 1)
+        jitter = uniform(0, min(SCHEDULER_JITTER, slot / 2))
+        delay = (offset + jitter - time.time()) % seconds
+        if delay < seconds / 2:
+            delay += seconds
+        return timedelta(seconds=delay)
+
+    def delay_until(self, entry_id: str, moment: datetime) -> timedelta:
+        """Get the delay until a calendar refresh of an entry.
+
+        Entries share the calendar times, so each one is shifted by its
+        phase within ``SCHEDULER_CALENDAR_SPREAD`` seconds.
+        """
+        offset = self._phase(entry_id) * SCHEDULER_CALENDAR_SPREAD + uniform(
+            0, SCHEDULER_JITTER
+        )
+        delay = max((moment - dt_util.utcnow()).total_seconds(), 0)
+        return timedelta(seconds=delay + offset)
+
+    @asynccontextmanager
+    async def async_refresh_slot(self, entry_id: str) -> AsyncIterator[None]:
+        """Wait until the entry may refresh."""
+        self._waiting.add(entry_id)
+        try:
+            if self._semaphore.locked():
+                _LOGGER.debug("Refresh of %s is waiting for a free slot", entry_id)
+            async with self._semaphore:
+                self._waiting.discard(entry_id)
+                self._running.add(entry_id)
+                try:
+                    yield
+                finally:
+                    self._running.discard(entry_id)
+        finally:
+            self._waiting.discard(entry_id)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the queue state for diagnostics."""
+        return {
+            "max_concurrent_refreshes": SCHEDULER_MAX_CONCURRENT_REFRESHES,
+            "entries": {
+                entry_id: round(self._phase(entry_id), 3)
+                for entry_id in self._entry_ids
+            },
+            "running": sorted(self._running),
+            "waiting": sorted(self._waiting),
+        }
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> MyGasRefreshScheduler:
+    """Get the refresh scheduler shared by all config entries."""
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_SCHEDULER] = MyGasRefreshScheduler()
+    return scheduler
@@ -7,7 +7,7 @@ from homeassistant.components.sensor import (
     SensorEntity,
     SensorStateClass,
 )
-from homeassistant.const import UnitOfVolume
+from homeassistant.const import UnitOfTime, UnitOfVolume
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -21,74 +21,54 @@ from .entity import (
     MyGasSensorEntityDescription,
     MyGasServiceCoordinatorEntity,
 )
-from .helpers import (
-    to_date,
-    to_float,
-    to_str,
-    make_account_device_id,
-    make_device_id,
-    make_entity_unique_id,
-    make_service_device_id,
-)
+from .helpers import make_entity_unique_id
+from .models import MyGasTariff
 
 SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = (
     MyGasSensorEntityDescription(
         key="account",
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda device: to_str(device.get_lspu_account_data().get("account")),
-        available_fn=lambda device: "account" in device.get_lspu_account_data(),
+        value_fn=lambda device: device.account.account,
+        available_fn=lambda device: device.account.account is not None,
         translation_key="account",
-        attr_fn=lambda device: {
-            parameter["name"]: parameter["value"]
-            for parameter in device.get_lspu_account_data().get("parameters", {})
-        },
+        attr_fn=lambda device: device.account.parameters,
     ),
     MyGasSensorEntityDescription(
         key="balance",
         device_class=SensorDeviceClass.MONETARY,
         native_unit_of_measurement="RUB",
-        value_fn=lambda device: to_float(
-            device.get_lspu_account_data().get("balance")
-        ),
-        available_fn=lambda device: "balance" in device.get_lspu_account_data(),
+        value_fn=lambda device: device.account.balance,
+        available_fn=lambda device: device.account.balance is not None,
         translation_key="balance",
     ),
     MyGasSensorEntityDescription(
         key="charged",
         device_class=SensorDeviceClass.MONETARY,
         native_unit_of_measurement="RUB",
-        value_fn=lambda device: to_float(
-            (device.get_lspu_account_data().get("balances") or [{}])[0].get("chargedSum")
-        ),
-        available_fn=lambda device: bool(device.get_lspu_account_data().get("balances")),
+        value_fn=lambda device: device.account.latest_balance.charged,
+        available_fn=lambda device: device.account.has_balances,
         translation_key="charged",
     ),
     MyGasSensorEntityDescription(
         key="paid",
         device_class=SensorDeviceClass.MONETARY,
         native_unit_of_measurement="RUB",
-        value_fn=lambda device: to_float(
-            (device.get_lspu_account_data().get("balances") or [{}])[0].get("paidSum")
-        ),
-        available_fn=lambda device: bool(device.get_lspu_account_data().get("balances")),
+        value_fn=lambda device: device.account.latest_balance.paid,
+        available_fn=lambda device: device.account.has_balances,
         translation_key="paid",
     ),
     MyGasSensorEntityDescription(
         key="debt",
         device_class=SensorDeviceClass.MONETARY,
         native_unit_of_measurement="RUB",
-        value_fn=lambda device: to_float(
-            (device.get_lspu_account_data().get("balances") or [{}])[0].get("debtSum")
-        ),
-        available_fn=lambda device: bool(device.get_lspu_account_data().get("balances")),
+        value_fn=lambda device: device.account.latest_balance.debt,
+        available_fn=lambda device: device.account.has_balances,
         translation_key="debt",
     ),
     MyGasSensorEntityDescription(
         key="balance_period",
-        value_fn=lambda device: to_str(
-            (device.get_lspu_account_data().get("balances") or [{}])[0].get("name")
-        ),
-        available_fn=lambda device: bool(device.get_lspu_account_data().get("balances")),
+        value_fn=lambda device: device.account.latest_balance.name,
+        available_fn=lambda device: device.account.has_balances,
         translation_key="balance_period",
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
@@ -96,11 +76,8 @@ SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = (
     MyGasSensorEntityDescription(
         key="balance_date",
         device_class=SensorDeviceClass.DATE,
-        value_fn=lambda device: to_date(
-            (device.get_lspu_account_data().get("balances") or [{}])[0].get("date"),
-            "%Y-%m-%d",
-        ),
-        available_fn=lambda device: bool(device.get_lspu_account_data().get("balances")),
+        value_fn=lambda device: device.account.latest_balance.date,
+        available_fn=lambda device: device.account.has_balances,
         translation_key="balance_date",
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
@@ -109,10 +86,8 @@ SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = (
         key="balance_start",
         device_class=SensorDeviceClass.MONETARY,
         native_unit_of_measurement="RUB",
-        value_fn=lambda device: to_float(
-            (device.get_lspu_account_data().get("balances") or [{}])[0].get("balanceStartSum")
-        ),
-        available_fn=lambda device: bool(device.get_lspu_account_data().get("balances")),
+        value_fn=lambda device: device.account.latest_balance.balance_start,
+        available_fn=lambda device: device.account.has_balances,
         translation_key="balance_start",
         entity_registry_enabled_default=False,
     ),
@@ -120,10 +95,8 @@ SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = (
         key="balance_end",
         device_class=SensorDeviceClass.MONETARY,
         native_unit_of_measurement="RUB",
-        value_fn=lambda device: to_float(
-            (device.get_lspu_account_data().get("balances") or [{}])[0].get("balanceEndSum")
-        ),
-        available_fn=lambda device: bool(device.get_lspu_account_data().get("balances")),
+        value_fn=lambda device: device.account.latest_balance.balance_end,
+        available_fn=lambda device: device.account.has_balances,
         translation_key="balance_end",
         entity_registry_enabled_default=False,
     ),
@@ -132,10 +105,8 @@ SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfVolume.CUBIC_METERS,
         suggested_display_precision=1,
         device_class=SensorDeviceClass.GAS,
-        value_fn=lambda device: to_float(
-            (device.get_lspu_account_data().get("balances") or [{}])[0].get("chargedVolume")
-        ),
-        available_fn=lambda device: bool(device.get_lspu_account_data().get("balances")),
+        value_fn=lambda device: device.account.latest_balance.charged_volume,
+        available_fn=lambda device: device.account.has_balances,
         translation_key="charged_volume",
         entity_registry_enabled_default=False,
     ),
@@ -143,10 +114,8 @@ SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = (
         key="circulation",
         device_class=SensorDeviceClass.MONETARY,
         native_unit_of_measurement="RUB",
-        value_fn=lambda device: to_float(
-            (device.get_lspu_account_data().get("balances") or [{}])[0].get("circulationSum")
-        ),
-        available_fn=lambda device: bool(device.get_lspu_account_data().get("balances")),
+        value_fn=lambda device: device.account.latest_balance.circulation,
+        available_fn=lambda device: device.account.has_balances,
         translation_key="circulation",
         entity_registry_enabled_default=False,
     ),
@@ -154,10 +123,8 @@ SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = (
         key="forgiven_debt",
         device_class=SensorDeviceClass.MONETARY,
         native_unit_of_measurement="RUB",
-        value_fn=lambda device: to_float(
-            (device.get_lspu_account_data().get("balances") or [{}])[0].get("forgivenDebt")
-        ),
-        available_fn=lambda device: bool(device.get_lspu_account_data().get("balances")),
+        value_fn=lambda device: device.account.latest_balance.forgiven_debt,
+        available_fn=lambda device: device.account.has_balances,
         translation_key="forgiven_debt",
         entity_registry_enabled_default=False,
     ),
@@ -165,10 +132,8 @@ SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = (
         key="planned",
         device_class=SensorDeviceClass.MONETARY,
         native_unit_of_measurement="RUB",
-        value_fn=lambda device: to_float(
-            (device.get_lspu_account_data().get("balances") or [{}])[0].get("plannedSum")
-        ),
-        available_fn=lambda device: bool(device.get_lspu_account_data().get("balances")),
+        value_fn=lambda device: device.account.latest_balance.planned,
+        available_fn=lambda device: device.account.has_balances,
         translation_key="planned",
         entity_registry_enabled_default=False,
     ),
@@ -176,10 +141,8 @@ SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = (
         key="privilege",
         device_class=SensorDeviceClass.MONETARY,
         native_unit_of_measurement="RUB",
-        value_fn=lambda device: to_float(
-            (device.get_lspu_account_data().get("balances") or [{}])[0].get("privilegeSum")
-        ),
-        available_fn=lambda device: bool(device.get_lspu_account_data().get("balances")),
+        value_fn=lambda device: device.account.latest_balance.privilege,
+        available_fn=lambda device: device.account.has_balances,
         translation_key="privilege",
         entity_registry_enabled_default=False,
     ),
@@ -188,10 +151,8 @@ SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfVolume.CUBIC_METERS,
         suggested_display_precision=1,
         device_class=SensorDeviceClass.GAS,
-        value_fn=lambda device: to_float(
-            (device.get_lspu_account_data().get("balances") or [{}])[0].get("privilegeVolume")
-        ),
-        available_fn=lambda device: bool(device.get_lspu_account_data().get("balances")),
+        value_fn=lambda device: device.account.latest_balance.privilege_volume,
+        available_fn=lambda device: device.account.has_balances,
         translation_key="privilege_volume",
         entity_registry_enabled_default=False,
     ),
@@ -199,10 +160,8 @@ SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = (
         key="restored_debt",
         device_class=SensorDeviceClass.MONETARY,
         native_unit_of_measurement="RUB",
-        value_fn=lambda device: to_float(
-            (device.get_lspu_account_data().get("balances") or [{}])[0].get("restoredDebt")
-        ),
-        available_fn=lambda device: bool(device.get_lspu_account_data().get("balances")),
+        value_fn=lambda device: device.account.latest_balance.restored_debt,
+        available_fn=lambda device: device.account.has_balances,
         translation_key="restored_debt",
         entity_registry_enabled_default=False,
     ),
@@ -210,10 +169,8 @@ SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = (
         key="payment_adjustments",
         device_class=SensorDeviceClass.MONETARY,
         native_unit_of_measurement="RUB",
-        value_fn=lambda device: to_float(
-            (device.get_lspu_account_data().get("balances") or [{}])[0].get("paymentAdjustments")
-        ),
-        available_fn=lambda device: bool(device.get_lspu_account_data().get("balances")),
+        value_fn=lambda device: device.account.latest_balance.payment_adjustments,
+        available_fn=lambda device: device.account.has_balances,
         translation_key="payment_adjustments",
         entity_registry_enabled_default=False,
     ),
@@ -221,10 +178,8 @@ SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = (
         key="end_balance_apgp",
         device_class=SensorDeviceClass.MONETARY,
         native_unit_of_measurement="RUB",
-        value_fn=lambda device: to_float(
-            (device.get_lspu_account_data().get("balances") or [{}])[0].get("endBalanceApgp")
-        ),
-        available_fn=lambda device: bool(device.get_lspu_account_data().get("balances")),
+        value_fn=lambda device: device.account.latest_balance.end_balance_apgp,
+        available_fn=lambda device: device.account.has_balances,
         translation_key="end_balance_apgp",
         entity_registry_enabled_default=False,
     ),
@@ -232,56 +187,93 @@ SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = (
         key="prepayment_charged",
         device_class=SensorDeviceClass.MONETARY,
         native_unit_of_measurement="RUB",
-        value_fn=lambda device: to_float(
-            (device.get_lspu_account_data().get("balances") or [{}])[0].get("prepaymentChargedAccumSum")
-        ),
-        available_fn=lambda device: bool(device.get_lspu_account_data().get("balances")),
+        value_fn=lambda device: device.account.latest_balance.prepayment_charged,
+        available_fn=lambda device: device.account.has_balances,
         translation_key="prepayment_charged",
         entity_registry_enabled_default=False,
     ),
     MyGasSensorEntityDescription(
         key="current_timestamp",
         device_class=SensorDeviceClass.TIMESTAMP,
-        value_fn=lambda device: device.coordinator.data.get(ATTR_LAST_UPDATE_TIME),
+        value_fn=lambda device: device.coordinator.get_last_update_time(
+            device.account_id
+        ),
         available_fn=lambda device: ATTR_LAST_UPDATE_TIME in device.coordinator.data,
         entity_category=EntityCategory.DIAGNOSTIC,
         translation_key="current_timestamp",
     ),
+    MyGasSensorEntityDescription(
+        key="api_latency_p50",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda device: device.coordinator.metrics.latency_percentile(50),
+        attr_fn=lambda device: device.coordinator.metrics.latency_attributes(50),
+        translation_key="api_latency_p50",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    MyGasSensorEntityDescription(
+        key="api_latency_p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda device: device.coordinator.metrics.latency_percentile(95),
+        attr_fn=lambda device: device.coordinator.metrics.latency_attributes(95),
+        translation_key="api_latency_p95",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    MyGasSensorEntityDescription(
+        key="last_refresh_duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda device: device.coordinator.metrics.last_refresh_duration,
+        translation_key="last_refresh_duration",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    MyGasSensorEntityDescription(
+        key="api_retries",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda device: device.coordinator.metrics.retries(),
+        attr_fn=lambda device: device.coordinator.metrics.retry_attributes(),
+        translation_key="api_retries",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
     MyGasSensorEntityDescription(
         key="counter",
-        value_fn=lambda device: device.get_counter_data().get("name"),
-        available_fn=lambda device: "name" in device.get_counter_data(),
+        value_fn=lambda device: device.counter.name,
+        available_fn=lambda device: device.counter.name is not None,
         translation_key="counter",
         entity_category=EntityCategory.DIAGNOSTIC,
-        attr_fn=lambda device: device.get_counter_attr(),
+        attr_fn=lambda device: device.counter.attributes,
     ),
     MyGasSensorEntityDescription(
         key="average_rate",
         native_unit_of_measurement=UnitOfVolume.CUBIC_METERS,
         suggested_display_precision=1,
         device_class=SensorDeviceClass.GAS,
-        value_fn=lambda device: to_float(device.get_counter_data().get("averageRate")),
-        available_fn=lambda device: "averageRate" in device.get_counter_data(),
+        value_fn=lambda device: device.counter.average_rate,
+        available_fn=lambda device: device.counter.average_rate is not None,
         translation_key="average_rate",
     ),
     MyGasSensorEntityDescription(
         key="price",
         native_unit_of_measurement="RUB/m\u00b3",
         device_class=SensorDeviceClass.MONETARY,
-        value_fn=lambda device: to_float(
-            device.get_counter_data().get("price", {}).get("day")
-        ),
-        available_fn=lambda device: "price" in device.get_counter_data(),
+        value_fn=lambda device: device.counter.price_day,
+        available_fn=lambda device: device.counter.has_price,
         translation_key="price",
     ),
     MyGasSensorEntityDescription(
         key="price_middle",
         native_unit_of_measurement="RUB/m\u00b3",
         device_class=SensorDeviceClass.MONETARY,
-        value_fn=lambda device: to_float(
-            device.get_counter_data().get("price", {}).get("middle")
-        ),
-        available_fn=lambda device: "price" in device.get_counter_data(),
+        value_fn=lambda device: device.counter.price_middle,
+        available_fn=lambda device: device.counter.has_price,
         translation_key="price_middle",
         entity_registry_enabled_default=False,
     ),
@@ -289,20 +281,16 @@ SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = (
         key="price_night",
         native_unit_of_measurement="RUB/m\u00b3",
         device_class=SensorDeviceClass.MONETARY,
-        value_fn=lambda device: to_float(
-            device.get_counter_data().get("price", {}).get("night")
-        ),
-        available_fn=lambda device: "price" in device.get_counter_data(),
+        value_fn=lambda device: device.counter.price_night,
+        available_fn=lambda device: device.counter.has_price,
         translation_key="price_night",
         entity_registry_enabled_default=False,
     ),
     MyGasSensorEntityDescription(
         key="readings_date",
         device_class=SensorDeviceClass.DATE,
-        value_fn=lambda device: to_date(
-            device.get_latest_readings().get("date"), "%Y-%m-%dT%H:%M:%S"
-        ),
-        available_fn=lambda device: "date" in device.get_latest_readings(),
+        value_fn=lambda device: device.counter.readings_date,
+        available_fn=lambda device: device.counter.readings_date is not None,
         translation_key="readings_date",
     ),
     MyGasSensorEntityDescription(
@@ -311,8 +299,8 @@ SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = (
         suggested_display_precision=1,
         device_class=SensorDeviceClass.GAS,
         state_class=SensorStateClass.TOTAL,
-        value_fn=lambda device: to_float(device.get_latest_readings().get("valueDay")),
-        available_fn=lambda device: "valueDay" in device.get_latest_readings(),
+        value_fn=lambda device: device.counter.readings,
+        available_fn=lambda device: device.counter.readings is not None,
         translation_key="readings",
     ),
     MyGasSensorEntityDescription(
@@ -321,8 +309,8 @@ SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = (
         suggested_display_precision=1,
         device_class=SensorDeviceClass.GAS,
         state_class=SensorStateClass.TOTAL,
-        value_fn=lambda device: to_float(device.get_latest_readings().get("rate")),
-        available_fn=lambda device: "rate" in device.get_latest_readings(),
+        value_fn=lambda device: device.counter.consumption,
+        available_fn=lambda device: device.counter.consumption is not None,
         translation_key="consumption",
     ),
 )
@@ -340,11 +328,22 @@ ACCOUNT_SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = tuple(
     desc for desc in SENSOR_TYPES if desc.key in _ACCOUNT_SENSOR_KEYS
 )
 
+# Metrics of the whole login, created on the first account device only
+_METRICS_SENSOR_KEYS = {
+    "api_latency_p50", "api_latency_p95", "last_refresh_duration", "api_retries",
+}
+
+METRICS_SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = tuple(
+    desc for desc in SENSOR_TYPES if desc.key in _METRICS_SENSOR_KEYS
+)
+
 _MULTI_TARIFF_SENSOR_KEYS = {"price_middle", "price_night"}
 
 COUNTER_SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = tuple(
     desc for desc in SENSOR_TYPES
-    if desc.key not in _ACCOUNT_SENSOR_KEYS and desc.key not in _MULTI_TARIFF_SENSOR_KEYS
+    if desc.key not in _ACCOUNT_SENSOR_KEYS
+    and desc.key not in _METRICS_SENSOR_KEYS
+    and desc.key not in _MULTI_TARIFF_SENSOR_KEYS
 )
 
 MULTI_TARIFF_SENSOR_TYPES: tuple[MyGasSensorEntityDescription, ...] = tuple(
@@ -367,9 +366,8 @@ class MyGasAccountSensorEntity(MyGasAccountCoordinatorEntity, SensorEntity):
         """Initialize the Entity."""
         super().__init__(coordinator, account_id, lspu_account_id)
         self.entity_description = entity_description
-        account_number = coordinator.get_account_number(account_id, lspu_account_id)
         self._attr_unique_id = make_entity_unique_id(
-            make_account_device_id(account_number), entity_description.key
+            self.account.device_identifier, entity_description.key
         )
 
     @property
@@ -382,11 +380,10 @@ class MyGasAccountSensorEntity(MyGasAccountCoordinatorEntity, SensorEntity):
         )
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _async_update_attrs(self) -> None:
+        """Update entity attributes from the coordinator data."""
         self._attr_native_value = self.entity_description.value_fn(self)
         self._attr_extra_state_attributes = self.entity_description.attr_fn(self)
-        super()._handle_coordinator_update()
 
 
 class MyGasCounterCoordinatorEntity(MyGasBaseCoordinatorEntity, SensorEntity):
@@ -405,10 +402,8 @@ class MyGasCounterCoordinatorEntity(MyGasBaseCoordinatorEntity, SensorEntity):
         """Initialize the Entity."""
         super().__init__(coordinator, account_id, lspu_group_id, counter_id)
         self.entity_description = entity_description
-        account_number = coordinator.get_account_number(account_id, lspu_group_id)
-        counter_uuid = coordinator.get_counters(account_id, lspu_group_id)[counter_id].get("uuid", "")
         self._attr_unique_id = make_entity_unique_id(
-            make_device_id(account_number, counter_uuid), entity_description.key
+            self.counter.device_identifier, entity_description.key
         )
 
     @property
@@ -421,11 +416,10 @@ class MyGasCounterCoordinatorEntity(MyGasBaseCoordinatorEntity, SensorEntity):
         )
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _async_update_attrs(self) -> None:
+        """Update entity attributes from the coordinator data."""
         self._attr_native_value = self.entity_description.value_fn(self)
         self._attr_extra_state_attributes = self.entity_description.attr_fn(self)
-        super()._handle_coordinator_update()
 
 
 class MyGasServiceBalanceSensorEntity(MyGasServiceCoordinatorEntity, SensorEntity):
@@ -444,12 +438,8 @@ class MyGasServiceBalanceSensorEntity(MyGasServiceCoordinatorEntity, SensorEntit
     ) -> None:
         """Initialize the Entity."""
         super().__init__(coordinator, account_id, lspu_account_id, service_id)
-
-        service = coordinator.get_services(account_id, lspu_account_id)[service_id]
-        account_number = coordinator.get_account_number(account_id, lspu_account_id)
-        device_identifier = make_service_device_id(account_number, service["id"])
         self._attr_unique_id = make_entity_unique_id(
-            device_identifier, "service_balance"
+            self.service.device_identifier, "service_balance"
         )
 
     @property
@@ -458,11 +448,9 @@ class MyGasServiceBalanceSensorEntity(MyGasServiceCoordinatorEntity, SensorEntit
         return super().available and self.coordinator.data is not None
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        service = self.get_service_data()
-        self._attr_native_value = to_float(service.get("balance"))
-        super()._handle_coordinator_update()
+    def _async_update_attrs(self) -> None:
+        """Update entity attributes from the coordinator data."""
+        self._attr_native_value = self.service.balance
 
 
 class MyGasServiceTariffSensorEntity(MyGasServiceCoordinatorEntity, SensorEntity):
@@ -483,16 +471,16 @@ class MyGasServiceTariffSensorEntity(MyGasServiceCoordinatorEntity, SensorEntity
         super().__init__(coordinator, account_id, lspu_account_id, service_id)
         self.child_id = child_id
 
-        service = coordinator.get_services(account_id, lspu_account_id)[service_id]
-        child = service["children"][child_id]
-
-        account_number = coordinator.get_account_number(account_id, lspu_account_id)
-        device_identifier = make_service_device_id(account_number, service["id"])
         self._attr_unique_id = make_entity_unique_id(
-            device_identifier, f"service_tariff_{child_id}"
+            self.service.device_identifier, f"service_tariff_{child_id}"
         )
         self._attr_translation_key = "service_tariff"
-        self._attr_name = child["name"]
+        self._attr_name = self.tariff.name
+
+    @property
+    def tariff(self) -> MyGasTariff:
+        """Tariff rate model."""
+        return self.service.tariffs[self.child_id]
 
     @property
     def available(self) -> bool:
@@ -500,16 +488,15 @@ class MyGasServiceTariffSensorEntity(MyGasServiceCoordinatorEntity, SensorEntity
         return super().available and self.coordinator.data is not None
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        child = self.get_child_data(self.child_id)
-        self._attr_native_value = to_float(child.get("tariff"))
+    def _async_update_attrs(self) -> None:
+        """Update entity attributes from the coordinator data."""
+        tariff = self.tariff
+        self._attr_native_value = tariff.tariff
         self._attr_extra_state_attributes = {
-            "Норматив потребления": to_float(child.get("norm")),
-            "Цена за м\u00b3": to_float(child.get("price")),
-            "Дата начала": to_date(child.get("startDate"), "%Y-%m-%dT%H:%M:%S"),
+            "Норматив потребления": tariff.norm,
+            "Цена за м\u00b3": tariff.price,
+            "Дата начала": tariff.start_date,
         }
-        super()._handle_coordinator_update()
 
 
 async def async_setup_entry(
@@ -526,9 +513,21 @@ async def async_setup_entry(
         | MyGasServiceBalanceSensorEntity
         | MyGasServiceTariffSensorEntity
     ] = []
-    for account_id in coordinator.get_accounts():
-        for lspu_account_id in range(len(coordinator.get_lspu_accounts(account_id))):
-            # Account-level sensors (always created)
+    for index, account in enumerate(coordinator.iter_accounts()):
+        account_id = account.account_id
+        lspu_account_id = account.lspu_account_id
+        # Account-level sensors (always created)
+        entities.extend(
+            MyGasAccountSensorEntity(
+                coordinator,
+                entity_description,
+                account_id,
+                lspu_account_id,
+            )
+            for entity_description in ACCOUNT_SENSOR_TYPES
+        )
+        # Login-level metrics sensors (first account only)
+        if index == 0:
             entities.extend(
                 MyGasAccountSensorEntity(
                     coordinator,
@@ -536,11 +535,22 @@ async def async_setup_entry(
                     account_id,
                     lspu_account_id,
                 )
-                for entity_description in ACCOUNT_SENSOR_TYPES
+                for entity_description in METRICS_SENSOR_TYPES
+            )
+        # Counter-level sensors
+        for counter_id, counter in enumerate(account.counters):
+            entities.extend(
+                MyGasCounterCoordinatorEntity(
+                    coordinator,
+                    entity_description,
+                    account_id,
+                    lspu_account_id,
+                    counter_id,
+                )
+                for entity_description in COUNTER_SENSOR_TYPES
             )
-            # Counter-level sensors
-            counters = coordinator.get_counters(account_id, lspu_account_id)
-            for counter_id, counter in enumerate(counters):
+            # Multi-tariff sensors (only for numberOfRates > 1)
+            if counter.number_of_rates > 1:
                 entities.extend(
                     MyGasCounterCoordinatorEntity(
                         coordinator,
@@ -549,42 +559,29 @@ async def async_setup_entry(
                         lspu_account_id,
                         counter_id,
                     )
-                    for entity_description in COUNTER_SENSOR_TYPES
+                    for entity_description in MULTI_TARIFF_SENSOR_TYPES
                 )
-                # Multi-tariff sensors (only for numberOfRates > 1)
-                if counter.get("numberOfRates", 1) > 1:
-                    entities.extend(
-                        MyGasCounterCoordinatorEntity(
-                            coordinator,
-                            entity_description,
-                            account_id,
-                            lspu_account_id,
-                            counter_id,
-                        )
-                        for entity_description in MULTI_TARIFF_SENSOR_TYPES
-                    )
-            # Service-level sensors
-            services = coordinator.get_services(account_id, lspu_account_id)
-            for service_idx, service in enumerate(services):
-                # Balance sensor (always created for each service)
+        # Service-level sensors
+        for service_idx, service in enumerate(account.services):
+            # Balance sensor (always created for each service)
+            entities.append(
+                MyGasServiceBalanceSensorEntity(
+                    coordinator,
+                    account_id,
+                    lspu_account_id,
+                    service_idx,
+                )
+            )
+            # Tariff rate sensors (one per child)
+            for child_idx in range(len(service.tariffs)):
                 entities.append(
-                    MyGasServiceBalanceSensorEntity(
+                    MyGasServiceTariffSensorEntity(
                         coordinator,
                         account_id,
                         lspu_account_id,
                         service_idx,
+                        child_idx,
                     )
                 )
-                # Tariff rate sensors (one per child)
-                for child_idx in range(len(service.get("children", []))):
-                    entities.append(
-                        MyGasServiceTariffSensorEntity(
-                            coordinator,
-                            account_id,
-                            lspu_account_id,
-                            service_idx,
-                            child_idx,
-                        )
-                    )
 
-    async_add_entities(entities, True)
+    async_add_entities(entities)
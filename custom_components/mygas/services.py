@@ -13,7 +13,12 @@ from aiomygas.exceptions import MyGasApiError, MyGasAuthError
 import voluptuous as vol
 
 from homeassistant.const import ATTR_DATE, ATTR_DEVICE_ID, CONF_ERROR, CONF_URL
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.service import verify_domain_control
@@ -24,14 +29,21 @@ from .const import (
     ATTR_MESSAGE,
     ATTR_READINGS,
     ATTR_SENT,
+    ATTR_TARGET,
+    ATTR_TOP,
     ATTR_VALUE,
     DOMAIN,
+    PROFILE_TARGET_ENTITIES,
+    PROFILE_TARGET_REFRESH,
+    PROFILE_TOP_DEFAULT,
     SERVICE_GET_BILL,
+    SERVICE_PROFILE,
     SERVICE_REFRESH,
     SERVICE_SEND_READINGS,
 )
 from .coordinator import MyGasCoordinator
 from .helpers import async_get_coordinator, get_bill_date, get_float_value
+from .profiler import async_profile
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -60,6 +72,18 @@ SERVICE_GET_BILL_SCHEMA = vol.Schema(
     },
 )
 
+SERVICE_PROFILE_SCHEMA = vol.Schema(
+    {
+        **SERVICE_BASE_SCHEMA,
+        vol.Optional(ATTR_TARGET, default=PROFILE_TARGET_REFRESH): vol.In(
+            [PROFILE_TARGET_REFRESH, PROFILE_TARGET_ENTITIES]
+        ),
+        vol.Optional(ATTR_TOP, default=PROFILE_TOP_DEFAULT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=200)
+        ),
+    }
+)
+
 
 @dataclass
 class ServiceDescription:
@@ -70,12 +94,15 @@ class ServiceDescription:
         [HomeAssistant, ServiceCall, MyGasCoordinator], Awaitable[dict[str, Any]]
     ]
     schema: vol.Schema | None = None
+    supports_response: SupportsResponse = SupportsResponse.NONE
+    event_data_fn: Callable[[dict[str, Any]], dict[str, Any]] = lambda result: result
 
 
 async def _async_handle_refresh(
     hass: HomeAssistant, service_call: ServiceCall, coordinator: MyGasCoordinator
 ) -> dict[str, Any]:
-    await coordinator.async_force_refresh()
+    device_id = service_call.data[ATTR_DEVICE_ID]
+    await coordinator.async_refresh_device(device_id)
     return {}
 
 
@@ -178,6 +205,19 @@ async def _async_handle_get_bill(
     }
 
 
+async def _async_handle_profile(
+    hass: HomeAssistant, service_call: ServiceCall, coordinator: MyGasCoordinator
+) -> dict[str, Any]:
+    return await async_profile(
+        coordinator, service_call.data[ATTR_TARGET], service_call.data[ATTR_TOP]
+    )
+
+
+def _profile_event_data(result: dict[str, Any]) -> dict[str, Any]:
+    """Keep the profile summary out of the event stored by the recorder."""
+    return {key: value for key, value in result.items() if key != ATTR_TOP}
+
+
 SERVICES: dict[str, ServiceDescription] = {
     SERVICE_REFRESH: ServiceDescription(
         SERVICE_REFRESH, _async_handle_refresh, SERVICE_REFRESH_SCHEMA
@@ -188,6 +228,13 @@ SERVICES: dict[str, ServiceDescription] = {
     SERVICE_GET_BILL: ServiceDescription(
         SERVICE_GET_BILL, _async_handle_get_bill, SERVICE_GET_BILL_SCHEMA
     ),
+    SERVICE_PROFILE: ServiceDescription(
+        SERVICE_PROFILE,
+        _async_handle_profile,
+        SERVICE_PROFILE_SCHEMA,
+        SupportsResponse.OPTIONAL,
+        _profile_event_data,
+    ),
 }
 
 
@@ -195,7 +242,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
     """Set up the MyGas services."""
 
     @verify_domain_control(DOMAIN)
-    async def _async_handle_service(service_call: ServiceCall) -> None:
+    async def _async_handle_service(service_call: ServiceCall) -> ServiceResponse:
         """Call a service."""
         _LOGGER.debug("Service call %s", service_call.service)
 
@@ -203,19 +250,22 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             device_id = service_call.data.get(ATTR_DEVICE_ID)
             coordinator = await async_get_coordinator(hass, device_id)
 
-            result = await SERVICES[service_call.service].service_func(
-                hass, service_call, coordinator
-            )
+            service = SERVICES[service_call.service]
+            result = await service.service_func(hass, service_call, coordinator)
 
             hass.bus.async_fire(
                 event_type=f"{DOMAIN}_{service_call.service}_completed",
-                event_data={ATTR_DEVICE_ID: device_id, **result},
+                event_data={
+                    ATTR_DEVICE_ID: device_id,
+                    **service.event_data_fn(result),
+                },
                 context=service_call.context,
             )
 
             _LOGGER.debug(
                 "Service call '%s' successfully finished", service_call.service
             )
+            return result
 
         except HomeAssistantError:
             raise
@@ -266,5 +316,9 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         if hass.services.has_service(DOMAIN, service.name):
             continue
         hass.services.async_register(
-            DOMAIN, service.name, _async_handle_service, service.schema
+            DOMAIN,
+            service.name,
+            _async_handle_service,
+            service.schema,
+            service.supports_response,
         )
@@ -0,0 +1,96 @@
+"""Bounded trace of the MyGas API exchanges."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from hashlib import sha256
+import logging
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import TRACE_SIZE
+from .recorder import redact
+
+# Tracing follows the debug logging of the integration
+_LOGGER = logging.getLogger(__package__)
+
+
+@dataclass(frozen=True, slots=True)
+class MyGasTraceRecord:
+    """Structured record of a single API exchange."""
+
+    time: str
+    endpoint: str
+    args: list[Any]
+    status: str
+    duration: float
+    size: int
+    payload_hash: str | None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the record for diagnostics."""
+        return {
+            "time": self.time,
+            "endpoint": self.endpoint,
+            "args": self.args,
+            "status": self.status,
+            "duration": self.duration,
+            "size": self.size,
+            "payload_hash": self.payload_hash,
+        }
+
+
+class MyGasApiTrace:
+    """Keep the last API exchanges while debug logging is enabled."""
+
+    def __init__(self, size: int = TRACE_SIZE) -> None:
+        """Initialize the trace."""
+        self.records: deque[MyGasTraceRecord] = deque(maxlen=size)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether exchanges are traced."""
+        return _LOGGER.isEnabledFor(logging.DEBUG)
+
+    def record(
+        self,
+        endpoint: str,
+        args: tuple[Any, ...],
+        duration: float,
+        payload: bytes | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Record a finished API exchange.
+
+        The payload is the raw response body as aiohttp read it, so nothing
+        is serialized here. Hashing it is a single pass over the bytes,
+        well under a millisecond for the largest responses of the API, and
+        is cheaper than moving the bytes to the executor.
+        """
+        record = MyGasTraceRecord(
+            time=dt_util.utcnow().isoformat(),
+            endpoint=endpoint,
+            args=redact(args),
+            status=type(error).__name__ if error else "ok",
+            duration=round(duration, 4),
+            size=len(payload) if payload is not None else 0,
+            payload_hash=(
+                sha256(payload).hexdigest()[:16] if payload is not None else None
+            ),
+        )
+        self.records.append(record)
+        _LOGGER.debug(
+            "API %s%s: %s in %.3fs, %d bytes, hash %s",
+            endpoint,
+            tuple(record.args),
+            record.status,
+            record.duration,
+            record.size,
+            record.payload_hash,
+        )
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the trace for diagnostics."""
+        return [record.as_dict() for record in self.records]
@@ -0,0 +1,98 @@
+"""Watchdog of the time MyGas callbacks hold the event loop."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import LOOP_WATCHDOG_HISTORY, LOOP_WATCHDOG_THRESHOLD
+
+_LOGGER = logging.getLogger(__name__)
+
+_NOT_WATCHED: AbstractContextManager[None] = nullcontext()
+
+
+@dataclass(frozen=True, slots=True)
+class MyGasLoopBlock:
+    """Callback that held the event loop longer than the threshold."""
+
+    time: str
+    function: str
+    duration: float
+
+
+class MyGasLoopWatchdog:
+    """Measure synchronous sections running on the event loop.
+
+    Only code without ``await`` may be watched, so the measured time is the
+    time the loop was held. When disabled, watching costs a single check.
+    """
+
+    def __init__(
+        self, enabled: bool = False, threshold: float = LOOP_WATCHDOG_THRESHOLD
+    ) -> None:
+        """Initialize the watchdog."""
+        self.enabled = enabled
+        self.threshold = threshold
+        self.blocks: deque[MyGasLoopBlock] = deque(maxlen=LOOP_WATCHDOG_HISTORY)
+        self.max_durations: dict[str, float] = {}
+
+    def watch(self, function: str) -> AbstractContextManager[None]:
+        """Measure how long the block holds the loop."""
+        if not self.enabled:
+            return _NOT_WATCHED
+        return self._watch(function)
+
+    @contextmanager
+    def _watch(self, function: str) -> Iterator[None]:
+        """Measure a block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(function, time.perf_counter() - started)
+
+    def _record(self, function: str, duration: float) -> None:
+        """Record the duration of a watched block."""
+        if duration > self.max_durations.get(function, 0):
+            self.max_durations[function] = duration
+        if duration < self.threshold:
+            return
+        self.blocks.append(
+            MyGasLoopBlock(
+                time=dt_util.utcnow().isoformat(),
+                function=function,
+                duration=round(duration, 4),
+            )
+        )
+        _LOGGER.warning(
+            "%s held the event loop for %.3f seconds", function, duration
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the watchdog state for diagnostics."""
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "max_durations": {
+                function: round(duration, 4)
+                for function, duration in sorted(
+                    self.max_durations.items(), key=lambda item: -item[1]
+                )
+            },
+            "blocks": [
+                {
+                    "time": block.time,
+                    "function": block.function,
+                    "duration": block.duration,
+                }
+                for block in self.blocks
+            ],
+        }
@@ -0,0 +1,123 @@
+"""Compare benchmark results with the stored baseline.
+
+Usage::
+
+    pytest tests/benchmarks -m benchmark
+    python -m tests.benchmarks.compare            # compare with the baseline
+    python -m tests.benchmarks.compare --save     # store results as baseline
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import shutil
+import sys
+from typing import Any
+
+BENCHMARK_DIR = Path(__file__).parent
+RESULTS_FILE = BENCHMARK_DIR / "results" / "latest.json"
+BASELINE_FILE = BENCHMARK_DIR / "baseline.json"
+
+DEFAULT_THRESHOLD = 0.2
+
+# Metrics that are counts, not costs, are shown but never flagged
+INFORMATIONAL_METRICS = {"entities"}
+
+
+def load_results(path: Path) -> dict[str, dict[str, float]]:
+    """Load benchmark results."""
+    with path.open(encoding="utf-8") as file:
+        return json.load(file)["profiles"]
+
+
+def save_results(
+    path: Path, profiles: dict[str, dict[str, float]], **meta: Any
+) -> None:
+    """Save benchmark results."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as file:
+        json.dump({**meta, "profiles": profiles}, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def compare(
+    baseline: dict[str, dict[str, float]],
+    current: dict[str, dict[str, float]],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> tuple[list[str], list[str]]:
+    """Compare results, return the report lines and the regressions."""
+    lines = [
+        (
+            f"{'profile':<14} {'metric':<28} {'baseline':>12} {'current':>12} "
+            f"{'change':>8}"
+        )
+    ]
+    regressions: list[str] = []
+    for profile in sorted(current):
+        for metric, value in sorted(current[profile].items()):
+            base = baseline.get(profile, {}).get(metric)
+            if base is None:
+                lines.append(
+                    f"{profile:<14} {metric:<28} {'-':>12} {value:>12.3f} "
+                    f"{'new':>8}"
+                )
+                continue
+            change = (value - base) / base if base else 0.0
+            flag = ""
+            if metric not in INFORMATIONAL_METRICS and change > threshold:
+                flag = " !"
+                regressions.append(f"{profile}.{metric}: {base:.3f} -> {value:.3f}")
+            lines.append(
+                f"{profile:<14} {metric:<28} {base:>12.3f} {value:>12.3f} "
+                f"{change:>+7.1%}{flag}"
+            )
+    return lines, regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the comparison command."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--results", type=Path, default=RESULTS_FILE)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="relative increase reported as a regression (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="store the results as the new baseline"
+    )
+    args = parser.parse_args(argv)
+
+    if not args.results.exists():
+        print(
+            f"No results in {args.results}, "
+            "run: pytest tests/benchmarks -m benchmark"
+        )
+        return 2
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(args.results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline in {args.baseline}, store one with --save")
+        return 2
+
+    lines, regressions = compare(
+        load_results(args.baseline), load_results(args.results), args.threshold
+    )
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+        print("\n".join(f"  {regression}" for regression in regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Fixtures for MyGas benchmarks."""
+from __future__ import annotations
+
+from collections.abc import Generator
+import platform
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.mygas.watchdog import MyGasLoopWatchdog
+
+from .compare import RESULTS_FILE, save_results
+
+
+class BenchmarkRecorder:
+    """Collect benchmark metrics per profile."""
+
+    def __init__(self) -> None:
+        """Initialize the recorder."""
+        self.profiles: dict[str, dict[str, float]] = {}
+
+    def record(self, profile: str, metric: str, value: float) -> None:
+        """Record a metric of a profile."""
+        self.profiles.setdefault(profile, {})[metric] = round(value, 3)
+
+
+@pytest.fixture(scope="session")
+def benchmark_recorder() -> Generator[BenchmarkRecorder]:
+    """Collect metrics and write them to the results file at the end."""
+    recorder = BenchmarkRecorder()
+    yield recorder
+    if recorder.profiles:
+        save_results(
+            RESULTS_FILE,
+            recorder.profiles,
+            python=platform.python_version(),
+            machine=platform.machine(),
+        )
+
+
+@pytest.fixture(autouse=True)
+def loop_watchdog() -> Generator[list[MyGasLoopWatchdog]]:
+    """Fail a benchmark when an integration callback blocks the event loop."""
+    watchdogs: list[MyGasLoopWatchdog] = []
+
+    def _create(enabled: bool = False, **kwargs: float) -> MyGasLoopWatchdog:
+        watchdog = MyGasLoopWatchdog(enabled=True, **kwargs)
+        watchdogs.append(watchdog)
+        return watchdog
+
+    with patch("custom_components.mygas.coordinator.MyGasLoopWatchdog", _create):
+        yield watchdogs
+
+    blocks = [block for watchdog in watchdogs for block in watchdog.blocks]
+    assert not blocks, f"Event loop blocked: {blocks}"
@@ -0,0 +1,181 @@
+"""Synthetic MyGas payloads for benchmarks."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkProfile:
+    """Shape of a synthetic login."""
+
+    name: str
+    accounts: int
+    counters: int
+    services: int
+    history: int
+    els: bool = False
+    lspu_per_els: int = 1
+
+    @property
+    def lspu_accounts(self) -> int:
+        """Total number of LSPU accounts of the login."""
+        return self.accounts * (self.lspu_per_els if self.els else 1)
+
+
+PROFILES: tuple[BenchmarkProfile, ...] = (
+    BenchmarkProfile("lspu_small", accounts=1, counters=1, services=3, history=12),
+    BenchmarkProfile("lspu_medium", accounts=10, counters=2, services=5, history=60),
+    BenchmarkProfile("lspu_large", accounts=50, counters=3, services=8, history=240),
+    BenchmarkProfile(
+        "els_large",
+        accounts=10,
+        counters=3,
+        services=8,
+        history=240,
+        els=True,
+        lspu_per_els=5,
+    ),
+)
+
+_START_DATE = date(2026, 1, 31)
+
+
+def _month_end(months_ago: int) -> date:
+    """Get the last day of the month ``months_ago`` months before the start."""
+    next_month = _START_DATE.year * 12 + _START_DATE.month - months_ago
+    year, month = divmod(next_month, 12)
+    return date(year, month + 1, 1) - timedelta(days=1)
+
+
+def make_balance(index: int, seed: int) -> dict[str, Any]:
+    """Build a billing period."""
+    period = _month_end(index)
+    charged = round(500 + (seed * 7 + index * 13) % 500 + 0.25, 2)
+    return {
+        "uuid": f"bal-{seed}-{index}",
+        "date": period.isoformat(),
+        "name": f"Период {period:%m.%Y}",
+        "chargedSum": charged,
+        "paidSum": round(charged - 50, 2),
+        "debtSum": 50.0,
+        "balanceStartSum": 0.0,
+        "balanceEndSum": 50.0,
+        "chargedVolume": round(charged / 9, 3),
+        "circulationSum": charged,
+        "forgivenDebt": 0.0,
+        "plannedSum": charged + 50,
+        "privilegeSum": 0.0,
+        "privilegeVolume": 0.0,
+        "restoredDebt": 0.0,
+        "paymentAdjustments": 0.0,
+        "endBalanceApgp": 0.0,
+        "prepaymentChargedAccumSum": 0.0,
+    }
+
+
+def make_counter(account: str, index: int, history: int) -> dict[str, Any]:
+    """Build a counter with ``history`` readings, newest first."""
+    return {
+        "uuid": f"{account}-counter-{index}",
+        "name": f"Счетчик газа {index + 1}",
+        "model": "BK-G4",
+        "serialNumber": f"SN{account}{index:02d}",
+        "state": "Активный",
+        "equipmentKind": "Газовый счетчик",
+        "position": "Кухня",
+        "serviceName": "Газоснабжение",
+        "numberOfRates": 1,
+        "averageRate": 12.5,
+        "checkDate": "2030-01-01T00:00:00",
+        "techSupportDate": "2030-06-01T00:00:00",
+        "sealDate": "2020-01-01T00:00:00",
+        "factorySealDate": "2019-06-01T00:00:00",
+        "commissionedOn": "2019-01-01T00:00:00",
+        "price": {"day": 8.5},
+        "values": [
+            {
+                "date": f"{_month_end(month).isoformat()}T00:00:00",
+                "valueDay": round(10000 - month * 15.5, 1),
+                "rate": 15.5,
+            }
+            for month in range(history)
+        ],
+    }
+
+
+def make_service(account: str, index: int) -> dict[str, Any]:
+    """Build a service, every other one with tariff rates."""
+    return {
+        "id": f"{index + 1:02d}",
+        "name": f"Услуга {index + 1}",
+        "balance": f"{-index * 1.5:.2f}",
+        "providerName": 'ООО "Газпром межрегионгаз"',
+        "children": [
+            {
+                "name": f"Тариф {child + 1}",
+                "norm": 29.52,
+                "price": 9.014,
+                "tariff": round(29.52 * 9.014 * (child + 1), 5),
+                "equipmentUuid": f"{account}-counter-0",
+                "startDate": "2017-10-09T00:00:00",
+            }
+            for child in range(2 if index % 2 == 0 else 0)
+        ],
+    }
+
+
+def make_lspu_info(
+    lspu_id: int, profile: BenchmarkProfile, seed: int = 0
+) -> dict[str, Any]:
+    """Build the info payload of an LSPU account."""
+    account = f"{lspu_id:010d}"
+    return {
+        "account": account,
+        "alias": f"Объект {lspu_id}",
+        "accountId": lspu_id,
+        "balance": round(100.5 + seed, 2),
+        "parameters": [
+            {
+                "name": "Адрес",
+                "value": f"г. Москва, ул. Примерная, д. {lspu_id}",
+            },
+            {"name": "Площадь", "value": "54.3"},
+        ],
+        "balances": [
+            make_balance(index, lspu_id + seed) for index in range(profile.history)
+        ],
+        "services": [
+            make_service(account, index) for index in range(profile.services)
+        ],
+        "counters": [
+            make_counter(account, index, profile.history)
+            for index in range(profile.counters)
+        ],
+    }
+
+
+def make_els_info(
+    els_id: int, profile: BenchmarkProfile, seed: int = 0
+) -> dict[str, Any]:
+    """Build the info payload of an ELS account."""
+    return {
+        "els": {
+            "id": els_id,
+            "jntAccountNum": f"ELS{els_id:07d}",
+            "alias": f"ЕЛС {els_id}",
+        },
+        "lspuInfoGroup": [
+            make_lspu_info(els_id * 100 + index, profile, seed)
+            for index in range(profile.lspu_per_els)
+        ],
+    }
+
+
+def make_accounts_response(profile: BenchmarkProfile) -> dict[str, Any]:
+    """Build the accounts list of a login."""
+    ids = range(1, profile.accounts + 1)
+    if profile.els:
+        return {"elsGroup": [{"els": {"id": account_id}} for account_id in ids]}
+    return {"lspu": [{"id": account_id} for account_id in ids]}
@@ -0,0 +1,163 @@
+"""Benchmarks of refresh, platform setup and entity updates.
+
+Run with ``pytest tests/benchmarks -m benchmark``, then compare the results
+with the baseline using ``python -m tests.benchmarks.compare``.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from statistics import median
+import time
+import tracemalloc
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mygas.const import ATTR_IS_ELS, CONF_ACCOUNTS, CONF_INFO, DOMAIN
+
+from ..const import MOCK_PASSWORD, MOCK_USERNAME
+from .conftest import BenchmarkRecorder
+from .payloads import (
+    PROFILES,
+    BenchmarkProfile,
+    make_accounts_response,
+    make_els_info,
+    make_lspu_info,
+)
+
+pytestmark = pytest.mark.benchmark
+
+ROUNDS = 5
+
+
+def _payloads(profile: BenchmarkProfile, seed: int) -> dict[int, Any]:
+    """Build the info payloads of every account for a seed."""
+    make_info = make_els_info if profile.els else make_lspu_info
+    return {
+        account_id: make_info(account_id, profile, seed)
+        for account_id in range(1, profile.accounts + 1)
+    }
+
+
+async def _timed(func: Callable[[], Any]) -> float:
+    """Run a callable (awaiting its result) and return the elapsed milliseconds."""
+    start = time.perf_counter()
+    result = func()
+    if result is not None:
+        await result
+    return (time.perf_counter() - start) * 1000
+
+
+@pytest.mark.parametrize("profile", PROFILES, ids=lambda profile: profile.name)
+async def test_benchmark(
+    hass: HomeAssistant,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+    profile: BenchmarkProfile,
+    benchmark_recorder: BenchmarkRecorder,
+) -> None:
+    """Measure one synthetic login."""
+    payloads = [_payloads(profile, seed) for seed in (0, 1)]
+    current = payloads[0]
+
+    async def _get_info(account_id: int) -> dict[str, Any]:
+        return current[account_id]
+
+    mock_api.async_get_accounts.return_value = make_accounts_response(profile)
+    mock_api.async_get_lspu_info.side_effect = _get_info
+    mock_api.async_get_els_info.side_effect = _get_info
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: MOCK_USERNAME, CONF_PASSWORD: MOCK_PASSWORD},
+        unique_id=MOCK_USERNAME,
+    )
+    entry.add_to_hass(hass)
+
+    def _record(metric: str, value: float) -> None:
+        benchmark_recorder.record(profile.name, metric, value)
+
+    # Set up the entry without platforms to time them separately
+    with patch("custom_components.mygas.PLATFORMS", []):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.LOADED
+    coordinator = entry.runtime_data
+    assert len(list(coordinator.iter_accounts())) == profile.lspu_accounts
+
+    for platform in (Platform.SENSOR, Platform.BUTTON):
+
+        async def _setup_platform(platform: Platform = platform) -> None:
+            await hass.config_entries.async_forward_entry_setups(entry, [platform])
+            await hass.async_block_till_done()
+
+        _record(f"{platform}_setup_ms", await _timed(_setup_platform))
+
+    entities = len(
+        er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+    )
+    _record("entities", entities)
+
+    # Full refresh: fetch, model build and entity updates
+    refresh_times = []
+    for round_ in range(ROUNDS):
+        current = payloads[round_ % 2]
+        refresh_times.append(await _timed(coordinator.async_force_refresh))
+    assert coordinator.last_update_success
+    _record("refresh_ms", median(refresh_times))
+
+    # Model build only
+    _record(
+        "model_build_ms",
+        median(
+            [await _timed(coordinator._async_build_accounts) for _ in range(ROUNDS)]
+        ),
+    )
+
+    # Entity evaluation with unchanged and changed data
+    _record(
+        "entity_update_unchanged_ms",
+        median(
+            [await _timed(coordinator.async_update_listeners) for _ in range(ROUNDS)]
+        ),
+    )
+    changed_times = []
+    for round_ in range(ROUNDS):
+        coordinator.data = {
+            **coordinator.data,
+            ATTR_IS_ELS: profile.els,
+            CONF_INFO: {
+                account_id: [info] if not profile.els else info
+                for account_id, info in payloads[(round_ + 1) % 2].items()
+            },
+        }
+        coordinator._async_build_accounts()
+        changed_times.append(await _timed(coordinator.async_update_listeners))
+    _record("entity_update_changed_ms", median(changed_times))
+    _record("entity_update_per_entity_us", median(changed_times) * 1000 / entities)
+
+    # Peak memory of a full refresh, not watched as tracing slows it down
+    current = payloads[0]
+    coordinator.data = {**coordinator.data, CONF_ACCOUNTS: None}
+    coordinator.watchdog.enabled = False
+    tracemalloc.start()
+    try:
+        await coordinator.async_force_refresh()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        coordinator.watchdog.enabled = True
+    _record("refresh_peak_memory_kib", peak / 1024)
+
+    assert await hass.config_entries.async_unload_platforms(
+        entry, [Platform.SENSOR, Platform.BUTTON]
+    )
+    with patch("custom_components.mygas.PLATFORMS", []):
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
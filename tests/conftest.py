@@ -22,8 +22,8 @@ if sys.platform == "win32":
 
     socket.socketpair = _safe_socketpair  # type: ignore[assignment]
 
-from collections.abc import Generator
-from unittest.mock import AsyncMock, patch
+from collections.abc import AsyncGenerator, Generator
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
@@ -31,6 +31,7 @@ from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.mygas.const import DOMAIN
+from custom_components.mygas.coordinator import MyGasValidatedLogin
 
 from .const import (
     MOCK_ACCOUNTS_RESPONSE,
@@ -40,6 +41,7 @@ from .const import (
     MOCK_SEND_READINGS_RESPONSE,
     MOCK_USERNAME,
 )
+from .fake_server import FakeMyGasServer
 
 
 @pytest.fixture(autouse=True)
@@ -55,6 +57,9 @@ def no_retry_delay(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(
         "custom_components.mygas.decorators.API_RETRY_DELAY", 0
     )
+    monkeypatch.setattr(
+        "custom_components.mygas.decorators.randrange", lambda _stop: 0
+    )
 
 
 @pytest.fixture
@@ -85,7 +90,9 @@ def mock_validate() -> Generator[AsyncMock]:
     """Mock _async_validate_credentials."""
     with patch(
         "custom_components.mygas.config_flow._async_validate_credentials",
-        return_value={"title": MOCK_USERNAME},
+        return_value=MyGasValidatedLogin(
+            MOCK_USERNAME, MOCK_PASSWORD, MagicMock(), MOCK_ACCOUNTS_RESPONSE
+        ),
     ) as mock:
         yield mock
 
@@ -124,3 +131,13 @@ def mock_auth() -> Generator[AsyncMock]:
     ) as mock_auth_cls:
         mock_instance = mock_auth_cls.return_value
         yield mock_instance
+
+
+@pytest.fixture
+async def fake_mygas_api(socket_enabled: None) -> AsyncGenerator[FakeMyGasServer]:
+    """Run the local MyGas API stand-in and point aiomygas at it."""
+    server = FakeMyGasServer({MOCK_USERNAME: MOCK_PASSWORD})
+    await server.start()
+    with patch("aiomygas.auth.DEFAULT_ENDPOINT", server.endpoint):
+        yield server
+    await server.stop()
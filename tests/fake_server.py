@@ -0,0 +1,257 @@
+"""Local stand-in for the MyGas GraphQL API.
+
+The server speaks the same protocol as the real backend for the operations
+the integration uses (sign in, accounts, ELS info, LSPU info, receipt and
+indication send), so tests exercise aiomygas, the HTTP session, retries and
+timeouts end to end. Latency, error rate, token lifetime and rate limiting
+are programmable through ``FakeMyGasBehavior``.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter, deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import random
+import time
+from typing import Any, ClassVar
+from uuid import uuid4
+
+from aiohttp import web
+
+ENDPOINT_PATH = "/abr-lka-backend"
+
+LatencyDistribution = Callable[[], float]
+
+
+def constant_latency(seconds: float) -> LatencyDistribution:
+    """Respond after a fixed delay."""
+    return lambda: seconds
+
+
+def uniform_latency(low: float, high: float) -> LatencyDistribution:
+    """Respond after a delay uniformly distributed between low and high."""
+    return lambda: random.uniform(low, high)
+
+
+def lognormal_latency(median: float, sigma: float = 0.5) -> LatencyDistribution:
+    """Respond after a long-tailed delay around the median."""
+    return lambda: median * random.lognormvariate(0, sigma)
+
+
+@dataclass(slots=True)
+class FakeMyGasBehavior:
+    """Programmable behaviour of the fake server."""
+
+    latency: LatencyDistribution | None = None
+    # Share of data requests answered with HTTP 500
+    error_rate: float = 0.0
+    # Seconds a token stays valid, None for tokens that never expire
+    token_lifetime: float | None = None
+    # Requests allowed per window, excess requests get HTTP 429
+    rate_limit: int | None = None
+    rate_limit_window: float = 1.0
+
+
+@dataclass(slots=True)
+class FakeMyGasStats:
+    """Counters of the requests served."""
+
+    requests: Counter[str] = field(default_factory=Counter)
+    errors: int = 0
+    rate_limited: int = 0
+    unauthorized: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+
+class FakeMyGasServer:
+    """aiohttp server emulating the MyGas API."""
+
+    def __init__(
+        self,
+        credentials: dict[str, str],
+        behavior: FakeMyGasBehavior | None = None,
+    ) -> None:
+        """Initialize the server."""
+        self.credentials = credentials
+        self.behavior = behavior or FakeMyGasBehavior()
+        self.stats = FakeMyGasStats()
+        self.lspu: dict[int, dict[str, Any]] = {}
+        self.els: dict[int, dict[str, Any]] = {}
+        self.readings: list[dict[str, Any]] = []
+        self._tokens: dict[str, float] = {}
+        self._request_times: deque[float] = deque()
+        self._runner: web.AppRunner | None = None
+        self._port = 0
+
+    @property
+    def endpoint(self) -> str:
+        """URL to point the API client at."""
+        return f"http://127.0.0.1:{self._port}{ENDPOINT_PATH}"
+
+    def add_lspu_account(self, info: dict[str, Any]) -> None:
+        """Add an LSPU account, keyed by its accountId."""
+        self.lspu[int(info["accountId"])] = info
+
+    def add_els_account(self, info: dict[str, Any]) -> None:
+        """Add an ELS account, keyed by its els id."""
+        self.els[int(info["els"]["id"])] = info
+
+    def expire_tokens(self) -> None:
+        """Invalidate every issued token."""
+        self._tokens.clear()
+
+    async def start(self) -> None:
+        """Start listening on a free local port."""
+        app = web.Application()
+        app.router.add_post(ENDPOINT_PATH, self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self._port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        """Serve a GraphQL request."""
+        payload = await request.json()
+        operation = payload.get("operationName", "")
+        variables = payload.get("variables") or {}
+        stats = self.stats
+        stats.requests[operation] += 1
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        try:
+            if self._is_rate_limited():
+                stats.rate_limited += 1
+                return web.Response(status=429, text="Too Many Requests")
+
+            if self.behavior.latency is not None:
+                await asyncio.sleep(max(self.behavior.latency(), 0))
+
+            if operation == "signInN3":
+                return self._sign_in(variables)
+
+            if not self._is_authorized(request.headers.get("token")):
+                stats.unauthorized += 1
+                return self._fail(operation, "Необходима авторизация")
+
+            if random.random() < self.behavior.error_rate:
+                stats.errors += 1
+                return web.Response(status=500, text="Internal Server Error")
+
+            if (handler := self._handlers.get(operation)) is None:
+                return web.Response(status=400, text=f"Unknown operation {operation}")
+            return handler(self, operation, variables)
+        finally:
+            stats.in_flight -= 1
+
+    def _is_rate_limited(self) -> bool:
+        """Check the request exceeds the rate limit."""
+        if self.behavior.rate_limit is None:
+            return False
+        now = time.monotonic()
+        while (
+            self._request_times
+            and now - self._request_times[0] >= self.behavior.rate_limit_window
+        ):
+            self._request_times.popleft()
+        if len(self._request_times) >= self.behavior.rate_limit:
+            return True
+        self._request_times.append(now)
+        return False
+
+    def _is_authorized(self, token: str | None) -> bool:
+        """Check the token was issued and did not expire."""
+        if not token or (issued_at := self._tokens.get(token)) is None:
+            return False
+        lifetime = self.behavior.token_lifetime
+        return lifetime is None or time.monotonic() - issued_at < lifetime
+
+    @staticmethod
+    def _ok(operation: str, **data: Any) -> web.Response:
+        """Build a successful response."""
+        return web.json_response({"data": {operation: {"ok": True, **data}}})
+
+    @staticmethod
+    def _fail(operation: str, error: str) -> web.Response:
+        """Build a response with an API error."""
+        return web.json_response(
+            {"data": {operation: {"ok": False, "error": error}}}
+        )
+
+    def _sign_in(self, variables: dict[str, Any]) -> web.Response:
+        """Issue a token for valid credentials."""
+        credentials = variables.get("input") or {}
+        identifier = credentials.get("identifier")
+        if self.credentials.get(identifier) != credentials.get("password"):
+            return self._fail("signInN3", "Неверный логин или пароль")
+        token = uuid4().hex
+        self._tokens[token] = time.monotonic()
+        return self._ok("signInN3", token=token, hasAgreement=True)
+
+    def _accounts(self, operation: str, variables: dict[str, Any]) -> web.Response:
+        """List the accounts of the login."""
+        accounts: dict[str, Any] = {
+            "lspu": [{"id": lspu_id} for lspu_id in self.lspu],
+            "elsGroup": [{"els": {"id": els_id}} for els_id in self.els],
+        }
+        return self._ok(operation, accounts=accounts)
+
+    def _els_info(self, operation: str, variables: dict[str, Any]) -> web.Response:
+        """Return an ELS account."""
+        if (info := self.els.get(int(variables.get("elsId", 0)))) is None:
+            return self._fail(operation, "ЕЛС не найден")
+        return self._ok(operation, info=info)
+
+    def _lspu_info(self, operation: str, variables: dict[str, Any]) -> web.Response:
+        """Return an LSPU account."""
+        if (info := self.lspu.get(int(variables.get("lspuId", 0)))) is None:
+            return self._fail(operation, "Лицевой счет не найден")
+        return self._ok(operation, info=info)
+
+    def _receipt(self, operation: str, variables: dict[str, Any]) -> web.Response:
+        """Return a receipt link."""
+        return self._ok(
+            operation,
+            content=None,
+            url=f"https://example.com/receipt/{variables.get('id')}.pdf",
+        )
+
+    def _indication_send(
+        self, operation: str, variables: dict[str, Any]
+    ) -> web.Response:
+        """Accept counter readings."""
+        groups = (variables.get("input") or {}).get("lspuGroups") or []
+        for group in groups:
+            for counter in group.get("counters") or []:
+                self.readings.append(
+                    {
+                        "lspuId": group.get("lspuId"),
+                        "uuid": counter.get("uuid"),
+                        "valueDay": counter.get("valueDay"),
+                    }
+                )
+        return self._ok(
+            operation,
+            data=[
+                {"counters": [{"message": "Показания приняты", "sent": True}]}
+                for _ in groups
+            ],
+        )
+
+    _handlers: ClassVar[
+        dict[str, Callable[[FakeMyGasServer, str, dict[str, Any]], web.Response]]
+    ] = {
+        "accountsN": _accounts,
+        "elsInfo": _els_info,
+        "lspuInfo": _lspu_info,
+        "receipt": _receipt,
+        "indicationSendV4": _indication_send,
+    }
@@ -0,0 +1,85 @@
+"""Replay recorded MyGas API cassettes.
+
+Cassettes are written by the integration when the "Record API traffic"
+option is enabled. ``CassettePlayer`` feeds the recorded responses back into
+``MyGasCoordinator`` with the recorded timing, scaled by ``speed``
+(``None`` answers immediately).
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict, deque
+from collections.abc import Generator
+from contextlib import ExitStack, contextmanager
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.mygas.coordinator import MyGasCoordinator
+from custom_components.mygas.recorder import redact
+
+_ERRORS: dict[str, type[Exception]] = {
+    "ConfigEntryAuthFailed": ConfigEntryAuthFailed,
+    "UpdateFailed": UpdateFailed,
+}
+
+
+def _call_key(method: str, args: Any, kwargs: Any) -> str:
+    """Build the lookup key of a call."""
+    return json.dumps([method, args, kwargs], sort_keys=True, default=str)
+
+
+class CassettePlayer:
+    """Answer coordinator API calls from a cassette."""
+
+    def __init__(self, cassette: dict[str, Any], speed: float | None = 1.0) -> None:
+        """Initialize the player."""
+        self.speed = speed
+        self.played: list[str] = []
+        self._calls: dict[str, deque[dict[str, Any]]] = defaultdict(deque)
+        for call in cassette["calls"]:
+            key = _call_key(call["method"], call["args"], call["kwargs"])
+            self._calls[key].append(call)
+        self.methods = {call["method"] for call in cassette["calls"]}
+
+    @classmethod
+    def load(cls, path: Path, speed: float | None = 1.0) -> CassettePlayer:
+        """Load a cassette file."""
+        return cls(json.loads(path.read_text(encoding="utf-8")), speed)
+
+    async def _async_play(
+        self, method: str, args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> Any:
+        """Play the next recorded call, repeating the last one when exhausted."""
+        key = _call_key(method, redact(args), redact(kwargs))
+        if not (calls := self._calls.get(key)):
+            raise AssertionError(f"No recorded call for {method}{args}")
+        call = calls.popleft() if len(calls) > 1 else calls[0]
+        self.played.append(method)
+
+        if self.speed:
+            await asyncio.sleep(call["duration"] / self.speed)
+        if error := call["error"]:
+            raise _ERRORS.get(error["type"], UpdateFailed)(error["message"])
+        return call["response"]
+
+    @contextmanager
+    def patch(self) -> Generator[CassettePlayer]:
+        """Route the recorded coordinator methods to the cassette."""
+        with ExitStack() as stack:
+            for method in self.methods:
+
+                async def _replay(
+                    coordinator: MyGasCoordinator,
+                    *args: Any,
+                    _method: str = method,
+                    **kwargs: Any,
+                ) -> Any:
+                    return await self._async_play(_method, args, kwargs)
+
+                stack.enter_context(patch.object(MyGasCoordinator, method, _replay))
+            yield self
@@ -2,11 +2,13 @@
 from __future__ import annotations
 
 from datetime import date
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
+from freezegun.api import FrozenDateTimeFactory
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.update_coordinator import UpdateFailed
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.mygas.const import DOMAIN
@@ -659,3 +661,92 @@ async def test_account_balance_sensors_unavailable_no_balances(
         state = hass.states.get(entity_id)
         assert state is not None
         assert state.state == "unavailable"
+
+
+# ---------------------------------------------------------------------------
+# State writes
+# ---------------------------------------------------------------------------
+
+
+async def test_unchanged_state_not_written(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test a refresh with identical data does not rewrite entity states."""
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = mock_config_entry.runtime_data
+    ent_reg = er.async_get(hass)
+    entity_id = ent_reg.async_get_entity_id(
+        "sensor",
+        DOMAIN,
+        f"{DOMAIN}_{make_account_device_id(MOCK_LSPU_INFO_RESPONSE['account'])}_balance",
+    )
+    assert entity_id is not None
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    state = hass.states.get(entity_id)
+    assert float(state.state) == MOCK_LSPU_INFO_RESPONSE["balance"]
+    skipped = coordinator.skipped_state_writes
+
+    freezer.tick(60)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get(entity_id).last_reported == state.last_reported
+    assert coordinator.skipped_state_writes > skipped
+
+    # A changed value is written
+    mock_api.async_get_lspu_info.return_value = {
+        **MOCK_LSPU_INFO_RESPONSE,
+        "balance": 99.0,
+    }
+    freezer.tick(60)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert float(hass.states.get(entity_id).state) == 99.0
+
+
+async def test_failed_refresh_written_as_unavailable(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test a failed refresh makes entities unavailable until the next good one."""
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = mock_config_entry.runtime_data
+    ent_reg = er.async_get(hass)
+    entity_id = ent_reg.async_get_entity_id(
+        "sensor",
+        DOMAIN,
+        f"{DOMAIN}_{make_account_device_id(MOCK_LSPU_INFO_RESPONSE['account'])}_balance",
+    )
+    assert entity_id is not None
+    assert float(hass.states.get(entity_id).state) == MOCK_LSPU_INFO_RESPONSE["balance"]
+
+    with patch.object(
+        coordinator, "_async_update_data", side_effect=UpdateFailed("API error")
+    ):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert not coordinator.last_update_success
+    assert hass.states.get(entity_id).state == "unavailable"
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.last_update_success
+    assert float(hass.states.get(entity_id).state) == MOCK_LSPU_INFO_RESPONSE["balance"]
@@ -1,21 +1,48 @@
 """Tests for the MyGas config flow."""
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiohttp
 import pytest
 from aiomygas.exceptions import MyGasApiError, MyGasAuthError
 from homeassistant.config_entries import SOURCE_USER
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
+from freezegun.api import FrozenDateTimeFactory
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.mygas.const import CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL, DOMAIN
-
-from .const import MOCK_PASSWORD, MOCK_USERNAME
+from custom_components.mygas.const import (
+    CONF_MONITORED_ACCOUNTS,
+    CONF_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    VALIDATED_LOGIN_TTL,
+)
+from custom_components.mygas.coordinator import (
+    MyGasValidatedLogin,
+    async_pop_validated_login,
+    async_store_validated_login,
+)
+
+from .const import MOCK_ACCOUNTS_RESPONSE, MOCK_PASSWORD, MOCK_USERNAME
 
 MOCK_VALIDATE_PATH = "custom_components.mygas.config_flow._async_validate_credentials"
+MOCK_TWO_ACCOUNTS_RESPONSE = {
+    "lspu": [
+        {"id": 12345, "account": "1234567890", "alias": "Дом"},
+        {"id": 67890, "account": "0987654321", "address": "ул. Садовая, д. 2"},
+    ]
+}
+
+
+def _connection_error(exc_type: type[MyGasApiError]) -> MyGasApiError:
+    """Make an aiomygas error caused by an unreachable API."""
+    exc = exc_type("request failed")
+    exc.__cause__ = aiohttp.ClientConnectionError()
+    return exc
 
 
 # ---------------------------------------------------------------------------
@@ -157,6 +184,181 @@ async def test_user_flow_already_configured(
     assert result["reason"] == "already_configured"
 
 
+@pytest.mark.parametrize(
+    ("selected", "options"),
+    [
+        (["67890"], {CONF_MONITORED_ACCOUNTS: ["67890"]}),
+        (["12345", "67890"], {}),
+    ],
+)
+async def test_user_flow_select_accounts(
+    hass: HomeAssistant,
+    mock_setup_entry: AsyncMock,
+    selected: list[str],
+    options: dict[str, list[str]],
+) -> None:
+    """Test the accounts to monitor are selected when the login has several."""
+    login = MyGasValidatedLogin(
+        MOCK_USERNAME, MOCK_PASSWORD, MagicMock(), MOCK_TWO_ACCOUNTS_RESPONSE
+    )
+    with patch(MOCK_VALIDATE_PATH, return_value=login):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": SOURCE_USER}
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            user_input={
+                CONF_USERNAME: MOCK_USERNAME,
+                CONF_PASSWORD: MOCK_PASSWORD,
+            },
+        )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "accounts"
+    selector = result["data_schema"].schema[CONF_MONITORED_ACCOUNTS]
+    assert selector.config["options"] == [
+        {"value": "12345", "label": "1234567890 (Дом)"},
+        {"value": "67890", "label": "0987654321 (ул. Садовая, д. 2)"},
+    ]
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={CONF_MONITORED_ACCOUNTS: []}
+    )
+    assert result["errors"] == {"base": "no_accounts_selected"}
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={CONF_MONITORED_ACCOUNTS: selected}
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["options"] == options
+
+
+@pytest.mark.parametrize(
+    ("side_effect", "calls", "error"),
+    [
+        (MyGasAuthError("wrong password"), 1, "invalid_auth"),
+        (MyGasApiError("bad response"), 1, "cannot_connect"),
+        ([TimeoutError(), TimeoutError()], 2, "timeout_connect"),
+        (
+            [_connection_error(MyGasAuthError), _connection_error(MyGasApiError)],
+            2,
+            "cannot_connect",
+        ),
+        (
+            [_connection_error(MyGasAuthError), _connection_error(MyGasAuthError)],
+            2,
+            "cannot_connect",
+        ),
+    ],
+)
+async def test_user_flow_validation_fails_fast(
+    hass: HomeAssistant,
+    mock_setup_entry: AsyncMock,
+    monkeypatch: pytest.MonkeyPatch,
+    side_effect: Exception | list[Exception],
+    calls: int,
+    error: str,
+) -> None:
+    """Test only connection errors are retried, once, with the time reported."""
+    monkeypatch.setattr(
+        "custom_components.mygas.decorators.VALIDATION_RETRY_DELAY", 0
+    )
+    with patch("custom_components.mygas.config_flow.MyGasApi") as mock_api:
+        mock_api.return_value.async_get_accounts = AsyncMock(side_effect=side_effect)
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": SOURCE_USER}
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            user_input={
+                CONF_USERNAME: MOCK_USERNAME,
+                CONF_PASSWORD: MOCK_PASSWORD,
+            },
+        )
+
+    assert mock_api.return_value.async_get_accounts.await_count == calls
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": error}
+    assert result["description_placeholders"]["elapsed"] == "0"
+
+
+async def test_user_flow_retry_succeeds(
+    hass: HomeAssistant,
+    mock_setup_entry: AsyncMock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the login is created when the quick retry reaches the API."""
+    monkeypatch.setattr(
+        "custom_components.mygas.decorators.VALIDATION_RETRY_DELAY", 0
+    )
+    with patch("custom_components.mygas.config_flow.MyGasApi") as mock_api:
+        mock_api.return_value.async_get_accounts = AsyncMock(
+            side_effect=[TimeoutError(), MOCK_ACCOUNTS_RESPONSE]
+        )
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": SOURCE_USER}
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            user_input={
+                CONF_USERNAME: MOCK_USERNAME,
+                CONF_PASSWORD: MOCK_PASSWORD,
+            },
+        )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+
+
+async def test_validation_deadline(
+    hass: HomeAssistant,
+    mock_setup_entry: AsyncMock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a hanging API is given up after the overall deadline."""
+    monkeypatch.setattr(
+        "custom_components.mygas.decorators.VALIDATION_DEADLINE", 0.05
+    )
+    hang = asyncio.Event()
+    with patch("custom_components.mygas.config_flow.MyGasApi") as mock_api:
+        mock_api.return_value.async_get_accounts = AsyncMock(side_effect=hang.wait)
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": SOURCE_USER}
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            user_input={
+                CONF_USERNAME: MOCK_USERNAME,
+                CONF_PASSWORD: MOCK_PASSWORD,
+            },
+        )
+
+    assert mock_api.return_value.async_get_accounts.await_count == 1
+    assert result["errors"] == {"base": "timeout_connect"}
+
+
+
+async def test_validated_login_handoff(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test a validated login is handed over once, for the same password only."""
+    login = MyGasValidatedLogin(
+        MOCK_USERNAME, MOCK_PASSWORD, MagicMock(), MOCK_ACCOUNTS_RESPONSE
+    )
+
+    async_store_validated_login(hass, login)
+    assert async_pop_validated_login(hass, MOCK_USERNAME, "other") is None
+    assert async_pop_validated_login(hass, MOCK_USERNAME, MOCK_PASSWORD) is None
+
+    async_store_validated_login(hass, login)
+    handed = async_pop_validated_login(hass, MOCK_USERNAME, MOCK_PASSWORD)
+    assert handed is not None
+    assert handed.accounts == MOCK_ACCOUNTS_RESPONSE
+    assert async_pop_validated_login(hass, MOCK_USERNAME, MOCK_PASSWORD) is None
+
+    async_store_validated_login(hass, login)
+    freezer.tick(VALIDATED_LOGIN_TTL + 1)
+    assert async_pop_validated_login(hass, MOCK_USERNAME, MOCK_PASSWORD) is None
+
 # ---------------------------------------------------------------------------
 # Reauth flow
 # ---------------------------------------------------------------------------
@@ -354,3 +556,34 @@ async def test_options_flow_set_scan_interval(
     assert result["type"] is FlowResultType.CREATE_ENTRY
     assert result["data"] == {CONF_SCAN_INTERVAL: 12}
     assert mock_config_entry.options[CONF_SCAN_INTERVAL] == 12
+
+
+async def test_options_flow_select_accounts(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_api: AsyncMock,
+    mock_auth: AsyncMock,
+) -> None:
+    """Test the options flow lists the accounts of the login."""
+    mock_api.async_get_accounts.return_value = MOCK_TWO_ACCOUNTS_RESPONSE
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    result = await hass.config_entries.options.async_init(
+        mock_config_entry.entry_id,
+    )
+    assert CONF_MONITORED_ACCOUNTS in result["data_schema"].schema
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_SCAN_INTERVAL: 12, CONF_MONITORED_ACCOUNTS: ["12345"]},
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert mock_config_entry.options == {
+        CONF_SCAN_INTERVAL: 12,
+        CONF_MONITORED_ACCOUNTS: ["12345"],
+    }
+    mock_api.async_get_lspu_info.assert_awaited_with(12345)
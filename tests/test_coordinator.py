@@ -1,16 +1,52 @@
 """Tests for the MyGas coordinator."""
 from __future__ import annotations
 
-from unittest.mock import AsyncMock
+import asyncio
+from datetime import timedelta
+import threading
+from unittest.mock import AsyncMock, patch
 
+from aiohttp import ClientError
 from aiomygas.exceptions import MyGasApiError, MyGasAuthError
+from freezegun.api import FrozenDateTimeFactory
+import pytest
 from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_DEVICE_ID, CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.update_coordinator import UpdateFailed
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
-from custom_components.mygas.const import CONF_INFO
+from custom_components.mygas.const import (
+    ACCOUNT_RETRY_DELAY,
+    API_MAX_TRIES,
+    CONF_ACCOUNTS_INTERVAL,
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_RESET_TIMEOUT,
+    CONF_INFO,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MONITORED_ACCOUNTS,
+    DOMAIN,
+    SERVICE_REFRESH,
+)
+from custom_components.mygas.coordinator import MyGasDeviceRef, build_model
+from custom_components.mygas.decorators import (
+    CircuitState,
+    MyGasCircuitOpenError,
+    async_get_circuit_breaker,
+)
+from custom_components.mygas.helpers import (
+    make_account_device_id,
+    make_device_id,
+    make_entity_unique_id,
+    make_service_device_id,
+)
+
+from .const import MOCK_LSPU_INFO_RESPONSE, MOCK_PASSWORD, MOCK_USERNAME
 
 
 # ---------------------------------------------------------------------------
@@ -88,3 +124,565 @@ async def test_coordinator_api_error(
     await hass.async_block_till_done()
 
     assert mock_config_entry.state is ConfigEntryState.SETUP_RETRY
+
+
+# ---------------------------------------------------------------------------
+# Concurrent account fetch
+# ---------------------------------------------------------------------------
+
+
+def _lspu_info(lspu_id: int) -> dict:
+    """Build an LSPU info payload for the given id."""
+    return {
+        **MOCK_LSPU_INFO_RESPONSE,
+        "account": f"ACC{lspu_id}",
+        "accountId": lspu_id,
+    }
+
+
+async def test_coordinator_concurrent_fetch_bounded(
+    hass: HomeAssistant,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test account details are fetched in parallel up to the configured limit."""
+    lspu_ids = list(range(1, 9))
+    in_flight = 0
+    max_in_flight = 0
+
+    async def _get_lspu_info(lspu_id: int) -> dict:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Finish in reverse order to make sure results are reassembled
+        await asyncio.sleep(0.001 * (len(lspu_ids) - lspu_id))
+        in_flight -= 1
+        return _lspu_info(lspu_id)
+
+    mock_api.async_get_accounts.return_value = {
+        "lspu": [{"id": lspu_id} for lspu_id in lspu_ids]
+    }
+    mock_api.async_get_lspu_info.side_effect = _get_lspu_info
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: MOCK_USERNAME, CONF_PASSWORD: MOCK_PASSWORD},
+        options={CONF_MAX_CONCURRENT_REQUESTS: 3},
+        unique_id=MOCK_USERNAME,
+    )
+    entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert max_in_flight == 3
+    info = entry.runtime_data.data[CONF_INFO]
+    assert list(info) == lspu_ids
+    assert [info[lspu_id][0]["accountId"] for lspu_id in lspu_ids] == lspu_ids
+
+
+async def test_coordinator_concurrent_fetch_isolates_failures(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test a failing account does not abort the others."""
+
+    async def _get_lspu_info(lspu_id: int) -> dict:
+        if lspu_id == 2:
+            raise MyGasApiError("API error")
+        return _lspu_info(lspu_id)
+
+    mock_api.async_get_accounts.return_value = {
+        "lspu": [{"id": 1}, {"id": 2}, {"id": 3}]
+    }
+    mock_api.async_get_lspu_info.side_effect = _get_lspu_info
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    assert list(mock_config_entry.runtime_data.data[CONF_INFO]) == [1, 3]
+
+
+async def test_coordinator_account_list_cadence(
+    hass: HomeAssistant,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the account list is fetched again only once its interval passed."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: MOCK_USERNAME, CONF_PASSWORD: MOCK_PASSWORD},
+        options={CONF_ACCOUNTS_INTERVAL: 2},
+        unique_id=MOCK_USERNAME,
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = entry.runtime_data
+    mock_api.async_get_accounts.reset_mock()
+    mock_api.async_get_lspu_info.reset_mock()
+
+    freezer.tick(timedelta(days=1))
+    await coordinator.async_refresh()
+    mock_api.async_get_accounts.assert_not_awaited()
+    mock_api.async_get_lspu_info.assert_awaited_once()
+
+    freezer.tick(timedelta(days=1))
+    await coordinator.async_refresh()
+    mock_api.async_get_accounts.assert_awaited_once()
+
+
+async def test_coordinator_skips_accounts_refreshed_alone(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test an account refreshed by the service waits for the next cadence."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data
+    await coordinator.async_refresh_account(12345)
+    mock_api.async_get_lspu_info.reset_mock()
+
+    await coordinator.async_refresh()
+    mock_api.async_get_lspu_info.assert_not_awaited()
+    assert 12345 in coordinator.get_accounts()
+
+    await coordinator.async_force_refresh()
+    mock_api.async_get_lspu_info.assert_awaited_once_with(12345)
+
+
+async def test_coordinator_skips_unmonitored_accounts(
+    hass: HomeAssistant,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test accounts not selected in the options are neither fetched nor shown."""
+    mock_api.async_get_accounts.return_value = {
+        "lspu": [{"id": 1}, {"id": 2}, {"id": 3}]
+    }
+    mock_api.async_get_lspu_info.side_effect = _lspu_info
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: MOCK_USERNAME, CONF_PASSWORD: MOCK_PASSWORD},
+        options={CONF_MONITORED_ACCOUNTS: ["1", "3"]},
+        unique_id=MOCK_USERNAME,
+    )
+    entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert [call.args for call in mock_api.async_get_lspu_info.await_args_list] == [
+        (1,),
+        (3,),
+    ]
+    assert list(entry.runtime_data.data[CONF_INFO]) == [1, 3]
+    device_registry = dr.async_get(hass)
+    assert device_registry.async_get_device(
+        identifiers={(DOMAIN, make_account_device_id("ACC1"))}
+    )
+    assert not device_registry.async_get_device(
+        identifiers={(DOMAIN, make_account_device_id("ACC2"))}
+    )
+
+
+async def test_coordinator_keeps_last_good_account_data(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test a failed account keeps its last good data and is retried alone."""
+    balances = {1: 10.0, 2: 20.0}
+    failing: set[int] = set()
+
+    async def _get_lspu_info(lspu_id: int) -> dict:
+        if lspu_id in failing:
+            raise MyGasApiError("API error")
+        return {**_lspu_info(lspu_id), "balance": balances[lspu_id]}
+
+    mock_api.async_get_accounts.return_value = {"lspu": [{"id": 1}, {"id": 2}]}
+    mock_api.async_get_lspu_info.side_effect = _get_lspu_info
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = mock_config_entry.runtime_data
+    last_update_time = coordinator.get_last_update_time(2)
+    balances.update({1: 11.0, 2: 21.0})
+    failing.add(2)
+    freezer.tick(60)
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.last_update_success
+    assert list(coordinator.data[CONF_INFO]) == [1, 2]
+    assert coordinator.get_account(1, 0).balance == 11.0
+    assert coordinator.get_account(2, 0).balance == 20.0
+    assert coordinator.get_last_update_time(2) == last_update_time
+    stale = coordinator.stale_accounts[2]
+    assert stale.error_count == 1
+    assert 1 not in coordinator.stale_accounts
+
+    # The retry of the stale account fails again and backs off
+    mock_api.async_get_lspu_info.reset_mock()
+    freezer.tick(ACCOUNT_RETRY_DELAY)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    mock_api.async_get_lspu_info.assert_awaited_with(2)
+    assert coordinator.stale_accounts[2].error_count == 2
+    assert coordinator.stale_accounts[2].since == stale.since
+
+    # The next retry succeeds
+    failing.clear()
+    mock_api.async_get_accounts.reset_mock()
+    mock_api.async_get_lspu_info.reset_mock()
+    freezer.tick(ACCOUNT_RETRY_DELAY * 2)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    mock_api.async_get_lspu_info.assert_awaited_once_with(2)
+    mock_api.async_get_accounts.assert_not_awaited()
+    assert coordinator.stale_accounts == {}
+    assert coordinator.get_account(2, 0).balance == 21.0
+
+
+async def test_coordinator_concurrent_fetch_all_failed(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test refresh fails when every account fetch failed."""
+    mock_api.async_get_lspu_info.side_effect = MyGasApiError("API error")
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.SETUP_RETRY
+
+
+async def test_coordinator_concurrent_fetch_auth_error(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test an auth error from a single account fails the refresh."""
+
+    async def _get_lspu_info(lspu_id: int) -> dict:
+        if lspu_id == 2:
+            raise MyGasAuthError("Auth failed")
+        return _lspu_info(lspu_id)
+
+    mock_api.async_get_accounts.return_value = {"lspu": [{"id": 1}, {"id": 2}]}
+    mock_api.async_get_lspu_info.side_effect = _get_lspu_info
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.SETUP_ERROR
+
+
+# ---------------------------------------------------------------------------
+# Device index
+# ---------------------------------------------------------------------------
+
+
+async def test_coordinator_device_index(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test device lookups are answered from the index built on refresh."""
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = mock_config_entry.runtime_data
+    device_registry = dr.async_get(hass)
+    account_number = MOCK_LSPU_INFO_RESPONSE["account"]
+    counter_device = device_registry.async_get_device(
+        identifiers={(DOMAIN, make_device_id(account_number, "abc-def-123"))}
+    )
+    service_device = device_registry.async_get_device(
+        identifiers={(DOMAIN, make_service_device_id(account_number, "04"))}
+    )
+    assert counter_device is not None
+    assert service_device is not None
+
+    with patch(
+        "custom_components.mygas.models.make_device_id",
+        side_effect=AssertionError("identifiers must not be rebuilt"),
+    ):
+        assert await coordinator.find_account_by_device_id(counter_device.id) == (
+            12345,
+            0,
+            0,
+        )
+        assert coordinator.get_device_ref(service_device.id) == MyGasDeviceRef(
+            12345, 0, service_id=1
+        )
+
+    assert coordinator.device_identifiers == {
+        make_account_device_id(account_number),
+        make_device_id(account_number, "abc-def-123"),
+        make_service_device_id(account_number, "02"),
+        make_service_device_id(account_number, "04"),
+        make_service_device_id(account_number, "61"),
+    }
+
+
+async def test_coordinator_device_index_unknown_device(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test lookups of devices missing from the data."""
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = mock_config_entry.runtime_data
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=mock_config_entry.entry_id,
+        identifiers={(DOMAIN, "unknown_account")},
+    )
+
+    assert await coordinator.find_account_by_device_id(device.id) == (
+        None,
+        None,
+        None,
+    )
+    with pytest.raises(HomeAssistantError):
+        coordinator.get_device_ref("missing")
+
+
+async def test_coordinator_builds_large_model_in_executor(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the model of a large payload is built off the event loop."""
+    threads: list[str] = []
+
+    def _build_model(data):  # type: ignore[no-untyped-def]
+        threads.append(threading.current_thread().name)
+        return build_model(data)
+
+    mock_config_entry.add_to_hass(hass)
+    with (
+        patch("custom_components.mygas.coordinator.EXECUTOR_MODEL_THRESHOLD", 2),
+        patch("custom_components.mygas.coordinator.build_model", _build_model),
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    coordinator = mock_config_entry.runtime_data
+    assert len(threads) == 1
+    assert threads[0] != threading.current_thread().name
+    assert set(coordinator.accounts) == {12345}
+    assert make_account_device_id("1234567890") in coordinator.device_identifiers
+
+
+# ---------------------------------------------------------------------------
+# Targeted refresh
+# ---------------------------------------------------------------------------
+
+
+async def test_refresh_service_targets_single_account(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the refresh service re-fetches only the account of the device."""
+    balances = {1: 10.0, 2: 20.0}
+
+    async def _get_lspu_info(lspu_id: int) -> dict:
+        return {**_lspu_info(lspu_id), "balance": balances[lspu_id]}
+
+    mock_api.async_get_accounts.return_value = {"lspu": [{"id": 1}, {"id": 2}]}
+    mock_api.async_get_lspu_info.side_effect = _get_lspu_info
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = mock_config_entry.runtime_data
+    ent_reg = er.async_get(hass)
+    balance_entities = {
+        lspu_id: ent_reg.async_get_entity_id(
+            "sensor",
+            DOMAIN,
+            make_entity_unique_id(make_account_device_id(f"ACC{lspu_id}"), "balance"),
+        )
+        for lspu_id in balances
+    }
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, make_account_device_id("ACC2"))}
+    )
+    assert device is not None
+
+    balances.update({1: 11.0, 2: 21.0})
+    mock_api.async_get_accounts.reset_mock()
+    mock_api.async_get_lspu_info.reset_mock()
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_REFRESH, {ATTR_DEVICE_ID: device.id}, blocking=True
+    )
+    await hass.async_block_till_done()
+
+    mock_api.async_get_accounts.assert_not_awaited()
+    mock_api.async_get_lspu_info.assert_awaited_once_with(2)
+    assert coordinator.get_account(2, 0).balance == 21.0
+    assert coordinator.get_account(1, 0).balance == 10.0
+    assert float(hass.states.get(balance_entities[2]).state) == 21.0
+    assert float(hass.states.get(balance_entities[1]).state) == 10.0
+
+
+# ---------------------------------------------------------------------------
+# Circuit breaker
+# ---------------------------------------------------------------------------
+
+
+async def test_circuit_breaker_fails_fast_during_outage(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the API is not called while the circuit is open."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = mock_config_entry.runtime_data
+    breaker = async_get_circuit_breaker(hass)
+
+    async def _outage(lspu_id: int) -> dict:
+        raise MyGasApiError("HTTP request failed") from ClientError()
+
+    mock_api.async_get_lspu_info.reset_mock()
+    mock_api.async_get_lspu_info.side_effect = _outage
+    with patch("custom_components.mygas.decorators.randrange", return_value=0):
+        await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    assert mock_api.async_get_lspu_info.await_count == API_MAX_TRIES
+    assert breaker.state is CircuitState.OPEN
+
+    mock_api.async_get_lspu_info.reset_mock()
+    await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    mock_api.async_get_lspu_info.assert_not_awaited()
+    assert breaker.rejected_requests == 1
+
+    # After the reset timeout a single probe closes the circuit again
+    mock_api.async_get_lspu_info.side_effect = None
+    freezer.tick(CIRCUIT_BREAKER_RESET_TIMEOUT)
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    mock_api.async_get_lspu_info.assert_awaited_once()
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.consecutive_failures == 0
+
+
+async def test_circuit_breaker_half_open_single_probe(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test only one probe request passes while the circuit is half-open."""
+    breaker = async_get_circuit_breaker(hass)
+    for _ in range(CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+        breaker.before_request()
+        breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+
+    with pytest.raises(MyGasCircuitOpenError):
+        breaker.before_request()
+
+    freezer.tick(CIRCUIT_BREAKER_RESET_TIMEOUT)
+    breaker.before_request()
+    assert breaker.state is CircuitState.HALF_OPEN
+    with pytest.raises(MyGasCircuitOpenError):
+        breaker.before_request()
+
+    # A failed probe opens the circuit again
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(MyGasCircuitOpenError):
+        breaker.before_request()
+
+
+async def test_circuit_breaker_ignores_api_answers(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test errors returned by the API itself do not open the circuit."""
+    mock_api.async_get_lspu_info.side_effect = MyGasApiError("API error")
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.SETUP_RETRY
+    assert async_get_circuit_breaker(hass).state is CircuitState.CLOSED
+
+
+async def test_circuit_breaker_token_request_outage(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test a token request that did not reach the API opens the circuit."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = mock_config_entry.runtime_data
+    breaker = async_get_circuit_breaker(hass)
+
+    async def _token_outage(lspu_id: int) -> dict:
+        raise MyGasAuthError("HTTP request failed") from ClientError()
+
+    mock_api.async_get_lspu_info.side_effect = _token_outage
+    for _ in range(CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+        await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    assert breaker.state is CircuitState.OPEN
+
+    # Rejected credentials mean the API answered
+    breaker.record_success()
+    mock_api.async_get_lspu_info.side_effect = MyGasAuthError("Auth failed")
+    for _ in range(CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+        await coordinator.async_refresh()
+
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.consecutive_failures == 0
@@ -0,0 +1,154 @@
+"""Tests for MyGas diagnostics."""
+from __future__ import annotations
+
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mygas import diagnostics
+from custom_components.mygas.const import (
+    CONF_FULL_DIAGNOSTICS,
+    DIAGNOSTICS_HISTORY_LENGTH,
+    DIAGNOSTICS_SUMMARY_THRESHOLD,
+    DOMAIN,
+)
+from custom_components.mygas.diagnostics import async_get_config_entry_diagnostics
+from custom_components.mygas.models import count_payload_entries
+
+from .const import MOCK_LSPU_INFO_RESPONSE, MOCK_PASSWORD, MOCK_USERNAME
+
+LONG_HISTORY = [
+    {"date": f"2025-{month:02d}-15T00:00:00", "valueDay": 1000.0 + month, "rate": 5}
+    for month in range(12, 0, -1)
+]
+
+
+async def _async_setup(
+    hass: HomeAssistant, options: dict | None = None
+) -> MockConfigEntry:
+    """Set up an entry with a long readings history."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: MOCK_USERNAME, CONF_PASSWORD: MOCK_PASSWORD},
+        options=options or {},
+        unique_id=MOCK_USERNAME,
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def _async_diagnostics(
+    hass: HomeAssistant, options: dict | None = None
+) -> dict:
+    """Set up an entry with a long readings history and get its diagnostics."""
+    entry = await _async_setup(hass, options)
+    return await async_get_config_entry_diagnostics(hass, entry)
+
+
+@pytest.fixture
+def long_history(mock_api: AsyncMock) -> None:
+    """Return a counter with a year of readings."""
+    counter = {**MOCK_LSPU_INFO_RESPONSE["counters"][0], "values": LONG_HISTORY}
+    mock_api.async_get_lspu_info.return_value = {
+        **MOCK_LSPU_INFO_RESPONSE,
+        "counters": [counter],
+    }
+
+
+@pytest.mark.usefixtures("mock_auth", "long_history")
+async def test_small_login_full_data(hass: HomeAssistant) -> None:
+    """Test a login under the threshold gets the full redacted data."""
+    result = await _async_diagnostics(hass)
+
+    data = result["coordinator"]["data"]
+    assert "summary" not in data
+    assert data["info"][12345][0]["counters"][0]["values"] == LONG_HISTORY
+
+
+@pytest.mark.usefixtures("mock_auth", "long_history")
+@pytest.mark.parametrize(("margin", "summary"), [(0, False), (-1, True)])
+async def test_summary_threshold(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+    margin: int,
+    summary: bool,
+) -> None:
+    """Test the summary starts once the payload entries exceed the threshold."""
+    entry = await _async_setup(hass)
+    entries = count_payload_entries(entry.runtime_data.data)
+    monkeypatch.setattr(
+        diagnostics, "DIAGNOSTICS_SUMMARY_THRESHOLD", entries + margin
+    )
+
+    result = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert ("summary" in result["coordinator"]["data"]) is summary
+
+
+@pytest.mark.usefixtures("mock_auth")
+async def test_single_account_long_history_summary(
+    hass: HomeAssistant, mock_api: AsyncMock
+) -> None:
+    """Test a single account with a huge history is summarized."""
+    history = LONG_HISTORY * (DIAGNOSTICS_SUMMARY_THRESHOLD // len(LONG_HISTORY) + 1)
+    counter = {**MOCK_LSPU_INFO_RESPONSE["counters"][0], "values": history}
+    mock_api.async_get_lspu_info.return_value = {
+        **MOCK_LSPU_INFO_RESPONSE,
+        "counters": [counter],
+    }
+
+    result = await _async_diagnostics(hass)
+
+    data = result["coordinator"]["data"]
+    assert data["summary"] is True
+    counter_summary = data["info"][12345][0]["counters"][0]
+    assert counter_summary["values"] == len(history)
+    assert len(counter_summary["history"]) == DIAGNOSTICS_HISTORY_LENGTH
+
+
+@pytest.mark.usefixtures("mock_auth", "long_history")
+async def test_large_login_summary(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a login over the threshold gets a summary with truncated histories."""
+    monkeypatch.setattr(diagnostics, "DIAGNOSTICS_SUMMARY_THRESHOLD", 0)
+
+    result = await _async_diagnostics(hass)
+
+    data = result["coordinator"]["data"]
+    assert data["summary"] is True
+    assert data["is_els"] is False
+    assert data["accounts"] == {"lspu": 1}
+    account = data["info"][12345][0]
+    assert "counters" in account["keys"]
+    assert account["balance"] == 150.50
+    assert account["latest_balance"] == {
+        "date": "2026-01-31",
+        "charged": 850.0,
+        "paid": 750.0,
+        "balance_end": 100.0,
+    }
+    assert account["services"] == 3
+    counter = account["counters"][0]
+    assert counter["readings"] == 1012.0
+    assert counter["values"] == len(LONG_HISTORY)
+    assert counter["history"] == LONG_HISTORY[:DIAGNOSTICS_HISTORY_LENGTH]
+
+
+@pytest.mark.usefixtures("mock_auth", "long_history")
+async def test_full_data_on_request(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the full dump is returned when enabled in the options."""
+    monkeypatch.setattr(diagnostics, "DIAGNOSTICS_SUMMARY_THRESHOLD", 0)
+
+    result = await _async_diagnostics(hass, {CONF_FULL_DIAGNOSTICS: True})
+
+    data = result["coordinator"]["data"]
+    assert "summary" not in data
+    assert data["info"][12345][0]["counters"][0]["values"] == LONG_HISTORY
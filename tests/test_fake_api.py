@@ -0,0 +1,169 @@
+"""Tests against the local MyGas API stand-in."""
+from __future__ import annotations
+
+from homeassistant.config_entries import SOURCE_USER, ConfigEntryState
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers import device_registry as dr
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mygas.const import (
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DOMAIN,
+)
+from custom_components.mygas.decorators import CircuitState, async_get_circuit_breaker
+from custom_components.mygas.helpers import make_device_id
+
+from .benchmarks.payloads import BenchmarkProfile, make_els_info, make_lspu_info
+from .const import MOCK_PASSWORD, MOCK_USERNAME
+from .fake_server import FakeMyGasServer, uniform_latency
+
+PROFILE = BenchmarkProfile("load", accounts=200, counters=1, services=3, history=12)
+
+
+async def _setup(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Set up the config entry."""
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_load_hundreds_of_accounts(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_mygas_api: FakeMyGasServer,
+) -> None:
+    """Test a login with hundreds of accounts over the real HTTP path."""
+    for lspu_id in range(1, PROFILE.accounts + 1):
+        fake_mygas_api.add_lspu_account(make_lspu_info(lspu_id, PROFILE))
+    fake_mygas_api.behavior.latency = uniform_latency(0.001, 0.005)
+
+    await _setup(hass, mock_config_entry)
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    coordinator = mock_config_entry.runtime_data
+    assert len(coordinator.accounts) == PROFILE.accounts
+    stats = fake_mygas_api.stats
+    assert stats.requests["signInN3"] == 1
+    assert stats.requests["accountsN"] == 1
+    assert stats.requests["lspuInfo"] == PROFILE.accounts
+    assert stats.max_in_flight <= DEFAULT_MAX_CONCURRENT_REQUESTS
+
+
+async def test_els_account_and_readings(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_mygas_api: FakeMyGasServer,
+) -> None:
+    """Test ELS accounts and sending readings through the stand-in."""
+    profile = BenchmarkProfile(
+        "els", accounts=1, counters=1, services=1, history=3, els=True
+    )
+    fake_mygas_api.add_els_account(make_els_info(7, profile))
+
+    await _setup(hass, mock_config_entry)
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    coordinator = mock_config_entry.runtime_data
+    assert coordinator.is_els()
+    account = coordinator.get_account(7, 0)
+    counter_identifier = make_device_id("ELS0000007", account.counters[0].uuid)
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, counter_identifier)}
+    )
+    assert device is not None
+
+    result = await coordinator.async_send_readings(device.id, 1234.5)
+
+    assert result[0]["counters"][0]["sent"] is True
+    assert fake_mygas_api.readings == [
+        {
+            "lspuId": account.lspu_id,
+            "uuid": account.counters[0].uuid,
+            "valueDay": 1234.5,
+        }
+    ]
+
+
+async def test_server_errors_open_circuit(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_mygas_api: FakeMyGasServer,
+) -> None:
+    """Test HTTP errors are retried and then open the circuit."""
+    fake_mygas_api.add_lspu_account(make_lspu_info(1, PROFILE))
+    await _setup(hass, mock_config_entry)
+    coordinator = mock_config_entry.runtime_data
+
+    fake_mygas_api.behavior.error_rate = 1.0
+    await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    assert fake_mygas_api.stats.errors == CIRCUIT_BREAKER_FAILURE_THRESHOLD
+    assert async_get_circuit_breaker(hass).state is CircuitState.OPEN
+
+    requests = sum(fake_mygas_api.stats.requests.values())
+    await coordinator.async_refresh()
+
+    assert sum(fake_mygas_api.stats.requests.values()) == requests
+
+
+async def test_rate_limited_requests_fail(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_mygas_api: FakeMyGasServer,
+) -> None:
+    """Test requests over the rate limit are rejected with HTTP 429."""
+    for lspu_id in (1, 2):
+        fake_mygas_api.add_lspu_account(make_lspu_info(lspu_id, PROFILE))
+    fake_mygas_api.behavior.rate_limit = 3
+    fake_mygas_api.behavior.rate_limit_window = 60
+
+    await _setup(hass, mock_config_entry)
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    assert fake_mygas_api.stats.rate_limited > 0
+    assert len(mock_config_entry.runtime_data.accounts) == 1
+
+
+async def test_expired_token_fails_refresh(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_mygas_api: FakeMyGasServer,
+) -> None:
+    """Test a token expired by the server fails the refresh."""
+    fake_mygas_api.add_lspu_account(make_lspu_info(1, PROFILE))
+    await _setup(hass, mock_config_entry)
+    coordinator = mock_config_entry.runtime_data
+
+    fake_mygas_api.expire_tokens()
+    await coordinator.async_force_refresh()
+
+    assert not coordinator.last_update_success
+    assert fake_mygas_api.stats.unauthorized > 0
+    # The API answered, so this is not an outage
+    assert async_get_circuit_breaker(hass).state is CircuitState.CLOSED
+
+
+async def test_config_flow_login_reused_by_setup(
+    hass: HomeAssistant, fake_mygas_api: FakeMyGasServer
+) -> None:
+    """Test adding a login signs in and lists the accounts only once."""
+    fake_mygas_api.add_lspu_account(make_lspu_info(1, PROFILE))
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_USERNAME: MOCK_USERNAME, CONF_PASSWORD: MOCK_PASSWORD},
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["result"].state is ConfigEntryState.LOADED
+    assert fake_mygas_api.stats.requests["signInN3"] == 1
+    assert fake_mygas_api.stats.requests["accountsN"] == 1
+    assert fake_mygas_api.stats.requests["lspuInfo"] == 1
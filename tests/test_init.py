@@ -1,11 +1,44 @@
 """Tests for the MyGas integration setup."""
 from __future__ import annotations
 
-from unittest.mock import AsyncMock
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from aiomygas.exceptions import MyGasApiError
 from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_PASSWORD
 from homeassistant.core import HomeAssistant
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.mygas.const import (
+    ATTR_ACCOUNTS_UPDATE_TIME,
+    ATTR_IS_ELS,
+    ATTR_LAST_UPDATE_TIME,
+    CONF_ACCOUNTS,
+    CONF_INFO,
+    CONF_LOOP_WATCHDOG,
+    CONF_MONITORED_ACCOUNTS,
+    CONF_SCAN_INTERVAL,
+    DOMAIN,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from custom_components.mygas.coordinator import MyGasValidatedLogin
+from custom_components.mygas.helpers import (
+    make_account_device_id,
+    make_entity_unique_id,
+)
+
+from .const import MOCK_ACCOUNTS_RESPONSE, MOCK_LSPU_INFO_RESPONSE, MOCK_USERNAME
+
+MOCK_VALIDATE_PATH = "custom_components.mygas.config_flow._async_validate_credentials"
 
 
 # ---------------------------------------------------------------------------
@@ -47,6 +80,51 @@ async def test_unload_entry(
     assert mock_config_entry.state is ConfigEntryState.NOT_LOADED
 
 
+async def test_options_applied_without_reload(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test options that keep the entities are applied to the running entry."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data
+    mock_api.async_get_accounts.reset_mock()
+    mock_api.async_get_lspu_info.reset_mock()
+
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        options={CONF_SCAN_INTERVAL: 1, CONF_LOOP_WATCHDOG: True},
+    )
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.runtime_data is coordinator
+    assert coordinator.watchdog.enabled is True
+    assert coordinator.update_interval <= timedelta(hours=1.5)
+    mock_api.async_get_accounts.assert_not_awaited()
+    mock_api.async_get_lspu_info.assert_not_awaited()
+
+    # The refresh follows the new interval
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(hours=1.5))
+    await hass.async_block_till_done()
+    mock_api.async_get_lspu_info.assert_awaited_once()
+
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        options={
+            CONF_SCAN_INTERVAL: 1,
+            CONF_LOOP_WATCHDOG: True,
+            CONF_MONITORED_ACCOUNTS: ["12345"],
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    assert mock_config_entry.runtime_data is not coordinator
+
+
 async def test_setup_entry_auth_failed(
     hass: HomeAssistant,
     mock_config_entry: MockConfigEntry,
@@ -132,3 +210,199 @@ async def test_stale_device_removal(
         identifiers={(DOMAIN, "1234567890_counter_abc_def_123")}
     )
     assert valid_device is not None
+
+
+# ---------------------------------------------------------------------------
+# Data snapshot
+# ---------------------------------------------------------------------------
+
+
+def _snapshot_key(entry: MockConfigEntry) -> str:
+    """Return the storage key of the entry data snapshot."""
+    return f"{DOMAIN}.{entry.entry_id}"
+
+
+def _balance_entity_id(hass: HomeAssistant) -> str | None:
+    """Return the entity id of the account balance sensor."""
+    unique_id = make_entity_unique_id(
+        make_account_device_id(MOCK_LSPU_INFO_RESPONSE["account"]), "balance"
+    )
+    return er.async_get(hass).async_get_entity_id("sensor", DOMAIN, unique_id)
+
+
+async def test_snapshot_saved_after_refresh(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the last good data is persisted after a successful refresh."""
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY + 1)
+    )
+    await hass.async_block_till_done()
+
+    snapshot = hass_storage[_snapshot_key(mock_config_entry)]["data"]
+    assert snapshot[CONF_ACCOUNTS] == MOCK_ACCOUNTS_RESPONSE
+    assert snapshot[ATTR_IS_ELS] is False
+    assert snapshot[CONF_INFO] == {"12345": [MOCK_LSPU_INFO_RESPONSE]}
+    assert snapshot[ATTR_LAST_UPDATE_TIME] is not None
+
+
+async def test_setup_entry_from_snapshot(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test setup restores the snapshot without waiting for the API."""
+    mock_config_entry.add_to_hass(hass)
+    hass_storage[_snapshot_key(mock_config_entry)] = {
+        "version": STORAGE_VERSION,
+        "key": _snapshot_key(mock_config_entry),
+        "data": {
+            ATTR_LAST_UPDATE_TIME: "2026-01-31T12:00:00+03:00",
+            CONF_ACCOUNTS: MOCK_ACCOUNTS_RESPONSE,
+            ATTR_IS_ELS: False,
+            CONF_INFO: {"12345": [MOCK_LSPU_INFO_RESPONSE]},
+        },
+    }
+    mock_api.async_get_lspu_info.side_effect = MyGasApiError("API error")
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    coordinator = mock_config_entry.runtime_data
+    assert list(coordinator.get_accounts()) == [12345]
+    assert coordinator.data[ATTR_LAST_UPDATE_TIME] == datetime.fromisoformat(
+        "2026-01-31T12:00:00+03:00"
+    )
+    # Background refresh was attempted and failed, restored data is kept
+    assert mock_api.async_get_lspu_info.await_count > 0
+    assert coordinator.last_update_success is False
+    assert _balance_entity_id(hass) is not None
+
+
+async def test_setup_entry_from_snapshot_state(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test entities come up with restored values before the refresh finishes."""
+    mock_config_entry.add_to_hass(hass)
+    hass_storage[_snapshot_key(mock_config_entry)] = {
+        "version": STORAGE_VERSION,
+        "key": _snapshot_key(mock_config_entry),
+        "data": {
+            ATTR_LAST_UPDATE_TIME: "2026-01-31T12:00:00+03:00",
+            CONF_ACCOUNTS: MOCK_ACCOUNTS_RESPONSE,
+            ATTR_IS_ELS: False,
+            CONF_INFO: {"12345": [{**MOCK_LSPU_INFO_RESPONSE, "balance": 42.0}]},
+        },
+    }
+    refresh_started = asyncio.Event()
+    release_refresh = asyncio.Event()
+
+    async def _get_lspu_info(lspu_id: int) -> dict[str, Any]:
+        refresh_started.set()
+        await release_refresh.wait()
+        return MOCK_LSPU_INFO_RESPONSE
+
+    mock_api.async_get_lspu_info.side_effect = _get_lspu_info
+
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await refresh_started.wait()
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    state = hass.states.get(_balance_entity_id(hass))
+    assert state is not None
+    assert float(state.state) == 42.0
+
+    release_refresh.set()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    state = hass.states.get(_balance_entity_id(hass))
+    assert float(state.state) == MOCK_LSPU_INFO_RESPONSE["balance"]
+
+
+async def test_reauth_handoff_newer_than_snapshot(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the accounts validated by reauth replace older snapshot accounts."""
+    mock_config_entry.add_to_hass(hass)
+    hass_storage[_snapshot_key(mock_config_entry)] = {
+        "version": STORAGE_VERSION,
+        "key": _snapshot_key(mock_config_entry),
+        "data": {
+            ATTR_LAST_UPDATE_TIME: "2026-01-31T12:00:00+03:00",
+            CONF_ACCOUNTS: MOCK_ACCOUNTS_RESPONSE,
+            ATTR_ACCOUNTS_UPDATE_TIME: "2026-01-31T12:00:00+03:00",
+            ATTR_IS_ELS: False,
+            CONF_INFO: {"12345": [MOCK_LSPU_INFO_RESPONSE]},
+        },
+    }
+    # The refresh fails, so the snapshot keeps its old accounts
+    mock_api.async_get_lspu_info.side_effect = MyGasApiError("API error")
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    accounts = {"lspu": [{"id": 12345, "name": "Петров Петр Петрович"}]}
+    login = MyGasValidatedLogin(
+        MOCK_USERNAME, "new_password", MagicMock(), accounts
+    )
+    mock_api.async_get_accounts.reset_mock()
+    result = await mock_config_entry.start_reauth_flow(hass)
+    with patch(MOCK_VALIDATE_PATH, return_value=login):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], user_input={CONF_PASSWORD: "new_password"}
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert result["reason"] == "reauth_successful"
+    coordinator = mock_config_entry.runtime_data
+    assert coordinator.data[CONF_ACCOUNTS] == accounts
+    assert coordinator.data[ATTR_ACCOUNTS_UPDATE_TIME] > datetime.fromisoformat(
+        "2026-01-31T12:00:00+03:00"
+    )
+    assert coordinator.data[ATTR_LAST_UPDATE_TIME] == datetime.fromisoformat(
+        "2026-01-31T12:00:00+03:00"
+    )
+    # The fresh accounts are not fetched again by the background refresh
+    mock_api.async_get_accounts.assert_not_awaited()
+
+
+async def test_remove_entry_removes_snapshot(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the snapshot is deleted together with the config entry."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY + 1)
+    )
+    await hass.async_block_till_done()
+    assert _snapshot_key(mock_config_entry) in hass_storage
+
+    await hass.config_entries.async_remove(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert _snapshot_key(mock_config_entry) not in hass_storage
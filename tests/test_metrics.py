@@ -0,0 +1,222 @@
+"""Tests for the MyGas API metrics."""
+from __future__ import annotations
+
+import logging
+from unittest.mock import AsyncMock
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mygas.const import DOMAIN, METRICS_WINDOW
+from custom_components.mygas.diagnostics import async_get_config_entry_diagnostics
+from custom_components.mygas.helpers import (
+    make_account_device_id,
+    make_entity_unique_id,
+)
+from custom_components.mygas.metrics import MyGasApiMetrics, RefreshReason
+
+from .benchmarks.payloads import BenchmarkProfile, make_lspu_info
+from .const import MOCK_LSPU_INFO_RESPONSE
+from .fake_server import FakeMyGasServer
+
+
+def test_latency_percentiles() -> None:
+    """Test latency percentiles per endpoint and overall."""
+    metrics = MyGasApiMetrics()
+    for latency in (0.1, 0.2, 0.3, 0.4, 2.0):
+        metrics.record("get_lspu_info", latency, retries=0, timeouts=0)
+    metrics.record("get_accounts", 0.05, retries=2, timeouts=1)
+
+    assert metrics.latency_percentile(50, "get_lspu_info") == 300.0
+    assert metrics.latency_percentile(95, "get_lspu_info") == 2000.0
+    assert metrics.latency_percentile(50) == 200.0
+    assert metrics.latency_percentile(50, "get_receipt") is None
+    assert metrics.retries() == 2
+    assert metrics.retry_attributes() == {
+        "get_accounts_retries": 2,
+        "get_accounts_timeouts": 1,
+        "get_lspu_info_retries": 0,
+        "get_lspu_info_timeouts": 0,
+    }
+    histogram = metrics.as_dict()["endpoints"]["get_lspu_info"]["latency_histogram"]
+    assert histogram["<=0.25s"] == 2
+    assert histogram["<=0.5s"] == 2
+    assert histogram["<=2s"] == 1
+
+
+def test_metrics_window(freezer: FrozenDateTimeFactory) -> None:
+    """Test samples older than the window are dropped."""
+    metrics = MyGasApiMetrics()
+    metrics.record("get_accounts", 1.0, retries=1, timeouts=1)
+    freezer.tick(METRICS_WINDOW - 1)
+    metrics.record("get_accounts", 1.0, retries=1, timeouts=0)
+    assert metrics.retries() == 2
+
+    freezer.tick(2)
+
+    assert metrics.retries() == 1
+    assert metrics.timeouts() == 0
+    assert metrics.as_dict()["endpoints"]["get_accounts"]["total_requests"] == 2
+
+
+async def test_request_metrics_recorded(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the request handler records retries and timeouts."""
+    mock_api.async_get_lspu_info.side_effect = [
+        TimeoutError,
+        MOCK_LSPU_INFO_RESPONSE,
+    ]
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    metrics = mock_config_entry.runtime_data.metrics
+    lspu = metrics.as_dict()["endpoints"]["get_lspu_info"]
+    assert lspu["requests"] == 1
+    assert lspu["retries"] == 1
+    assert lspu["timeouts"] == 1
+    assert lspu["failed"] == 0
+    assert metrics.as_dict()["endpoints"]["get_accounts"]["retries"] == 0
+    assert metrics.last_refresh_duration is not None
+
+    ent_reg = er.async_get(hass)
+    device_identifier = make_account_device_id("1234567890")
+    for key in (
+        "api_latency_p50",
+        "api_latency_p95",
+        "last_refresh_duration",
+        "api_retries",
+    ):
+        entity_id = ent_reg.async_get_entity_id(
+            "sensor", DOMAIN, make_entity_unique_id(device_identifier, key)
+        )
+        assert entity_id is not None
+        entry = ent_reg.async_get(entity_id)
+        assert entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+
+
+async def test_payload_size_recorded(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_mygas_api: FakeMyGasServer,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test response bodies are measured without debug logging."""
+    caplog.set_level(logging.INFO, logger="custom_components.mygas")
+    fake_mygas_api.add_lspu_account(
+        make_lspu_info(1, BenchmarkProfile("small", 1, 1, 1, 3))
+    )
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    metrics = mock_config_entry.runtime_data.metrics
+    assert metrics.as_dict()["endpoints"]["get_lspu_info"]["payload_size_max"] > 0
+    assert not mock_config_entry.runtime_data.trace.records
+
+
+async def test_refresh_bytes_received(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_mygas_api: FakeMyGasServer,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the refresh history counts the bytes received at INFO level."""
+    caplog.set_level(logging.INFO, logger="custom_components.mygas")
+    for lspu_id in (1, 2):
+        fake_mygas_api.add_lspu_account(
+            make_lspu_info(lspu_id, BenchmarkProfile("small", 2, 1, 1, 3))
+        )
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data
+
+    await coordinator.async_refresh_account(1)
+
+    first, service = coordinator.metrics.refresh_history
+    assert first.bytes_received > service.bytes_received > 0
+
+
+async def test_refresh_history(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test every refresh leaves a timing breakdown in the diagnostics."""
+    mock_api.async_get_lspu_info.side_effect = [
+        TimeoutError,
+        MOCK_LSPU_INFO_RESPONSE,
+        MOCK_LSPU_INFO_RESPONSE,
+        {**MOCK_LSPU_INFO_RESPONSE, "balance": 99.0},
+    ]
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data
+
+    await coordinator.async_force_refresh()
+    await coordinator.async_refresh_account(12345)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+    first, forced, service = diagnostics["coordinator"]["refresh_history"]
+    assert first["reason"] == RefreshReason.SCHEDULED
+    assert first["success"] is True
+    assert first["duration"] >= 0
+    assert list(first["account_durations"]) == [12345]
+    assert first["requests"] == 2
+    assert first["retries"] == 1
+    assert first["timeouts"] == 1
+    assert forced["reason"] == RefreshReason.FORCED
+    assert forced["retries"] == 0
+    # Same data as before, only the last update time changed
+    assert forced["state_changes"] == 1
+    assert service["reason"] == RefreshReason.SERVICE
+    assert service["requests"] == 1
+    assert list(service["account_durations"]) == [12345]
+    assert service["state_changes"] > 0
+
+
+async def test_metrics_sensors_once_per_login(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the login metrics sensors are created on the first account only."""
+    mock_api.async_get_accounts.return_value = {"lspu": [{"id": 1}, {"id": 2}]}
+    mock_api.async_get_lspu_info.side_effect = lambda lspu_id: {
+        **MOCK_LSPU_INFO_RESPONSE,
+        "account": f"ACC{lspu_id}",
+        "accountId": lspu_id,
+    }
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    ent_reg = er.async_get(hass)
+    entries = er.async_entries_for_config_entry(ent_reg, mock_config_entry.entry_id)
+    for key in (
+        "api_latency_p50",
+        "api_latency_p95",
+        "last_refresh_duration",
+        "api_retries",
+    ):
+        assert [
+            entry.unique_id for entry in entries if entry.unique_id.endswith(key)
+        ] == [make_entity_unique_id(make_account_device_id("ACC1"), key)]
+    # Account sensors are still created for both accounts
+    unique_ids = {entry.unique_id for entry in entries}
+    for account in ("ACC1", "ACC2"):
+        assert (
+            make_entity_unique_id(make_account_device_id(account), "balance")
+            in unique_ids
+        )
@@ -0,0 +1,111 @@
+"""Tests for the MyGas account model."""
+from __future__ import annotations
+
+from datetime import date
+
+from custom_components.mygas.const import ATTR_IS_ELS, CONF_INFO
+from custom_components.mygas.helpers import (
+    make_account_device_id,
+    make_device_id,
+    make_service_device_id,
+)
+from custom_components.mygas.models import (
+    build_accounts,
+    count_payload_entries,
+    get_account_choices,
+)
+
+from .const import MOCK_LSPU_INFO_RESPONSE
+
+MOCK_ELS_INFO = {
+    "els": {"jntAccountNum": "ELS-001", "alias": "Квартира"},
+    "lspuInfoGroup": [
+        MOCK_LSPU_INFO_RESPONSE,
+        {**MOCK_LSPU_INFO_RESPONSE, "accountId": 54321, "balances": []},
+    ],
+}
+
+
+def test_build_lspu_accounts() -> None:
+    """Test LSPU payloads are normalized once."""
+    accounts = build_accounts(
+        {ATTR_IS_ELS: False, CONF_INFO: {12345: [MOCK_LSPU_INFO_RESPONSE]}}
+    )
+
+    (account,) = accounts[12345]
+    assert account.number == "1234567890"
+    assert account.alias == "Дом"
+    assert account.lspu_id == 12345
+    assert account.device_identifier == make_account_device_id("1234567890")
+    assert account.balance == 150.50
+    assert account.parameters == {"Адрес": "г. Москва, ул. Примерная, д. 1"}
+    assert account.has_balances
+    assert account.latest_balance.charged == 850.00
+    assert account.latest_balance.date == date(2026, 1, 31)
+
+    (counter,) = account.counters
+    assert counter.device_identifier == make_device_id("1234567890", "abc-def-123")
+    assert counter.readings == 1250.5
+    assert counter.readings_date == date(2026, 1, 15)
+    assert counter.price_day == 8.50
+    assert counter.price_night is None
+    assert counter.attributes["Дата очередной поверки"] == date(2030, 1, 1)
+
+    service = account.services[0]
+    assert service.device_identifier == make_service_device_id("1234567890", "02")
+    assert service.balance == -6.32
+    assert [tariff.tariff for tariff in service.tariffs] == [266.09328, 111.7736]
+    assert service.tariffs[0].start_date == date(2017, 10, 9)
+
+
+def test_build_els_accounts() -> None:
+    """Test ELS payloads use the joint account number for every LSPU group."""
+    accounts = build_accounts({ATTR_IS_ELS: True, CONF_INFO: {7: MOCK_ELS_INFO}})
+
+    first, second = accounts[7]
+    assert (first.number, first.alias) == ("ELS-001", "Квартира")
+    assert (second.lspu_account_id, second.lspu_id) == (1, 54321)
+    assert not second.has_balances
+    assert second.latest_balance.charged is None
+
+
+def test_build_accounts_empty() -> None:
+    """Test missing data yields an empty model."""
+    assert build_accounts(None) == {}
+    assert build_accounts({}) == {}
+
+
+def test_count_payload_entries() -> None:
+    """Test the payload is measured by its entries, not by its accounts."""
+    entries = count_payload_entries(
+        {ATTR_IS_ELS: False, CONF_INFO: {12345: MOCK_LSPU_INFO_RESPONSE}}
+    )
+    counters = MOCK_LSPU_INFO_RESPONSE["counters"]
+    assert entries == (
+        1
+        + len(MOCK_LSPU_INFO_RESPONSE["balances"])
+        + len(MOCK_LSPU_INFO_RESPONSE.get("payments") or [])
+        + len(MOCK_LSPU_INFO_RESPONSE["services"])
+        + len(counters)
+        + sum(len(counter["values"]) for counter in counters)
+    )
+    # ELS groups weigh as the sum of their LSPU accounts
+    assert count_payload_entries(
+        {ATTR_IS_ELS: True, CONF_INFO: {1: MOCK_ELS_INFO}}
+    ) == 2 * entries - len(MOCK_LSPU_INFO_RESPONSE["balances"])
+    assert count_payload_entries(None) == 0
+
+
+def test_get_account_choices() -> None:
+    """Test the fetched accounts of a login are listed with their labels."""
+    assert get_account_choices(
+        {
+            "lspu": [{"id": 1, "account": "100"}],
+            "elsGroup": [
+                {"els": {"id": 7, "jntAccountNum": "ELS-001", "alias": "Квартира"}},
+                {"els": {"id": 8, "address": "ул. Садовая, д. 2"}},
+                {"els": {}},
+            ],
+        }
+    ) == {"7": "ELS-001 (Квартира)", "8": "8 (ул. Садовая, д. 2)"}
+    assert get_account_choices(None) == {}
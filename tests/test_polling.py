@@ -0,0 +1,130 @@
+"""Tests for the MyGas calendar polling."""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mygas.const import (
+    CONF_DENSE_INTERVAL,
+    CONF_POLLING_MODE,
+    CONF_QUIET_END,
+    CONF_QUIET_START,
+    CONF_READINGS_END_DAY,
+    CONF_READINGS_START_DAY,
+    CONF_REFRESH_TIME,
+    CONF_SCAN_INTERVAL,
+    POLLING_MODE_CALENDAR,
+)
+from custom_components.mygas.polling import MyGasPollingCalendar
+
+POLLING_CALENDAR = MyGasPollingCalendar(
+    refresh_time=time(9),
+    dense_interval=timedelta(hours=3),
+    readings_days=(20, 25),
+    quiet=(time(23), time(7)),
+)
+
+
+def _local(*args: int) -> datetime:
+    """Make a local datetime."""
+    return datetime(*args, tzinfo=dt_util.get_default_time_zone())
+
+
+@pytest.mark.usefixtures("hass")
+@pytest.mark.parametrize(
+    ("now", "expected"),
+    [
+        # Mid-cycle: once a day at the refresh time
+        ((2026, 3, 10, 10), (2026, 3, 11, 9)),
+        ((2026, 3, 10, 8), (2026, 3, 10, 9)),
+        # Readings window: every 3 hours on the grid of 09:00
+        ((2026, 3, 22, 10), (2026, 3, 22, 12)),
+        # Slots in the quiet period are skipped
+        ((2026, 3, 22, 21, 30), (2026, 3, 23, 9)),
+        # Dense polling starts on the first day of the window
+        ((2026, 3, 19, 10), (2026, 3, 20, 9)),
+        ((2026, 3, 20, 9), (2026, 3, 20, 12)),
+        # Month close
+        ((2026, 3, 31, 14), (2026, 3, 31, 15)),
+        ((2026, 4, 3, 22), (2026, 4, 4, 9)),
+    ],
+)
+def test_next_refresh(now: tuple[int, ...], expected: tuple[int, ...]) -> None:
+    """Test refreshes are sparse mid-cycle and dense around the windows."""
+    assert POLLING_CALENDAR.next_refresh(_local(*now)) == _local(*expected)
+
+
+def test_calendar_windows() -> None:
+    """Test the month close and the wrapping windows."""
+    assert POLLING_CALENDAR.is_month_close(date(2026, 2, 27))
+    assert not POLLING_CALENDAR.is_month_close(date(2026, 2, 26))
+    assert POLLING_CALENDAR.is_month_close(date(2026, 3, 3))
+    assert not POLLING_CALENDAR.is_month_close(date(2026, 3, 4))
+
+    wrapping = MyGasPollingCalendar(
+        refresh_time=time(12),
+        dense_interval=timedelta(hours=1),
+        readings_days=(28, 5),
+        quiet=(time(1), time(5)),
+    )
+    assert wrapping.is_readings_window(date(2026, 3, 29))
+    assert wrapping.is_readings_window(date(2026, 3, 5))
+    assert not wrapping.is_readings_window(date(2026, 3, 10))
+    assert wrapping.is_quiet(time(3))
+    assert not wrapping.is_quiet(time(23))
+
+
+@pytest.mark.usefixtures("mock_auth", "mock_api")
+async def test_calendar_options(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the calendar is configured in the options and reschedules refreshes."""
+    freezer.move_to(_local(2026, 3, 10, 10))
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data
+
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_SCAN_INTERVAL: 24,
+            CONF_POLLING_MODE: POLLING_MODE_CALENDAR,
+        },
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "calendar"
+
+    calendar_input = {
+        CONF_REFRESH_TIME: "06:00:00",
+        CONF_DENSE_INTERVAL: 3,
+        CONF_READINGS_START_DAY: 20,
+        CONF_READINGS_END_DAY: 25,
+        CONF_QUIET_START: "23:00:00",
+        CONF_QUIET_END: "07:00:00",
+    }
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input=calendar_input
+    )
+    assert result["errors"] == {"base": "refresh_time_quiet"}
+
+    with patch("custom_components.mygas.scheduler.uniform", return_value=0):
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input=calendar_input | {CONF_REFRESH_TIME: "12:00:00"},
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert mock_config_entry.runtime_data is coordinator
+    assert coordinator.update_interval == timedelta(hours=2)
@@ -0,0 +1,107 @@
+"""Tests for the MyGas profile service."""
+from __future__ import annotations
+
+from pathlib import Path
+import pstats
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.mygas.const import (
+    ATTR_TARGET,
+    ATTR_TOP,
+    DOMAIN,
+    PROFILE_TARGET_ENTITIES,
+    SERVICE_PROFILE,
+)
+from custom_components.mygas.helpers import make_account_device_id
+
+
+async def _async_setup(
+    hass: HomeAssistant, entry: MockConfigEntry, tmp_path: Path
+) -> str:
+    """Set up the config entry and get the id of its account device."""
+    hass.config.config_dir = str(tmp_path)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, make_account_device_id("1234567890"))}
+    )
+    assert device is not None
+    return device.id
+
+
+@pytest.mark.usefixtures("mock_auth")
+async def test_profile_refresh(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_api: AsyncMock,
+    tmp_path: Path,
+) -> None:
+    """Test a refresh is profiled to a file with a summary in the response."""
+    device_id = await _async_setup(hass, mock_config_entry, tmp_path)
+    mock_api.async_get_accounts.reset_mock()
+    events = async_capture_events(hass, f"{DOMAIN}_{SERVICE_PROFILE}_completed")
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PROFILE,
+        {ATTR_DEVICE_ID: device_id, ATTR_TOP: 5},
+        blocking=True,
+        return_response=True,
+    )
+
+    mock_api.async_get_accounts.assert_awaited_once()
+    assert response["target"] == "refresh"
+    assert response["duration"] >= 0
+    assert len(response["top"]) == 5
+    assert {"function", "calls", "total_time", "cumulative_time"} <= set(
+        response["top"][0]
+    )
+    path = Path(response["path"])
+    assert path.parent == tmp_path / DOMAIN / "profiles"
+    stats = pstats.Stats(str(path))
+    assert any(
+        name == "_async_fetch_data" for _, _, name in stats.stats  # type: ignore[attr-defined]
+    )
+    await hass.async_block_till_done()
+    assert len(events) == 1
+    assert events[0].data == {
+        ATTR_DEVICE_ID: device_id,
+        "target": "refresh",
+        "duration": response["duration"],
+        "path": response["path"],
+    }
+
+
+@pytest.mark.usefixtures("mock_auth")
+async def test_profile_entities(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_api: AsyncMock,
+    tmp_path: Path,
+) -> None:
+    """Test the entity update is profiled without calling the API."""
+    device_id = await _async_setup(hass, mock_config_entry, tmp_path)
+    mock_api.async_get_accounts.reset_mock()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PROFILE,
+        {ATTR_DEVICE_ID: device_id, ATTR_TARGET: PROFILE_TARGET_ENTITIES},
+        blocking=True,
+        return_response=True,
+    )
+
+    mock_api.async_get_accounts.assert_not_awaited()
+    assert response["target"] == PROFILE_TARGET_ENTITIES
+    functions = [item["function"] for item in response["top"]]
+    assert any("_handle_coordinator_update" in function for function in functions)
@@ -0,0 +1,175 @@
+"""Tests for recording and replaying MyGas API traffic."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mygas.const import CONF_RECORD_TRAFFIC, DOMAIN
+from custom_components.mygas.helpers import (
+    make_account_device_id,
+    make_entity_unique_id,
+)
+from custom_components.mygas.recorder import MyGasTrafficRecorder, redact
+
+from .const import MOCK_PASSWORD, MOCK_USERNAME
+from .replay import CassettePlayer
+
+
+async def _async_record(
+    hass: HomeAssistant, mock_api: AsyncMock, path: Path
+) -> dict:
+    """Record the traffic of a first refresh to a cassette file."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: MOCK_USERNAME, CONF_PASSWORD: MOCK_PASSWORD},
+        options={CONF_RECORD_TRAFFIC: True},
+        unique_id=MOCK_USERNAME,
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    recorder = entry.runtime_data.recorder
+    assert recorder is not None
+    recorder.path = path
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    await hass.config_entries.async_remove(entry.entry_id)
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+async def test_record_cassette(
+    hass: HomeAssistant,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+    tmp_path: Path,
+) -> None:
+    """Test API calls are recorded with timing and without personal data."""
+    cassette = await _async_record(hass, mock_api, tmp_path / "cassette.json")
+
+    calls = cassette["calls"]
+    assert [call["method"] for call in calls] == [
+        "_async_get_accounts",
+        "_async_get_lspu_info",
+    ]
+    lspu_call = calls[1]
+    assert lspu_call["args"] == [12345]
+    assert lspu_call["duration"] >= 0
+    assert lspu_call["error"] is None
+    response = lspu_call["response"]
+    assert response["account"].startswith("redacted-")
+    assert response["account"] != "1234567890"
+    assert response["parameters"][0]["value"].startswith("redacted-")
+    assert response["balance"] == 150.50
+    assert response["counters"][0]["values"][0]["valueDay"] == 1250.5
+
+
+async def test_record_keeps_last_calls(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test the recorder keeps only the last calls."""
+    with patch("custom_components.mygas.recorder.CASSETTE_MAX_CALLS", 2):
+        recorder = MyGasTrafficRecorder(hass, "entry")
+    recorder.path = tmp_path / "cassette.json"
+    for lspu_id in (1, 2, 3):
+        recorder.record("_async_get_lspu_info", (lspu_id,), {}, 0, result={})
+    await recorder.async_save()
+
+    cassette = json.loads(recorder.path.read_text(encoding="utf-8"))
+    assert [call["args"] for call in cassette["calls"]] == [[2], [3]]
+
+
+def test_redact_is_stable() -> None:
+    """Test the same personal value always gets the same pseudonym."""
+    first = redact({"account": "1234567890", "email": "user@example.com"})
+    second = redact(["user@example.com", {"account": "1234567890"}])
+
+    assert first["account"] == second[1]["account"]
+    assert first["email"] == second[0]
+    assert redact({"account": 5}) == {"account": 5}
+
+
+async def test_replay_cassette(
+    hass: HomeAssistant,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+    tmp_path: Path,
+) -> None:
+    """Test a recorded cassette drives the coordinator and the platforms."""
+    path = tmp_path / "cassette.json"
+    cassette = await _async_record(hass, mock_api, path)
+    account = cassette["calls"][1]["response"]["account"]
+    mock_api.reset_mock()
+
+    player = CassettePlayer.load(path, speed=None)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: MOCK_USERNAME, CONF_PASSWORD: MOCK_PASSWORD},
+        unique_id=MOCK_USERNAME,
+    )
+    entry.add_to_hass(hass)
+    with player.patch():
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        await entry.runtime_data.async_force_refresh()
+
+    assert entry.state is ConfigEntryState.LOADED
+    mock_api.async_get_lspu_info.assert_not_awaited()
+    assert player.played == [
+        "_async_get_accounts",
+        "_async_get_lspu_info",
+        "_async_get_accounts",
+        "_async_get_lspu_info",
+    ]
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor",
+        DOMAIN,
+        make_entity_unique_id(make_account_device_id(account), "balance"),
+    )
+    assert entity_id is not None
+    assert float(hass.states.get(entity_id).state) == 150.50
+
+
+async def test_replay_speed() -> None:
+    """Test recorded durations are scaled by the replay speed."""
+    player = CassettePlayer(
+        {
+            "calls": [
+                {
+                    "method": "_async_get_accounts",
+                    "args": [],
+                    "kwargs": {},
+                    "offset": 0,
+                    "duration": 2.0,
+                    "response": {"lspu": []},
+                    "error": None,
+                },
+                {
+                    "method": "_async_get_lspu_info",
+                    "args": [1],
+                    "kwargs": {},
+                    "offset": 2.0,
+                    "duration": 1.0,
+                    "response": None,
+                    "error": {"type": "UpdateFailed", "message": "API error"},
+                },
+            ]
+        },
+        speed=10,
+    )
+
+    with patch("tests.replay.asyncio.sleep") as mock_sleep:
+        assert await player._async_play("_async_get_accounts", (), {}) == {
+            "lspu": []
+        }
+        with pytest.raises(UpdateFailed, match="API error"):
+            await player._async_play("_async_get_lspu_info", (1,), {})
+
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [0.2, 0.1]
@@ -0,0 +1,122 @@
+"""Tests for the MyGas refresh scheduler."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import time
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mygas.const import DOMAIN, SCHEDULER_MAX_CONCURRENT_REFRESHES
+from custom_components.mygas.scheduler import (
+    MyGasRefreshScheduler,
+    async_get_scheduler,
+)
+
+INTERVAL = timedelta(hours=1)
+
+
+def test_next_interval_spreads_entries() -> None:
+    """Test every entry refreshes in its own part of the interval."""
+    scheduler = MyGasRefreshScheduler()
+    entry_ids = ["a", "b", "c", "d"]
+    for entry_id in entry_ids:
+        scheduler.async_register(entry_id)
+
+    seconds = INTERVAL.total_seconds()
+    now = float(int(time.time()))
+    with (
+        patch("custom_components.mygas.scheduler.uniform", return_value=0),
+        patch("custom_components.mygas.scheduler.time.time", return_value=now),
+    ):
+        phases = []
+        for entry_id in entry_ids:
+            delay = scheduler.next_interval(entry_id, INTERVAL).total_seconds()
+            assert seconds / 2 <= delay < seconds * 1.5
+            phases.append((now + delay) % seconds)
+
+    assert phases == [0.0, seconds / 4, seconds / 2, seconds * 3 / 4]
+
+
+def test_next_interval_jitter_stays_in_slot() -> None:
+    """Test the jitter does not move an entry into the next slot."""
+    scheduler = MyGasRefreshScheduler()
+    scheduler.async_register("a")
+    scheduler.async_register("b")
+    interval = timedelta(minutes=1)
+
+    with patch(
+        "custom_components.mygas.scheduler.uniform", side_effect=lambda a, b: b
+    ):
+        now = float(int(time.time()))
+        with patch("custom_components.mygas.scheduler.time.time", return_value=now):
+            delay = scheduler.next_interval("a", interval).total_seconds()
+
+    assert (now + delay) % 60 == 15
+
+
+async def test_refresh_slot_limits_concurrency() -> None:
+    """Test only a limited number of logins refresh at the same time."""
+    scheduler = MyGasRefreshScheduler()
+    release = asyncio.Event()
+    in_flight = 0
+    max_in_flight = 0
+
+    async def _refresh(entry_id: str) -> None:
+        nonlocal in_flight, max_in_flight
+        async with scheduler.async_refresh_slot(entry_id):
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await release.wait()
+            in_flight -= 1
+
+    entry_ids = [f"entry_{index}" for index in range(5)]
+    tasks = [asyncio.create_task(_refresh(entry_id)) for entry_id in entry_ids]
+    await asyncio.sleep(0)
+
+    state = scheduler.as_dict()
+    assert len(state["running"]) == SCHEDULER_MAX_CONCURRENT_REFRESHES
+    assert len(state["waiting"]) == len(entry_ids) - SCHEDULER_MAX_CONCURRENT_REFRESHES
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert max_in_flight == SCHEDULER_MAX_CONCURRENT_REFRESHES
+    assert scheduler.as_dict()["running"] == []
+    assert scheduler.as_dict()["waiting"] == []
+
+
+async def test_scheduler_tracks_config_entries(
+    hass: HomeAssistant,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test config entries are registered while loaded."""
+    entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            data={CONF_USERNAME: username, CONF_PASSWORD: "password"},
+            unique_id=username,
+        )
+        for username in ("first@example.com", "second@example.com")
+    ]
+    for entry in entries:
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        assert entry.state is ConfigEntryState.LOADED
+
+    scheduler = async_get_scheduler(hass)
+    assert set(scheduler.as_dict()["entries"]) == {
+        entry.entry_id for entry in entries
+    }
+    assert sorted(scheduler.as_dict()["entries"].values()) == [0.0, 0.5]
+
+    await hass.config_entries.async_unload(entries[0].entry_id)
+    await hass.async_block_till_done()
+
+    assert scheduler.as_dict()["entries"] == {entries[1].entry_id: 0.0}
@@ -0,0 +1,81 @@
+"""Tests for the MyGas API trace."""
+from __future__ import annotations
+
+import logging
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mygas.diagnostics import async_get_config_entry_diagnostics
+from custom_components.mygas.trace import MyGasApiTrace
+
+from .benchmarks.payloads import BenchmarkProfile, make_lspu_info
+from .fake_server import FakeMyGasServer
+
+PROFILE = BenchmarkProfile("trace", accounts=1, counters=1, services=1, history=3)
+
+
+async def _async_setup(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Set up the config entry."""
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_trace_with_debug_logging(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_mygas_api: FakeMyGasServer,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test API exchanges are traced while debug logging is enabled."""
+    caplog.set_level(logging.DEBUG, logger="custom_components.mygas")
+    fake_mygas_api.add_lspu_account(make_lspu_info(1, PROFILE))
+    await _async_setup(hass, mock_config_entry)
+    coordinator = mock_config_entry.runtime_data
+    await coordinator.async_refresh_account(1)
+    fake_mygas_api.add_lspu_account(make_lspu_info(1, PROFILE, seed=1))
+    await coordinator.async_refresh_account(1)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+    accounts, first, second, changed = diagnostics["coordinator"]["api_trace"]
+    assert accounts["endpoint"] == "get_accounts"
+    assert accounts["args"] == []
+    assert first["endpoint"] == "get_lspu_info"
+    assert first["args"] == [1]
+    assert first["status"] == "ok"
+    assert first["size"] > 0
+    assert first["payload_hash"] == second["payload_hash"]
+    assert changed["payload_hash"] != first["payload_hash"]
+    # The payload itself is never written to the log of the integration
+    assert not any(
+        "Примерная" in record.getMessage()
+        for record in caplog.records
+        if record.name.startswith("custom_components.mygas")
+    )
+
+
+@pytest.mark.usefixtures("mock_auth", "mock_api")
+async def test_trace_disabled(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test nothing is traced without debug logging."""
+    caplog.set_level(logging.INFO, logger="custom_components.mygas")
+    await _async_setup(hass, mock_config_entry)
+
+    assert not mock_config_entry.runtime_data.trace.records
+
+
+def test_trace_is_bounded() -> None:
+    """Test the trace keeps only the last exchanges."""
+    trace = MyGasApiTrace(size=2)
+    for lspu_id in range(3):
+        trace.record("get_lspu_info", (lspu_id,), 0.1, b"{}")
+    trace.record("get_accounts", (), 0.2, error=TimeoutError())
+
+    assert [record["args"] for record in trace.as_list()] == [[2], []]
+    assert trace.as_list()[-1]["status"] == "TimeoutError"
+    assert trace.as_list()[-1]["payload_hash"] is None
@@ -0,0 +1,61 @@
+"""Tests for the MyGas event loop watchdog."""
+from __future__ import annotations
+
+import pytest
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mygas.const import CONF_LOOP_WATCHDOG, DOMAIN
+from custom_components.mygas.diagnostics import async_get_config_entry_diagnostics
+from custom_components.mygas.watchdog import MyGasLoopWatchdog
+
+from .const import MOCK_PASSWORD, MOCK_USERNAME
+
+
+def test_watchdog_records_blocks(caplog: pytest.LogCaptureFixture) -> None:
+    """Test blocks over the threshold are recorded and logged."""
+    watchdog = MyGasLoopWatchdog(enabled=True, threshold=0)
+
+    with watchdog.watch("slow_callback"):
+        pass
+
+    assert [block.function for block in watchdog.blocks] == ["slow_callback"]
+    assert "slow_callback held the event loop" in caplog.text
+    assert watchdog.as_dict()["blocks"][0]["function"] == "slow_callback"
+
+
+def test_watchdog_disabled() -> None:
+    """Test nothing is measured while the watchdog is disabled."""
+    watchdog = MyGasLoopWatchdog(threshold=0)
+
+    with watchdog.watch("slow_callback"):
+        pass
+
+    assert not watchdog.blocks
+    assert not watchdog.max_durations
+
+
+@pytest.mark.usefixtures("mock_auth", "mock_api")
+async def test_watchdog_option(hass: HomeAssistant) -> None:
+    """Test the option watches the coordinator steps and entity updates."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: MOCK_USERNAME, CONF_PASSWORD: MOCK_PASSWORD},
+        options={CONF_LOOP_WATCHDOG: True},
+        unique_id=MOCK_USERNAME,
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    await entry.runtime_data.async_force_refresh()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    watchdog = diagnostics["coordinator"]["loop_watchdog"]
+    assert watchdog["enabled"] is True
+    assert {
+        "MyGasCoordinator._async_build_accounts",
+        "MyGasCoordinator.async_update_listeners",
+        "MyGasAccountSensorEntity._async_update_attrs",
+    } <= set(watchdog["max_durations"])